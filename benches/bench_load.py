@@ -0,0 +1,23 @@
+"""Benchmark the time taken to load GO- and ChEBI-sized OBO documents.
+"""
+
+import argparse
+
+from utils import SIZES, median_time, synthetic
+
+import pronto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name in SIZES:
+        path = synthetic(name)
+        elapsed = median_time(lambda: pronto.Ontology(path), args.repeat)
+        print(f"{name:>6}: {elapsed:.2f}s (median of {args.repeat} loads)")
+
+
+if __name__ == "__main__":
+    main()
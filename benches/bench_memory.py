@@ -0,0 +1,50 @@
+"""Benchmark the memory used by GO- and ChEBI-sized ontologies once loaded.
+
+Each ontology is loaded in a separate process, so that the resident set
+size of the process is not affected by the previous loads.
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+
+from utils import SIZES, synthetic
+
+import pronto
+
+
+def rss():
+    """Get the current resident set size of the process, in bytes.
+    """
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(path):
+    gc.collect()
+    before = rss()
+    ont = pronto.Ontology(path)
+    gc.collect()
+    retained = rss() - before
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return len(ont), retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+
+    for name in SIZES:
+        path = synthetic(name)
+        with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+            entities, retained, peak = pool.apply(measure, (path,))
+        print(
+            f"{name:>6}: {retained / 2**20:.0f} MiB retained, "
+            f"{peak / 2**20:.0f} MiB peak RSS ({entities} entities)"
+        )
+
+
+if __name__ == "__main__":
+    main()
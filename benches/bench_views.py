@@ -0,0 +1,78 @@
+"""Benchmark the cache of entity views on a GO-sized ontology.
+
+Views are either kept alive by the caller, in which case the cache returns
+the same view on every lookup, or dropped right away, in which case the
+cache only holds dead references until they are removed.
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from utils import median_time, synthetic
+
+import pronto
+
+
+def lookups(ont, ids):
+    for id_ in ids:
+        ont.get_term(id_)
+
+
+def traversal(ont):
+    for term in ont.terms():
+        for _ in term.superclasses(distance=1, with_self=False):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ont = pronto.Ontology(synthetic("go"))
+    ids = random.Random(0).choices(sorted(term.id for term in ont.terms()), k=200000)
+
+    # traverse the graph, dropping every view right away
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    traversal(ont)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    dead = sum(1 for ref in ont._views.values() if ref() is None)
+    print(
+        f"{'traversal, views dropped':>26}: {len(ont._views)} cached, "
+        f"{dead} dead, {retained / 2**20:.1f} MiB retained"
+    )
+
+    # resolve annotations to terms, keeping the views like a caller would
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    annotations = [ont.get_term(id_) for id_ in ids]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    views = len({id(term) for term in annotations})
+    print(
+        f"{'annotations, views kept':>26}: {views} views, "
+        f"{retained / 2**20:.1f} MiB retained"
+    )
+    del annotations
+
+    kept = list(ont.terms())
+    elapsed = median_time(lambda: lookups(ont, ids), args.repeat)
+    print(f"{'lookups, views kept':>26}: {elapsed:.2f}s")
+    del kept
+    gc.collect()
+    elapsed = median_time(lambda: lookups(ont, ids), args.repeat)
+    print(f"{'lookups, views dropped':>26}: {elapsed:.2f}s")
+    elapsed = median_time(lambda: traversal(ont), args.repeat)
+    print(f"{'traversal, views dropped':>26}: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Force importing the local version of the module
+BENCHDIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHDIR))
+
+# Number of terms in the releases of GO and ChEBI the benchmarks imitate
+SIZES = {"go": 47000, "chebi": 180000}
+
+_NAMESPACES = ["biological_process", "molecular_function", "cellular_component"]
+
+
+def write_ontology(path, terms, seed=0):
+    """Write a synthetic OBO document shaped like GO to ``path``.
+
+    Terms have 1 to 3 superclasses, some ``part_of`` relationships, a
+    namespace among three, a definition with a PubMed xref drawn from a
+    small set, synonyms and cross-references, so that the document has the
+    same redundancy as the real ontologies.
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("format-version: 1.4\nontology: bench\n")
+        f.write("synonymtypedef: systematic_synonym \"Systematic synonym\" EXACT\n")
+        for i in range(terms):
+            f.write(f"\n[Term]\nid: BENCH:{i:07}\nname: term number {i}\n")
+            f.write(f"namespace: {rng.choice(_NAMESPACES)}\n")
+            pmid = rng.randrange(terms // 10)
+            f.write(f'def: "Definition of term {i}." [PMID:{pmid}, GOC:bench]\n')
+            for j in range(rng.randrange(4)):
+                f.write(f'synonym: "synonym {j} of {i}" EXACT [GOC:bench]\n')
+            f.write(f"xref: Reactome:R-HSA-{rng.randrange(terms // 20)}\n")
+            if i > 0:
+                for sup in {rng.randrange(i) for _ in range(rng.randint(1, 3))}:
+                    f.write(f"is_a: BENCH:{sup:07}\n")
+            if i > 0 and rng.random() < 0.2:
+                f.write(f"relationship: part_of BENCH:{rng.randrange(i):07}\n")
+        f.write("\n[Typedef]\nid: part_of\nname: part of\nis_transitive: true\n")
+
+
+def synthetic(name):
+    """Get the path to a synthetic ontology, generating it if needed.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"pronto-bench-{name}.obo")
+    if not os.path.exists(path):
+        write_ontology(path, SIZES[name])
+    return path
+
+
+def median_time(func, repeat=5):
+    """Get the median wall-clock time of ``func`` over ``repeat`` calls.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
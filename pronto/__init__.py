@@ -14,10 +14,11 @@ Caution:
 Note:
     ``pronto`` implements proper *type checking* for most of the methods and
     properties exposed in the public classes. This reproduces the behaviour
-    of the Python standard library, to avoid common errors. This feature does
-    however increase overhead, but can be disabled by executing Python in
-    optimized mode (with the ``-O`` flag). **The time to parse an OBO file is
-    reduced by about 60% in optimized mode.**
+    of the Python standard library, to avoid common errors. Type hints are
+    only resolved once per function, so the overhead is small, but checking
+    can be disabled by executing Python in optimized mode (with the ``-O``
+    flag), or at runtime by setting ``pronto.utils.meta.typechecked.enabled``
+    to `False`.
 
 """
 
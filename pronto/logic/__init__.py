@@ -1 +1,2 @@
 from .lineage import Lineage, SubclassesIterator, SuperclassesIterator
+from .relations import Adjacency
@@ -38,12 +38,21 @@ class Lineage(object):
 
 
 class LineageIterator(Iterator["Term"]):
+    """An iterator over the terms of the lineage of one or several terms.
+
+    Terms are yielded breadth-first, and in lexicographic order of their
+    identifiers for a given distance, unless ``ordered`` is `False`. With
+    ``ids`` set to `True`, the identifiers of the terms are yielded instead
+    of `~pronto.Term` instances. Both options avoid work that is otherwise
+    done for every term, which makes traversals several times faster.
+    """
 
     _distmax: float
     _maxlen: int
+    _ids: bool
+    _ordered: bool
     _ontology: "Ontology"
     _linked: Set[str]
-    _done: Set[str]
     _frontier: Deque[Tuple[str, int]]
     _queue: Deque[str]
 
@@ -56,20 +65,28 @@ class LineageIterator(Iterator["Term"]):
     # ---
 
     def __init__(
-        self, *terms: "Term", distance: Optional[int] = None, with_self: bool = True
+        self,
+        *terms: "Term",
+        distance: Optional[int] = None,
+        with_self: bool = True,
+        ids: bool = False,
+        ordered: bool = True,
     ) -> None:
 
         self._distmax = float("inf") if distance is None else distance
+        self._ids = ids
+        self._ordered = ordered
 
         # if not term is given, `__next__` will raise `StopIterator` on
         # the first call without ever accessing `self._ontology`, so it's
         # safe not to initialise it here in that case.
         if terms:
             self._ontology = ont = terms[0]._ontology()
-            self._maxlen = len(ont.terms())
+            # the subclassing cache has an entry for each term of the
+            # ontology graph, and is much faster to count than `terms()`
+            self._maxlen = len(ont._inheritance)
 
         self._linked: Set[str] = set()
-        self._done: Set[str] = set()
         self._frontier: Deque[Tuple[str, int]] = collections.deque()
         self._queue: Deque[str] = collections.deque()
 
@@ -91,21 +108,28 @@ class LineageIterator(Iterator["Term"]):
             return 0
 
     def __next__(self) -> "Term":
+        id_ = self._next_id()
+        if self._ids:
+            return id_  # type: ignore
+        return self._ontology.get_term(id_)
+
+    def _next_id(self) -> str:
         while self._frontier or self._queue:
             # Return any element currently queued
             if self._queue:
-                return self._ontology.get_term(self._queue.popleft())
+                return self._queue.popleft()
             # Get the next node in the frontier
             node, distance = self._frontier.popleft()
-            self._done.add(node)
-            # Process its neighbors if they are not too far
-            neighbors: Set[str] = set(self._get_neighbors(node))
-            if neighbors and distance < self._distmax:
-                for node in sorted(neighbors.difference(self._done)):
-                    self._frontier.append((node, distance + 1))
-                for neighbor in sorted(neighbors.difference(self._linked)):
-                    self._linked.add(neighbor)
-                    self._queue.append(neighbor)
+            if distance >= self._distmax:
+                continue
+            # Queue the neighbors that were never reached, which is also
+            # when they are reached at the shortest distance
+            neighbors = self._get_neighbors(node).difference(self._linked)
+            if neighbors:
+                self._linked.update(neighbors)
+                reached = sorted(neighbors) if self._ordered else neighbors
+                self._frontier.extend((n, distance + 1) for n in reached)
+                self._queue.extend(reached)
         # Stop iteration if no more elements to process
         raise StopIteration
 
@@ -122,7 +146,17 @@ class LineageIterator(Iterator["Term"]):
         """
         from ..term import TermSet
 
-        return TermSet(self)
+        # the order of the terms is lost in a set, so it is not computed
+        s = TermSet()
+        self._ordered = False
+        try:
+            while True:
+                s._ids.add(self._next_id())
+        except StopIteration:
+            pass
+        if s._ids:
+            s._ontology = self._ontology
+        return s
 
 
 class SubclassesIterator(LineageIterator):
@@ -0,0 +1,34 @@
+from typing import Dict, Iterable, Optional, Set
+
+from ..utils.impl import set
+from ..utils.meta import roundrepr
+
+
+@roundrepr
+class Adjacency(object):
+    """An internal type to store the relationships of a term to other terms.
+
+    Used in `Ontology` to cache the edges of the knowledge graph for every
+    relationship other than ``is_a`` (which is handled by `Lineage`), in
+    both directions, since only the forward edges are explicitly declared
+    in source documents.
+    """
+
+    __slots__ = ("forward", "backward")
+
+    def __init__(
+        self,
+        forward: Optional[Dict[str, Iterable[str]]] = None,
+        backward: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        self.forward: Dict[str, Set[str]] = {
+            r: set(ids) for r, ids in (forward or {}).items()  # type: ignore
+        }
+        self.backward: Dict[str, Set[str]] = {
+            r: set(ids) for r, ids in (backward or {}).items()  # type: ignore
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Adjacency):
+            return self.forward == other.forward and self.backward == other.backward
+        return False
@@ -1,26 +1,150 @@
+import asyncio
 import contextlib
+import codecs
 import datetime
+import functools
+import hashlib
 import itertools
 import io
 import typing
 import os
+import pickle
+import tempfile
 import urllib.parse
-from typing import BinaryIO, Dict, Iterator, Mapping, Optional, Set, Union
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    BinaryIO,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import fastobo
 
 from . import relationship
+from .entity import EntityData
 from .term import Term, TermData
 from .synonym import SynonymType
 from .relationship import Relationship, RelationshipData
 from .logic.lineage import Lineage
+from .logic.relations import Adjacency
 from .metadata import Metadata
-from .utils.io import decompress, get_handle, get_location
+from .utils.cache import OntologyCache
+from .utils.io import decompress, download, get_handle, get_location, get_validator
 from .utils.iter import SizedIterator
 from .utils.meta import roundrepr, typechecked
 from .utils.impl import set
 
 
+# The ontology storing an entity, and the data of the entity, which is `None`
+# for terms of a lazy ontology that have not been loaded yet
+IndexEntry = Tuple["Ontology", Optional[EntityData]]
+
+# The minimum number of views an ontology caches before removing dead ones
+_VIEWS_LIMIT = 1024
+
+
+class _ImportMap(Dict[str, "Ontology"]):
+    """A dictionary of imports keeping the caches of the importer up-to-date.
+
+    The importing ontology is registered in the ``_importers`` of every
+    ontology in the map, so that changes to an import also invalidate the
+    indexes of the ontologies importing it. Ontologies are not hashable,
+    so importers are stored by `id` with a weak reference. The edges of
+    new imports are merged in the inheritance and relationship caches of
+    the importers, which are rebuilt when an import is removed.
+    """
+
+    def __init__(self, owner: "Ontology", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = weakref.ref(owner)
+        for dep in self.values():
+            dep._importers[id(owner)] = self._owner
+
+    def _changed(self, old: Iterable["Ontology"] = ()) -> None:
+        owner = self._owner()
+        if owner is None:
+            return
+        previous = {id(dep): dep for dep in old}
+        current = {id(dep): dep for dep in self.values()}
+        removed = [dep for key, dep in previous.items() if key not in current]
+        added = [dep for key, dep in current.items() if key not in previous]
+        for dep in removed:
+            dep._importers.pop(id(owner), None)
+        for dep in added:
+            dep._importers[id(owner)] = self._owner
+        owner._invalidate_indexes()
+        owner._drop_views()
+        if removed:
+            for ont in owner._dependents():
+                ont._rebuild_caches()
+        elif added:
+            for ont in owner._dependents():
+                for dep in added:
+                    ont._merge_caches(dep)
+
+    def __setitem__(self, key, value):
+        old = list(self.values())
+        super().__setitem__(key, value)
+        self._changed(old)
+
+    def __delitem__(self, key):
+        old = list(self.values())
+        super().__delitem__(key)
+        self._changed(old)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        old = list(self.values())
+        super().clear()
+        self._changed(old)
+
+    def pop(self, *args):
+        old = list(self.values())
+        value = super().pop(*args)
+        self._changed(old)
+        return value
+
+    def popitem(self):
+        old = list(self.values())
+        item = super().popitem()
+        self._changed(old)
+        return item
+
+    def setdefault(self, key, default=None):
+        old = list(self.values())
+        value = super().setdefault(key, default)
+        self._changed(old)
+        return value
+
+    def update(self, *args, **kwargs):
+        old = list(self.values())
+        super().update(*args, **kwargs)
+        self._changed(old)
+
+
+class ChangeSummary(NamedTuple):
+    """The identifiers of the entities affected by an `Ontology` update.
+    """
+
+    added: FrozenSet[str]
+    changed: FrozenSet[str]
+    removed: FrozenSet[str]
+
+
 class Ontology(Mapping[str, Union[Term, Relationship]]):
     """An ontology storing terms and the relationships between them.
 
@@ -46,26 +170,60 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         imports (~typing.Dict[str, Ontology]): A dictionary mapping references
             found in the import section of the metadata to resolved `Ontology`
             instances.
+        cache_dir (str, optional): The directory where downloaded files and
+            parsed snapshots are cached, if any.
+        fields (~typing.FrozenSet[str], optional): The term fields that were
+            loaded when parsing the ontology, or `None` if every field was
+            loaded.
+        cache (~pronto.utils.cache.OntologyCache): A process-wide cache of
+            ontologies loaded from a path or an URL, disabled by default.
+            Ontologies loaded from the cache get a copy of the data of the
+            cached ontology, so they can be modified independently.
 
     """
 
+    # Process-wide cache of loaded ontologies
+    cache: OntologyCache = OntologyCache(maxsize=0)
+
+    # Named sets of term fields that can be passed as `fields`
+    FIELD_PROFILES: Mapping[str, FrozenSet[str]] = {
+        "graph": frozenset({"is_a", "relationships"}),
+        "labels": frozenset({"name", "namespace"}),
+    }
+
     # Public attributes
     import_depth: int
     timeout: int
-    imports: Dict[str, "Ontology"]
+    cache_dir: Optional[str]
+    fields: Optional[FrozenSet[str]]
     path: Optional[str]
 
     # Private attributes
     _inheritance: Dict[str, Lineage]
-    _terms: Dict[str, TermData]
+    _relations: Dict[str, Adjacency]
+    _terms: MutableMapping[str, TermData]
     _relationships: Dict[str, RelationshipData]
     _subclassing_cache: Optional[Dict[str, Set[str]]]  # cache for `Term.subclasses`
+    _fingerprints: Optional[Dict[typing.Tuple[bytes, str], bytes]]  # for updates
+    _import_states: Dict[str, List[typing.Any]]  # imported entities, for updates
+    _private_imports: Dict[str, "Ontology"]  # imports copied to be enriched
+    _imports: Dict[str, "Ontology"]
+    _index: Optional[Dict[str, IndexEntry]]  # for lookups in the import tree
+    _index_generation: int
+    _generation: int  # bumped when the ids of the import tree change
+    _importers: Dict[int, "weakref.ReferenceType[Ontology]"]  # by `id`
+    _views: Dict[EntityData, "weakref.ReferenceType[Union[Term, Relationship]]"]
+    _views_limit: int  # size of `_views` triggering a removal of dead views
 
     # --- Constructors -------------------------------------------------------
 
     @classmethod
     def from_obo_library(
-        cls, slug: str, import_depth: int = -1, timeout: int = 5
+        cls,
+        slug: str,
+        import_depth: int = -1,
+        timeout: int = 5,
+        cache_dir: Optional[str] = None,
     ) -> "Ontology":
         """Create an `Ontology` from a file in the OBO Library.
 
@@ -83,6 +241,9 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
             timeout (int): The timeout in seconds to use when performing
                 network I/O, for instance when connecting to the OBO library
                 to download imports.
+            cache_dir (str, optional): The path to a directory where to
+                cache downloaded files and parsed ontologies, so that they
+                are only downloaded again when they changed on the server.
 
         Example:
             >>> ms = pronto.Ontology.from_obo_library("apo.obo")
@@ -92,13 +253,220 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
             'http://purl.obolibrary.org/obo/apo.obo'
 
         """
-        return cls(f"http://purl.obolibrary.org/obo/{slug}", import_depth, timeout)
+        url = f"http://purl.obolibrary.org/obo/{slug}"
+        return cls(url, import_depth, timeout, cache_dir=cache_dir)
+
+    @classmethod
+    def from_snapshot(cls, handle: Union[BinaryIO, str]) -> "Ontology":
+        """Create an `Ontology` from a snapshot created with `Ontology.dump`.
+
+        Snapshots are never detected by the `Ontology` constructor, so they
+        must be loaded with this method.
+
+        Caution:
+            Snapshots are serialized with `pickle`, and loading a snapshot
+            can execute arbitrary code. Only load snapshots that you
+            created yourself, or that come from a trusted source.
+
+        Arguments:
+            handle (str or ~typing.BinaryIO): Either the path to a local
+                snapshot file, or a binary file handle to read it from.
+
+        Raises:
+            ValueError: when the handle does not contain a snapshot, or
+                when the snapshot was created with another version of
+                pronto.
+
+        """
+        from .parsers import SnapshotParser
+
+        ont = cls()
+        if isinstance(handle, str):
+            with open(handle, "rb") as f:
+                SnapshotParser(ont).parse_from(f)
+            ont.path = handle
+        elif hasattr(handle, "read"):
+            SnapshotParser(ont).parse_from(handle)
+            ont.path = get_location(handle)
+        else:
+            raise TypeError(f"could not load snapshot from {handle!r}")
+        return ont
+
+    @classmethod
+    def load_many(
+        cls,
+        handles: Iterable[str],
+        import_depth: int = -1,
+        timeout: int = 5,
+        cache_dir: Optional[str] = None,
+        fields: Union[str, Iterable[str], None] = None,
+        processes: Optional[int] = None,
+    ) -> List["Ontology"]:
+        """Load several ontologies in parallel in a pool of processes.
+
+        Each ontology is parsed in a worker process, and sent back to the
+        current process as a snapshot (see `Ontology.dump`), which is much
+        faster to load than the source document. Workers share a cache
+        directory, so that imports are only downloaded once, and only
+        parsed once when they are imported with the same depth.
+
+        Arguments:
+            handles (~typing.Iterable[str]): The paths or URLs of the
+                ontologies to load.
+            import_depth (int): The maximum depth of imports to resolve in
+                each ontology tree.
+            timeout (int): The timeout in seconds to use when performing
+                network I/O.
+            cache_dir (str, optional): The path to a directory where to cache
+                downloaded files and parsed ontologies. If `None`, a temporary
+                directory is shared by the workers, and deleted afterwards.
+            fields (str or ~typing.Iterable[str], optional): The term fields
+                to load, like for the `Ontology` constructor.
+            processes (int, optional): The number of worker processes to use,
+                or `None` to use one per CPU.
+
+        Returns:
+            `list` of `Ontology`: The loaded ontologies, in the same order
+            as ``handles``.
+
+        Example:
+            >>> ms, uo = pronto.Ontology.load_many(["ms.obo", "uo.obo"])
+            >>> ms.metadata.ontology
+            'ms'
+
+        """
+        handles = list(handles)
+        fields = cls._resolve_fields(fields)
+        with contextlib.ExitStack() as ctx:
+            shared_dir = cache_dir
+            if shared_dir is None:
+                shared_dir = ctx.enter_context(tempfile.TemporaryDirectory())
+            pool = ctx.enter_context(ProcessPoolExecutor(max_workers=processes))
+            args = (import_depth, timeout, shared_dir, fields)
+            futures = [pool.submit(_dump_snapshot, h, *args) for h in handles]
+            args = (import_depth, timeout, cache_dir, fields)
+            return [
+                cls._from_snapshot(h, f.result(), *args)
+                for h, f in zip(handles, futures)
+            ]
+
+    @classmethod
+    async def aload(
+        cls,
+        handle: str,
+        import_depth: int = -1,
+        timeout: int = 5,
+        cache_dir: Optional[str] = None,
+        fields: Union[str, Iterable[str], None] = None,
+        executor: Optional[Executor] = None,
+    ) -> "Ontology":
+        """Load an ontology without blocking the running event loop.
+
+        The whole blocking load, from downloading the document and its
+        imports to parsing them, runs in ``executor``, or in the default
+        executor of the event loop if `None`: no part of it is actually
+        asynchronous, the event loop only awaits its completion. With a
+        `~concurrent.futures.ProcessPoolExecutor`, the ontology is parsed
+        in a worker process and sent back as a snapshot, so that parsing
+        does not compete with the event loop for the GIL.
+
+        Arguments:
+            handle (str): The path or URL of the ontology to load.
+            import_depth (int): The maximum depth of imports to resolve in
+                the ontology tree.
+            timeout (int): The timeout in seconds to use when performing
+                network I/O.
+            cache_dir (str, optional): The path to a directory where to cache
+                downloaded files and parsed ontologies.
+            fields (str or ~typing.Iterable[str], optional): The term fields
+                to load, like for the `Ontology` constructor.
+            executor (~concurrent.futures.Executor, optional): The executor
+                to load the ontology in.
+
+        Example:
+            >>> import asyncio
+            >>> loop = asyncio.new_event_loop()
+            >>> ms = loop.run_until_complete(pronto.Ontology.aload("ms.obo"))
+            >>> loop.close()
+            >>> ms.metadata.ontology
+            'ms'
+
+        """
+        loop = asyncio.get_event_loop()
+        fields = cls._resolve_fields(fields)
+        if isinstance(executor, ProcessPoolExecutor):
+            args = (handle, import_depth, timeout, cache_dir, fields)
+            data = await loop.run_in_executor(executor, _dump_snapshot, *args)
+            return cls._from_snapshot(
+                handle, data, import_depth, timeout, cache_dir, fields
+            )
+        load = functools.partial(
+            cls, handle, import_depth, timeout, cache_dir, fields=fields
+        )
+        return await loop.run_in_executor(executor, load)
+
+    @classmethod
+    def read_metadata(
+        cls,
+        handle: Union[BinaryIO, str],
+        timeout: int = 5,
+        encoding: Optional[str] = None,
+    ) -> Metadata:
+        """Read the metadata of an ontology without parsing its entities.
+
+        Only the OBO header, the ``owl:Ontology`` element or the ``meta``
+        of the OBO graph is parsed, and reading stops as soon as it has
+        been found, so this is much faster than creating an `Ontology` to
+        check the version of a large document. Imports are not resolved.
+
+        Arguments:
+            handle (str or ~typing.BinaryIO): The path or URL to the
+                ontology document, or a binary file handle open in reading
+                mode.
+            timeout (int): The timeout in seconds to use when performing
+                network I/O.
+            encoding (str, optional): The encoding of the document, like
+                for the `Ontology` constructor.
+
+        Raises:
+            ValueError: When the given ``handle`` contains a serialized
+                ontology not supported by any of the builtin parsers.
+
+        Example:
+            >>> meta = pronto.Ontology.read_metadata("ms.obo")
+            >>> meta.ontology
+            'ms'
+
+        """
+        from .parsers import BaseParser
+
+        with contextlib.ExitStack() as ctx:
+            if isinstance(handle, str):
+                path = handle
+                file = ctx.enter_context(get_handle(handle, timeout))
+                _handle = ctx.enter_context(decompress(file, encoding=encoding))
+            elif hasattr(handle, "read"):
+                path = get_location(handle)
+                _handle = decompress(handle, encoding=encoding)
+            else:
+                raise TypeError(f"could not read metadata from {handle!r}")
+            buffer = _handle.peek(io.DEFAULT_BUFFER_SIZE)
+            for parser in BaseParser.__subclasses__():
+                if parser.can_parse(typing.cast(str, path), buffer):
+                    return parser(cls()).parse_metadata(_handle)
+            raise ValueError(f"could not find a parser to parse {handle!r}")
 
     def __init__(
         self,
         handle: Union[BinaryIO, str, None] = None,
         import_depth: int = -1,
         timeout: int = 5,
+        cache_dir: Optional[str] = None,
+        lazy: bool = False,
+        encoding: Optional[str] = None,
+        readahead: int = 0,
+        memory_map: bool = False,
+        fields: Union[str, Iterable[str], None] = None,
     ):
         """Create a new `Ontology` instance.
 
@@ -114,27 +482,74 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
             timeout (int): The timeout in seconds to use when performing
                 network I/O, for instance when connecting to the OBO library
                 to download imports.
-            cache (bool): Enable caching of subclassing relationships to make
-                `Term.subclasses` much faster, at the cost of a slightly
-                longer parsing step (about 5% of the total time).
+            cache_dir (str, optional): The path to a directory where to store
+                downloaded files and binary snapshots of parsed ontologies.
+                When given, remote files are only downloaded again when they
+                changed on the server, and files are only parsed once, and
+                later loaded from their snapshot for as long as their
+                contents do not change. This also applies to imports.
+            lazy (bool): Only index the terms of the ontology when loading
+                it, and parse each term when it is first accessed. This
+                is only supported for local, uncompressed OBO files, and
+                makes sense when only a few terms of a large ontology are
+                needed.
+            encoding (str, optional): The encoding of the serialized
+                ontology. If `None` is given, the encoding is inferred
+                from the byte-order mark of the document, or detected
+                if the document is not UTF-8 encoded.
+            readahead (int): The number of chunks of a compressed document
+                to decompress ahead in a background thread while the
+                document is being parsed. Use ``0`` to decompress the
+                document in the parsing thread.
+            memory_map (bool): Read local files through a memory map
+                instead of copying them through file buffers. This also
+                lets processes loading the same file share its pages in
+                memory. Lazy loading always uses a memory map.
+            fields (str, ~typing.Iterable[str], or None): The term fields
+                to load, given as names of `TermData` attributes (using
+                ``is_a`` for superclasses), or as names of profiles from
+                `Ontology.FIELD_PROFILES`: ``graph`` loads the superclasses
+                and relationships of terms, ``labels`` their names and
+                namespaces. Clauses of other fields are skipped when
+                parsing terms. If `None` is given, every field is loaded.
 
         Raises:
             TypeError: When the given ``handle`` could not be used to parse
                 and ontology.
             ValueError: When the given ``handle`` contains a serialized
-                ontology not supported by any of the builtin parsers.
+                ontology not supported by any of the builtin parsers, or
+                when it cannot be loaded lazily while ``lazy`` is `True`,
+                or when ``fields`` contains an unknown field.
 
         """
-        from .parsers import BaseParser
+        from .parsers import BaseParser, LazyOboParser
+
+        if lazy and cache_dir is not None:
+            raise ValueError("cannot use `lazy` and `cache_dir` together")
+        if lazy and encoding is not None:
+            if codecs.lookup(encoding).name != "utf-8":
+                raise ValueError("lazy loading requires UTF-8 encoded files")
 
         with contextlib.ExitStack() as ctx:
             self.import_depth = import_depth
             self.timeout = timeout
+            self.cache_dir = cache_dir
+            self.fields = self._resolve_fields(fields)
+            self._index = None
+            self._index_generation = 0
+            self._generation = 0
+            self._importers = {}
+            self._views = {}
+            self._views_limit = _VIEWS_LIMIT
+            self._inheritance = dict()
+            self._relations = dict()
             self.imports = dict()
 
-            self._inheritance = dict()
             self._terms: Dict[str, TermData] = {}
             self._relationships: Dict[str, RelationshipData] = {}
+            self._fingerprints = None
+            self._import_states = {}
+            self._private_imports = {}
 
             # Creating an ontology from scratch is supported
             if handle is None:
@@ -142,15 +557,69 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
                 self.path = self.handle = None
                 return
 
+            # Download remote files to the cache directory if caching is enabled
+            source = handle
+            if isinstance(handle, str) and cache_dir is not None:
+                if not os.path.isfile(handle):
+                    source = download(handle, cache_dir, timeout)
+
+            # Hash local files once, for the cache key and the snapshot path
+            digest: Optional[str] = None
+            if isinstance(source, str) and os.path.isfile(source) and not lazy:
+                if self.cache.enabled or cache_dir is not None:
+                    digest = self._digest(source)
+
+            # Load the ontology from the process-wide cache if possible, which
+            # is not used for lazy ontologies since they are not parsed
+            key: Optional[typing.Tuple[typing.Hashable, ...]] = None
+            if isinstance(source, str) and self.cache.enabled and not lazy:
+                key = self._cache_key(source, digest, encoding)
+                cached = None if key is None else self.cache.get(key)
+                if cached is not None:
+                    self._copy_from(cached)
+                    self.path = handle
+                    self.handle = None
+                    return
+
+            # Load the ontology from a snapshot if caching is enabled
+            snapshot: Optional[str] = None
+            if digest is not None and cache_dir is not None:
+                snapshot = self._snapshot_path(digest, cache_dir)
+                if self._load_snapshot(snapshot):
+                    self.path = handle
+                    self.handle = None
+                    if key is not None:
+                        self.cache.put(key, self._copy())
+                    return
+
+            # Index the ontology without parsing it if lazy loading
+            if lazy:
+                if not isinstance(handle, str) or not os.path.isfile(handle):
+                    raise ValueError("lazy loading requires a path to a local file")
+                self.path = handle
+                self.handle = ctx.enter_context(get_handle(handle, memory_map=True))
+                buffer = self.handle.read(io.DEFAULT_BUFFER_SIZE)
+                if not LazyOboParser.can_parse(handle, buffer):
+                    raise ValueError(f"could not lazily load {handle!r}")
+                self.handle.seek(0)
+                LazyOboParser(self).parse_from(self.handle)
+                return
+
             # Get the path and the handle from arguments
             if isinstance(handle, str):
                 self.path = handle
-                self.handle = ctx.enter_context(get_handle(handle, timeout))
-                _handle = ctx.enter_context(decompress(self.handle))
+                self.handle = ctx.enter_context(
+                    get_handle(source, timeout, memory_map=memory_map)
+                )
+                _handle = ctx.enter_context(
+                    decompress(self.handle, encoding=encoding, readahead=readahead)
+                )
             elif hasattr(handle, "read"):
                 self.path = get_location(handle)
                 self.handle = handle
-                _handle = decompress(self.handle)
+                _handle = decompress(
+                    self.handle, encoding=encoding, readahead=readahead
+                )
             else:
                 raise TypeError(f"could not parse ontology from {handle!r}")
 
@@ -163,8 +632,11 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
             else:
                 raise ValueError(f"could not find a parser to parse {handle!r}")
 
-            # Populate the subclassing cache
-            self._build_inheritance_cache()
+            # Store a snapshot of the parsed ontology if caching is enabled
+            if snapshot is not None:
+                self._store_snapshot(snapshot)
+            if key is not None:
+                self.cache.put(key, self._copy())
 
     # --- Magic Methods ------------------------------------------------------
 
@@ -203,26 +675,19 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
 
     def __contains__(self, item: object) -> bool:
         if isinstance(item, str):
-            return (
-                any(item in i for i in self.imports.values())
-                or item in self._terms
-                or item in self._relationships
-                or item in relationship._BUILTINS
-            )
+            return item in self._entity_index()
         return False
 
     def __getitem__(self, id: str) -> Union[Term, Relationship]:
         """Get any entity in the ontology graph with the given identifier.
         """
-        try:
-            return self.get_relationship(id)
-        except KeyError:
-            pass
-        try:
-            return self.get_term(id)
-        except KeyError:
-            pass
-        raise KeyError(id)
+        entry = self._entity_index().get(id)
+        if entry is None:
+            raise KeyError(id)
+        owner, data = entry
+        if isinstance(data, RelationshipData):
+            return self._relationship_view(data)
+        return self._term_view(owner._terms[id] if data is None else data)
 
     def __repr__(self):
         """Return a textual representation of `self` that should roundtrip.
@@ -235,13 +700,301 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
 
     # --- Private helpers ----------------------------------------------------
 
-    def _build_inheritance_cache(self) -> None:
-        is_a = self.get_relationship("is_a")
+    @classmethod
+    def _resolve_fields(
+        cls, fields: Union[str, Iterable[str], None]
+    ) -> Optional[FrozenSet[str]]:
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            fields = (fields,)
+        resolved: Set[str] = set()
+        for field in fields:
+            if field in cls.FIELD_PROFILES:
+                resolved.update(cls.FIELD_PROFILES[field])
+            elif field == "is_a" or field in TermData.__slots__:
+                resolved.add(field)
+            else:
+                raise ValueError(f"unknown term field: {field!r}")
+        resolved.discard("id")
+        return frozenset(resolved)
+
+    @classmethod
+    def _from_snapshot(
+        cls,
+        handle: str,
+        data: bytes,
+        import_depth: int,
+        timeout: int,
+        cache_dir: Optional[str],
+        fields: Optional[FrozenSet[str]],
+    ) -> "Ontology":
+        from .parsers import SnapshotParser
+
+        ont = cls(None, import_depth, timeout, cache_dir, fields=fields)
+        SnapshotParser(ont).parse_from(io.BytesIO(data))
+        ont.path = handle
+        return ont
+
+    def _add_superclasses(self, id: str, superclasses: Iterable[str]) -> None:
+        lineage = self._inheritance.setdefault(id, Lineage())
+        for sup in superclasses:
+            lineage.sup.add(sup)
+            self._inheritance.setdefault(sup, Lineage()).sub.add(id)
+
+    def _add_relations(
+        self, id: str, relationships: Mapping[str, Iterable[str]]
+    ) -> None:
+        for rel, targets in relationships.items():
+            if rel == "is_a":
+                continue
+            forward = self._relations.setdefault(id, Adjacency()).forward
+            forward.setdefault(rel, set()).update(targets)
+            for target in targets:
+                backward = self._relations.setdefault(target, Adjacency()).backward
+                backward.setdefault(rel, set()).add(id)
+
+    def _closure(self) -> Iterator["Ontology"]:
+        # the ontologies of the import tree, depth-first, each only once
+        seen: Set[int] = set()
+        stack = [self]
+        while stack:
+            ont = stack.pop()
+            if id(ont) not in seen:
+                seen.add(id(ont))
+                yield ont
+                stack.extend(reversed(ont.imports.values()))
+
+    def _entity_index(self) -> Dict[str, IndexEntry]:
+        # Get the lookup index of the import tree, (re)building it if needed,
+        # with the same precedence as the recursive lookups: relationships
+        # before terms, and entities of an ontology before its imports
+        if self._index is not None and self._index_generation == self._generation:
+            return self._index
+        generation = self._generation
+        index: Dict[str, IndexEntry] = {}
+        closure = list(self._closure())
+        for ont in closure:
+            for id_, reldata in ont._relationships.items():
+                index.setdefault(id_, (ont, reldata))
+            if ont is self:
+                for id_, reldata in relationship._BUILTINS.items():
+                    index.setdefault(id_, (self, reldata))
+        for ont in closure:
+            if isinstance(ont._terms, dict):
+                for id_, termdata in ont._terms.items():
+                    index.setdefault(id_, (ont, termdata))
+            else:
+                for id_ in ont._terms:
+                    index.setdefault(id_, (ont, None))
+        self._index, self._index_generation = index, generation
+        return index
+
+    def _term_view(self, data: TermData) -> Term:
+        # Get the view of a term, reusing it for as long as it is referenced
+        # elsewhere; dead references are not removed with a callback, which
+        # would be slower, but in batches once there are too many of them
+        ref = self._views.get(data)
+        if ref is not None:
+            view = ref()
+            if view is not None:
+                return typing.cast(Term, view)
+        view = Term(self, data)
+        self._add_view(data, view)
+        return view
+
+    def _relationship_view(self, data: RelationshipData) -> Relationship:
+        # Get the view of a relationship, reusing it like `_term_view`
+        ref = self._views.get(data)
+        if ref is not None:
+            view = ref()
+            if view is not None:
+                return typing.cast(Relationship, view)
+        view = Relationship(self, data)
+        self._add_view(data, view)
+        return view
+
+    def _add_view(self, data: EntityData, view: Union[Term, Relationship]) -> None:
+        # Remember a new view, removing the dead references when the size of
+        # the cache doubled since the last removal, to amortize its cost
+        views = self._views
+        views[data] = weakref.ref(view)
+        if len(views) > self._views_limit:
+            for key in [key for key, ref in views.items() if ref() is None]:
+                del views[key]
+            self._views_limit = max(_VIEWS_LIMIT, 2 * len(views))
+
+    def _drop_views(self, entities: Optional[Iterable[EntityData]] = None) -> None:
+        # Forget the views of the given entities (or of all entities) in this
+        # ontology and the ontologies importing it, so that the cache does
+        # not keep the data of removed or replaced entities alive
+        entities = None if entities is None else list(entities)
+        for ont in self._dependents():
+            if entities is None:
+                ont._views.clear()
+            else:
+                for data in entities:
+                    ont._views.pop(data, None)
+
+    def _dependents(self) -> Iterator["Ontology"]:
+        # Iterate over this ontology and the ontologies importing it,
+        # directly or not, each of them once
+        stack, seen = [self], set()
+        while stack:
+            ont = stack.pop()
+            if id(ont) not in seen:
+                seen.add(id(ont))
+                yield ont
+                for ref in list(ont._importers.values()):
+                    importer = ref()
+                    if importer is not None:
+                        stack.append(importer)
+
+    def _invalidate_indexes(self) -> None:
+        # Invalidate the lookup index of this ontology and of every ontology
+        # importing it, directly or not, after the identifiers changed
+        for ont in self._dependents():
+            ont._generation += 1
+
+    def _index_entities(self, entities: Iterable[EntityData]) -> None:
+        # Add new local entities to the lookup index of this ontology, and
+        # invalidate the indexes of the ontologies importing this one
+        valid = self._index is not None and self._index_generation == self._generation
+        self._invalidate_indexes()
+        if valid:
+            index = typing.cast(Dict[str, IndexEntry], self._index)
+            for data in entities:
+                index[data.id] = (self, data)
+            self._index_generation = self._generation
+
+    def _merge_caches(self, dep: "Ontology") -> None:
+        # Add the edges of an import to the inheritance and relationship
+        # caches, which already contain the edges of its own imports
+        for id, lineage in dep._inheritance.items():
+            entry = self._inheritance.setdefault(id, Lineage())
+            entry.sub.update(lineage.sub)
+            entry.sup.update(lineage.sup)
+        for id, adjacency in dep._relations.items():
+            adj = self._relations.setdefault(id, Adjacency())
+            for rel, ids in adjacency.forward.items():
+                adj.forward.setdefault(rel, set()).update(ids)
+            for rel, ids in adjacency.backward.items():
+                adj.backward.setdefault(rel, set()).update(ids)
+
+    def _rebuild_caches(self) -> None:
+        # Rebuild the inheritance and relationship caches from the entities
+        # of the import tree, or from the caches of lazy ontologies, whose
+        # terms would have to be parsed
         self._inheritance.clear()
-        for t1 in self.terms():
-            for t2 in t1._data().relationships.get("is_a", []):
-                self._inheritance.setdefault(t2, Lineage()).sub.add(t1.id)
-                self._inheritance.setdefault(t1.id, Lineage()).sup.add(t2)
+        self._relations.clear()
+        for ont in self._closure():
+            if ont is not self and not isinstance(ont._terms, dict):
+                self._merge_caches(ont)
+                continue
+            for id, data in ont._terms.items():
+                self._add_superclasses(id, data.relationships.get("is_a", ()))
+                self._add_relations(id, data.relationships)
+
+    @staticmethod
+    def _digest(path: str) -> str:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(io.DEFAULT_BUFFER_SIZE * 16), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _snapshot_path(self, digest: str, cache_dir: str) -> str:
+        # the name of the snapshot hashes the file digest with the options
+        from . import __version__
+
+        fields = ",".join(sorted(self.fields)) if self.fields is not None else "*"
+        key = f"{__version__}:{self.import_depth}:{fields}:{digest}".encode("utf-8")
+        return os.path.join(cache_dir, f"{hashlib.sha256(key).hexdigest()}.snapshot")
+
+    def _cache_key(
+        self, path: str, digest: Optional[str], encoding: Optional[str]
+    ) -> Optional[typing.Tuple[typing.Hashable, ...]]:
+        # the key contains every argument changing the parsed ontology
+        if encoding is not None:
+            encoding = codecs.lookup(encoding).name
+        options = (self.import_depth, self.fields, encoding)
+        if digest is not None:
+            return (os.path.realpath(path), digest, *options)
+        try:
+            validator = get_validator(path, self.timeout)
+        except Exception:
+            return None
+        if validator is None:
+            return None
+        return (path, validator, *options)
+
+    @property
+    def imports(self) -> Dict[str, "Ontology"]:
+        """`dict` of `Ontology`: The imports of the ontology, by reference.
+        """
+        return self._imports
+
+    @imports.setter
+    def imports(self, imports: Dict[str, "Ontology"]) -> None:
+        old = getattr(self, "_imports", {})
+        for dep in old.values():
+            dep._importers.pop(id(self), None)
+        self._imports = _ImportMap(self, imports)
+        self._imports._changed(old.values())
+
+    def _detach_import(self, id: str) -> None:
+        # Replace the import declaring the given entity with a copy, since
+        # imports are shared within an import tree and the entity is about
+        # to be modified; each import is only copied once
+        entry = self._entity_index().get(id)
+        if entry is None or entry[0] is self:
+            return
+        for ref, dep in self.imports.items():
+            if any(ont is entry[0] for ont in dep._closure()):
+                if self._private_imports.get(ref) is not dep:
+                    self.imports[ref] = self._private_imports[ref] = dep._copy()
+                return
+
+    def _copy(self) -> "Ontology":
+        ont = Ontology(None, self.import_depth, self.timeout, self.cache_dir)
+        ont.fields = self.fields
+        ont.path = self.path
+        ont._copy_from(self)
+        return ont
+
+    def _copy_from(self, other: "Ontology") -> None:
+        from .parsers import SnapshotParser
+        from .serializers import SnapshotSerializer
+
+        # copy the data through an in-memory snapshot, which is faster than
+        # `copy.deepcopy` and never shares a mutable object with `other`
+        state = SnapshotSerializer._to_state(other)
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        SnapshotParser._restore(self, pickle.loads(data))
+
+    def _load_snapshot(self, snapshot: str) -> bool:
+        from .parsers import SnapshotParser
+
+        try:
+            with open(snapshot, "rb") as f:
+                SnapshotParser(self).parse_from(f)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _store_snapshot(self, snapshot: str) -> None:
+        # write to a temporary file first so that concurrent readers never
+        # see a partially written snapshot
+        dirname = os.path.dirname(snapshot)
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.dump(f, format="snapshot")
+            os.replace(tmp, snapshot)
+        except BaseException:
+            os.remove(tmp)
+            raise
 
     # --- Serialization utils ------------------------------------------------
 
@@ -252,7 +1005,9 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
             file (~typing.BinaryIO): A binary file handle open in reading mode
                 to write the serialized ontology into.
             format (str): The serialization format to use. Currently supported
-                formats are: **obo**, **json**.
+                formats are: **obo**, **json**, and **snapshot** (a binary
+                format that can only be loaded back by the same version of
+                ``pronto``, with `Ontology.from_snapshot`).
 
         Example:
             >>> ms = pronto.Ontology.from_obo_library("ms.obo")
@@ -283,6 +1038,64 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         self.dump(s, format=format)
         return s.getvalue().decode("utf-8")
 
+    # --- Updates ------------------------------------------------------------
+
+    @typechecked()
+    def update_from(self, path: Optional[str] = None) -> ChangeSummary:
+        """Update the ontology in place with a new revision of its document.
+
+        Only the frames of entities which changed since the last update are
+        parsed again, and the subclassing and relationship caches are only
+        patched for these entities. The views to existing entities remain
+        valid after an update. Since frames are fingerprinted by this method,
+        the first update of an ontology parses every frame of the document.
+
+        Arguments:
+            path (str, optional): The path or URL to the new revision of the
+                document. Defaults to the path the ontology was loaded from.
+
+        Returns:
+            `ChangeSummary`: the identifiers of the entities that were added,
+            changed, or removed by the update.
+
+        Raises:
+            ValueError: When the ontology was not loaded from a path and no
+                ``path`` is given, when the ontology was loaded lazily, or
+                when the document is not in OBO format.
+
+        Example:
+            >>> ont = pronto.Ontology("ms.obo")
+            >>> summary = ont.update_from("ms.obo")
+            >>> summary.added
+            frozenset()
+
+        """
+        from .parsers import OboParser
+        from .parsers.lazy import LazyTermMapping
+
+        if isinstance(self._terms, LazyTermMapping):
+            raise ValueError("cannot update a lazily loaded ontology")
+        if path is None:
+            if self.path is None:
+                raise ValueError("cannot update an ontology without a path")
+            path = self.path
+
+        with contextlib.ExitStack() as ctx:
+            handle = ctx.enter_context(get_handle(path, self.timeout))
+            _handle = ctx.enter_context(decompress(handle))
+            if not OboParser.can_parse(path, _handle.peek(io.DEFAULT_BUFFER_SIZE)):
+                raise ValueError(f"could not update from {path!r}: not an OBO file")
+            summary = OboParser(self).update_from(_handle)
+        self.path = path
+        return summary
+
+    def reload(self) -> ChangeSummary:
+        """Update the ontology in place from the path it was loaded from.
+
+        See `Ontology.update_from` for more details.
+        """
+        return self.update_from()
+
     # --- Data accessors -----------------------------------------------------
 
     def terms(self) -> SizedIterator[Term]:
@@ -291,11 +1104,11 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         return SizedIterator(
             itertools.chain(
                 (
-                    Term(self, t._data())
+                    self._term_view(t._data())
                     for ref in self.imports.values()
                     for t in ref.terms()
                 ),
-                (Term(self, t) for t in self._terms.values()),
+                (self._term_view(t) for t in self._terms.values()),
             ),
             length=(
                 sum(len(r.terms()) for r in self.imports.values()) + len(self._terms)
@@ -312,11 +1125,11 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         return SizedIterator(
             itertools.chain(
                 (
-                    Relationship(self, r._data())
+                    self._relationship_view(r._data())
                     for ref in self.imports.values()
                     for r in ref.relationships()
                 ),
-                (self.get_relationship(r) for r in self._relationships),
+                (self._relationship_view(r) for r in self._relationships.values()),
             ),
             length=(
                 sum(len(r.relationships()) for r in self.imports.values())
@@ -340,8 +1153,9 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         if id in self:
             raise ValueError(f"identifier already in use: {id} ({self[id]})")
         self._terms[id] = termdata = TermData(id)
-        self._inheritance[id] = Lineage()
-        return Term(self, termdata)
+        self._inheritance.setdefault(id, Lineage())
+        self._index_entities((termdata,))
+        return self._term_view(termdata)
 
     @typechecked()
     def create_relationship(self, id: str) -> Relationship:
@@ -355,7 +1169,65 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
         if id in self:
             raise ValueError(f"identifier already in use: {id} ({self[id]})")
         self._relationships[id] = reldata = RelationshipData(id)
-        return Relationship(self, reldata)
+        self._index_entities((reldata,))
+        return self._relationship_view(reldata)
+
+    def add_entities(
+        self,
+        terms: Iterable[TermData] = (),
+        relationships: Iterable[RelationshipData] = (),
+    ) -> None:
+        """Add many prepared entities to the ontology at once.
+
+        Unlike `create_term` and `create_relationship`, identifier collisions
+        are checked once for the whole batch, and the subclassing and
+        relationship caches are only updated once every entity has been
+        added, which is much faster to build large ontologies.
+
+        Example:
+            >>> ont = pronto.Ontology()
+            >>> data = [pronto.TermData(f"TST:{i:07}") for i in range(1000)]
+            >>> for sub, sup in zip(data[1:], data):
+            ...     sub.relationships["is_a"] = {sup.id}
+            >>> ont.add_entities(data)
+            >>> len(ont["TST:0000999"].superclasses().to_set())
+            1000
+
+        Raises:
+            ValueError: if an identifier is used by several of the given
+                entities, or already identifies an entity in the ontology
+                graph.
+
+        """
+        terms = list(terms)
+        relationships = list(relationships)
+        for data in terms:
+            if not isinstance(data, TermData):
+                raise TypeError(f"expected TermData, found {data!r}")
+        for data in relationships:
+            if not isinstance(data, RelationshipData):
+                raise TypeError(f"expected RelationshipData, found {data!r}")
+
+        # Check the identifiers of the batch against each other, and then
+        # against the identifiers of the ontology graph
+        ids = {data.id for data in itertools.chain(terms, relationships)}
+        if len(ids) != len(terms) + len(relationships):
+            seen: Set[str] = set()
+            for data in itertools.chain(terms, relationships):
+                if data.id in seen:
+                    raise ValueError(f"identifier used more than once: {data.id}")
+                seen.add(data.id)
+        clashes = self._entity_index().keys() & ids
+        if clashes:
+            raise ValueError(f"identifier already in use: {min(clashes)}")
+
+        # Add the entities, and then update the caches in a single pass
+        self._terms.update((data.id, data) for data in terms)
+        self._relationships.update((data.id, data) for data in relationships)
+        self._index_entities(itertools.chain(terms, relationships))
+        for data in terms:
+            self._add_superclasses(data.id, data.relationships.get("is_a", ()))
+            self._add_relations(data.id, data.relationships)
 
     @typechecked()
     def get_term(self, id: str) -> Term:
@@ -366,15 +1238,17 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
                 the ontology graph.
 
         """
-        try:
-            return Term(self, self._terms[id])
-        except KeyError:
-            pass
-        for dep in self.imports.values():
-            try:
-                return Term(self, dep.get_term(id)._data())
-            except KeyError:
-                pass
+        entry = self._entity_index().get(id)
+        if entry is not None:
+            owner, data = entry
+            if data is None:
+                return self._term_view(owner._terms[id])
+            if isinstance(data, TermData):
+                return self._term_view(data)
+            # the term is shadowed by a relationship with the same identifier
+            for ont in self._closure():
+                if id in ont._terms:
+                    return self._term_view(ont._terms[id])
         raise KeyError(id)
 
     @typechecked()
@@ -389,17 +1263,21 @@ class Ontology(Mapping[str, Union[Term, Relationship]]):
                 relationships of the ontology graph.
 
         """
-        try:
-            return Relationship(self, self._relationships[id])
-        except KeyError:
-            pass
-        try:
-            return Relationship(self, relationship._BUILTINS[id])
-        except KeyError:
-            pass
-        for dep in self.imports.values():
-            try:
-                return Relationship(self, dep.get_relationship(id)._data())
-            except KeyError:
-                pass
-        raise KeyError(id)
+        entry = self._entity_index().get(id)
+        if entry is None or not isinstance(entry[1], RelationshipData):
+            raise KeyError(id)
+        return self._relationship_view(entry[1])
+
+
+def _dump_snapshot(
+    handle: str,
+    import_depth: int,
+    timeout: int,
+    cache_dir: Optional[str],
+    fields: Optional[FrozenSet[str]],
+) -> bytes:
+    # load an ontology in a worker process, and get a snapshot of it
+    ont = Ontology(handle, import_depth, timeout, cache_dir=cache_dir, fields=fields)
+    buffer = io.BytesIO()
+    ont.dump(buffer, format="snapshot")
+    return buffer.getvalue()
@@ -2,5 +2,14 @@ from .base import BaseParser
 from .obo import OboParser
 from .obojson import OboJSONParser
 from .rdfxml import RdfXMLParser
+from .snapshot import SnapshotParser
+from .lazy import LazyOboParser
 
-__all__ = ["BaseParser", "OboParser", "OboJSONParser", "RdfXMLParser"]
+__all__ = [
+    "BaseParser",
+    "OboParser",
+    "OboJSONParser",
+    "RdfXMLParser",
+    "SnapshotParser",
+    "LazyOboParser",
+]
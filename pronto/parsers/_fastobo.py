@@ -1,7 +1,8 @@
+import copy
 import functools
 import typing
 import warnings
-from typing import Union
+from typing import Dict, FrozenSet, Iterable, Optional, Union
 from operator import attrgetter
 
 import fastobo
@@ -15,12 +16,41 @@ from ..pv import PropertyValue, LiteralPropertyValue, ResourcePropertyValue
 from ..xref import Xref
 from ..synonym import Synonym, SynonymData, SynonymType
 from ..relationship import Relationship, RelationshipData
+from ..utils.pool import intern as _intern, pooled
 from ..utils.warnings import NotImplementedWarning
 
 # --- Type Hint --------------------------------------------------------------
 
 DefClause = Union[fastobo.term.DefClause, fastobo.typedef.DefClause]
 
+# --- Term fields ------------------------------------------------------------
+
+# The `TermData` field populated by each type of term clause
+_TERM_CLAUSE_FIELDS: Dict[type, str] = {
+    fastobo.term.AltIdClause: "alternate_ids",
+    fastobo.term.BuiltinClause: "builtin",
+    fastobo.term.CommentClause: "comment",
+    fastobo.term.ConsiderClause: "consider",
+    fastobo.term.CreatedByClause: "created_by",
+    fastobo.term.CreationDateClause: "creation_date",
+    fastobo.term.DefClause: "definition",
+    fastobo.term.DisjointFromClause: "disjoint_from",
+    fastobo.term.EquivalentToClause: "equivalent_to",
+    fastobo.term.IntersectionOfClause: "intersection_of",
+    fastobo.term.IsAClause: "is_a",
+    fastobo.term.IsAnonymousClause: "anonymous",
+    fastobo.term.IsObsoleteClause: "obsolete",
+    fastobo.term.NameClause: "name",
+    fastobo.term.NamespaceClause: "namespace",
+    fastobo.term.PropertyValueClause: "annotations",
+    fastobo.term.RelationshipClause: "relationships",
+    fastobo.term.ReplacedByClause: "replaced_by",
+    fastobo.term.SubsetClause: "subsets",
+    fastobo.term.SynonymClause: "synonyms",
+    fastobo.term.UnionOfClause: "union_of",
+    fastobo.term.XrefClause: "xrefs",
+}
+
 # --- Parser interface -------------------------------------------------------
 
 
@@ -68,19 +98,21 @@ class FastoboParser:
         """Given a `TermFrame`, create a new `Term` or enrich an existing one.
         """
         # Create a term, or get the existing one if any
-        id_ = str(frame.id)
+        id_ = _intern(str(frame.id))
         try:
             term = self.ont.create_term(id_)
         except ValueError:
+            self.ont._detach_import(id_)
             term = self.ont.get_term(id_)
-        data = term._data()
         # Process all clauses in the frame
-        for clause in frame:
-            process_clause_term(clause, data)
-        # check cardinality of constrained clauses
-        for attr, getter in self.__non_one_clause.items():
-            if len(getter(data)) == 1:
-                raise ValueError(f"{attr!r} cannot have a cardinality of 1")
+        data = term._data()
+        if id_ not in self.ont._terms:
+            self._save_import_state(data)
+        self.process_term_frame(frame, data, self.ont.fields)
+        # Register the edges of the term in the subclassing and relationship
+        # caches
+        self.ont._add_superclasses(id_, data.relationships.get("is_a", ()))
+        self.ont._add_relations(id_, data.relationships)
         # return the enriched term
         return term
 
@@ -88,21 +120,98 @@ class FastoboParser:
         """Given a `TypedefFrame`, create or enrich a `Relationship`.
         """
         # Create a relationship, or get the existing one if any
-        id_ = str(frame.id)
+        id_ = _intern(str(frame.id))
         try:
             rship = self.ont.create_relationship(id_)
         except ValueError:
+            self.ont._detach_import(id_)
             rship = self.ont.get_relationship(id_)
-        data = rship._data()
         # Process all clauses in the frame
+        data = rship._data()
+        if id_ not in self.ont._relationships:
+            self._save_import_state(data)
+        self.process_typedef_frame(frame, data)
+        # return the enriched relationship
+        return rship
+
+    def _save_import_state(self, data: EntityData) -> None:
+        # keep the state of an entity of an import before the document
+        # enriches it, so that an update can enrich it again from scratch
+        if data.id not in self.ont._import_states:
+            state = [getattr(data, attr) for attr in data.__slots__]
+            self.ont._import_states[data.id] = copy.deepcopy(state)
+
+    def _restore_import_state(self, data: EntityData) -> None:
+        # reset an entity of an import to its state before the enrichment
+        state = copy.deepcopy(self.ont._import_states[data.id])
+        for attr, value in zip(data.__slots__, state):
+            setattr(data, attr, value)
+
+    def process_frames(self, frames: Iterable[fastobo.abc.AbstractFrame]) -> None:
+        """Add the entities declared in many frames to the ontology at once.
+
+        Frames about entities already in the ontology graph (for instance,
+        entities of an import) enrich them like with `enrich_term` and
+        `enrich_relationship`, while new entities are added together with
+        `Ontology.add_entities` once every frame has been processed.
+        """
+        known = self.ont._entity_index()
+        terms: Dict[str, TermData] = {}
+        relationships: Dict[str, RelationshipData] = {}
+        fields = self.ont.fields
+        for frame in frames:
+            if isinstance(frame, fastobo.term.TermFrame):
+                id_ = _intern(str(frame.id))
+                termdata = terms.get(id_)
+                if termdata is None:
+                    if id_ in known:
+                        self.enrich_term(frame)
+                        continue
+                    terms[id_] = termdata = TermData(id_)
+                self.process_term_frame(frame, termdata, fields)
+            elif isinstance(frame, fastobo.typedef.TypedefFrame):
+                id_ = _intern(str(frame.id))
+                reldata = relationships.get(id_)
+                if reldata is None:
+                    if id_ in known:
+                        self.enrich_relationship(frame)
+                        continue
+                    relationships[id_] = reldata = RelationshipData(id_)
+                self.process_typedef_frame(frame, reldata)
+
+        self.ont.add_entities(terms.values(), relationships.values())
+
+    @classmethod
+    def process_term_frame(
+        cls,
+        frame: fastobo.term.TermFrame,
+        data: TermData,
+        fields: Optional[FrozenSet[str]] = None,
+    ):
+        """Add the clauses of a `TermFrame` to the given `TermData`.
+
+        If ``fields`` is given, only the clauses of these fields are added.
+        """
+        for clause in frame:
+            if fields is None or _TERM_CLAUSE_FIELDS.get(type(clause)) in fields:
+                process_clause_term(clause, data)
+        # check cardinality of constrained clauses
+        for attr, getter in cls.__non_one_clause.items():
+            if len(getter(data)) == 1:
+                raise ValueError(f"{attr!r} cannot have a cardinality of 1")
+
+    @classmethod
+    def process_typedef_frame(
+        cls, frame: fastobo.typedef.TypedefFrame, data: RelationshipData
+    ):
+        """Add the clauses of a `TypedefFrame` to the given `RelationshipData`.
+        """
         for clause in frame:
             process_clause_typedef(clause, data)
         # check cardinality of constrained clauses
-        for attr, getter in self.__non_one_clause.items():
+        for attr, getter in cls.__non_one_clause.items():
             if len(getter(data)) == 1:
                 raise ValueError(f"{attr!r} cannot have a cardinality of 1")
-        # return the enriched relationship
-        return rship
 
 
 # --- Miscellaneous AST nodes ------------------------------------------------
@@ -114,9 +223,10 @@ def _extract_definition(clause: DefClause) -> Definition:
 
 def _extract_property_value(pv: fastobo.pv.AbstractPropertyValue) -> PropertyValue:
     if isinstance(pv, fastobo.pv.LiteralPropertyValue):
-        return LiteralPropertyValue(str(pv.relation), pv.value, str(pv.datatype))
+        args = (str(pv.relation), pv.value, str(pv.datatype))
+        return pooled(LiteralPropertyValue, *args)
     elif isinstance(pv, fastobo.pv.ResourcePropertyValue):
-        return ResourcePropertyValue(str(pv.relation), str(pv.value))
+        return pooled(ResourcePropertyValue, str(pv.relation), str(pv.value))
     else:
         msg = "'pv' must be AbstractPropertyValue, not {}"
         raise TypeError(msg.format(type(pv).__name__))
@@ -124,12 +234,12 @@ def _extract_property_value(pv: fastobo.pv.AbstractPropertyValue) -> PropertyVal
 
 def _extract_synonym_data(syn: fastobo.syn.Synonym) -> SynonymData:
     xrefs = map(_extract_xref, syn.xrefs)
-    type_ = str(syn.type) if syn.type is not None else None
+    type_ = _intern(str(syn.type)) if syn.type is not None else None
     return SynonymData(syn.desc, syn.scope, type_, xrefs)
 
 
 def _extract_xref(xref: fastobo.xref.Xref) -> Xref:
-    return Xref(str(xref.id), xref.desc)
+    return pooled(Xref, str(xref.id), xref.desc)
 
 
 # --- Header clauses ---------------------------------------------------------
@@ -167,7 +277,7 @@ def _process_clause_header_format_version(clause, meta):
 
 @process_clause_header.register(fastobo.header.IdspaceClause)
 def _process_clause_header_idspace(clause, meta):
-    meta.idspace[str(clause.prefix)] = str(clause.url), clause.description
+    meta.idspaces[str(clause.prefix)] = str(clause.url), clause.description
 
 
 @process_clause_header.register(fastobo.header.ImportClause)
@@ -270,12 +380,12 @@ def _process_clause_entity_comment(clause, entity):
 
 @process_clause_term.register(fastobo.term.ConsiderClause)
 def _process_clause_term_consider(clause, entity):
-    entity.consider.add(str(clause.term))
+    entity.consider.add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.ConsiderClause)
 def _process_clause_typedef_consider(clause, entity):
-    entity.consider.add(str(clause.typedef))
+    entity.consider.add(_intern(str(clause.typedef)))
 
 
 @process_clause_term.register(fastobo.term.CreatedByClause)
@@ -298,32 +408,32 @@ def _process_clause_entity_definition(clause, entity):
 
 @process_clause_term.register(fastobo.term.DisjointFromClause)
 def _process_clause_term_disjoint_from(clause, entity):
-    entity.disjoint_from.add(str(clause.term))
+    entity.disjoint_from.add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.DisjointFromClause)
 def _process_clause_typedef_disjoint_from(clause, entity):
-    entity.disjoint_from.add(str(clause.typedef))
+    entity.disjoint_from.add(_intern(str(clause.typedef)))
 
 
 @process_clause_typedef.register(fastobo.typedef.DisjointOverClause)
 def _process_clause_typedef_disjoint_over(clause, entity):
-    entity.disjoint_over.add(str(clause.typedef))
+    entity.disjoint_over.add(_intern(str(clause.typedef)))
 
 
 @process_clause_typedef.register(fastobo.typedef.DomainClause)
 def _process_clause_typedef_domain(clause, entity):
-    entity.domain = str(clause.domain)
+    entity.domain = _intern(str(clause.domain))
 
 
 @process_clause_term.register(fastobo.term.EquivalentToClause)
 def _process_clause_term_equivalent_to(clause, entity):
-    entity.equivalent_to.add(str(clause.term))
+    entity.equivalent_to.add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.EquivalentToClause)
 def _process_clause_typedef_equivalent_to(clause, entity):
-    entity.equivalent_to.add(str(clause.typedef))
+    entity.equivalent_to.add(_intern(str(clause.typedef)))
 
 
 @process_clause_typedef.register(fastobo.typedef.EquivalentToChainClause)
@@ -345,35 +455,37 @@ def _process_clause_typedef_expand_expression_to(clause, entity):
 
 @process_clause_typedef.register(fastobo.typedef.HoldsOverChainClause)
 def _process_clause_typedef_holds_over_chain(clause, entity):
-    entity.holds_over_chain.add((str(clause.first), str(clause.last)))
+    first, last = _intern(str(clause.first)), _intern(str(clause.last))
+    entity.holds_over_chain.add((first, last))
 
 
 @process_clause_term.register(fastobo.term.IntersectionOfClause)
 def _process_clause_term_intersection_of(clause, entity):
     if clause.typedef is None:
-        entity.intersection_of.add(str(clause.term))
+        entity.intersection_of.add(_intern(str(clause.term)))
     else:
-        entity.intersection_of.add((str(clause.typedef), str(clause.term)))
+        typedef = _intern(str(clause.typedef))
+        entity.intersection_of.add((typedef, _intern(str(clause.term))))
 
 
 @process_clause_typedef.register(fastobo.typedef.IntersectionOfClause)
 def _process_clause_typedef_intersection_of(clause, entity):
-    entity.intersection_of.add(str(clause.typedef))
+    entity.intersection_of.add(_intern(str(clause.typedef)))
 
 
 @process_clause_typedef.register(fastobo.typedef.InverseOfClause)
 def _process_clause_typedef_inverse_of(clause, entity):
-    entity.inverse_of = str(clause.typedef)
+    entity.inverse_of = _intern(str(clause.typedef))
 
 
 @process_clause_term.register(fastobo.term.IsAClause)
 def _process_clause_term_is_a(clause, entity):
-    entity.relationships.setdefault("is_a", set()).add(str(clause.term))
+    entity.relationships.setdefault("is_a", set()).add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.IsAClause)
 def _process_clause_typedef_is_a(clause, entity):
-    entity.relationships.setdefault("is_a", set()).add(str(clause.typedef))
+    entity.relationships.setdefault("is_a", set()).add(_intern(str(clause.typedef)))
 
 
 @process_clause_term.register(fastobo.term.IsAnonymousClause)
@@ -452,7 +564,7 @@ def _process_clause_entity_name(clause, entity):
 @process_clause_term.register(fastobo.term.NamespaceClause)
 @process_clause_typedef.register(fastobo.typedef.NamespaceClause)
 def _process_clause_entity_namespace(clause, entity):
-    entity.namespace = str(clause.namespace)
+    entity.namespace = _intern(str(clause.namespace))
 
 
 @process_clause_header.register(fastobo.header.PropertyValueClause)
@@ -464,33 +576,35 @@ def _process_clause_entity_property_value(clause, entity):
 
 @process_clause_typedef.register(fastobo.typedef.RangeClause)
 def _process_clause_typedef_range(clause, entity):
-    entity.range = str(clause.range)
+    entity.range = _intern(str(clause.range))
 
 
 @process_clause_term.register(fastobo.term.RelationshipClause)
 def _process_clause_term_relationship(clause, entity):
-    entity.relationships.setdefault(str(clause.typedef), set()).add(str(clause.term))
+    typedef, term = _intern(str(clause.typedef)), _intern(str(clause.term))
+    entity.relationships.setdefault(typedef, set()).add(term)
 
 
 @process_clause_term.register(fastobo.typedef.RelationshipClause)
 def _process_clause_typedef_relationship(clause, entity):
-    entity.relationships.setdefault(str(clause.typedef), set()).add(str(clause.target))
+    typedef, target = _intern(str(clause.typedef)), _intern(str(clause.target))
+    entity.relationships.setdefault(typedef, set()).add(target)
 
 
 @process_clause_term.register(fastobo.term.ReplacedByClause)
 def _process_clause_term_replaced_by(clause, entity):
-    entity.replaced_by.add(str(clause.term))
+    entity.replaced_by.add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.ReplacedByClause)
 def _process_clause_typedef_replaced_by(clause, entity):
-    entity.replaced_by.add(str(clause.typedef))
+    entity.replaced_by.add(_intern(str(clause.typedef)))
 
 
 @process_clause_term.register(fastobo.term.SubsetClause)
 @process_clause_typedef.register(fastobo.typedef.SubsetClause)
 def _process_clause_entity_subset(clause, entity):
-    entity.subsets.add(str(clause.subset))
+    entity.subsets.add(_intern(str(clause.subset)))
 
 
 @process_clause_term.register(fastobo.term.SynonymClause)
@@ -501,17 +615,17 @@ def _process_clause_entity_synonym(clause, entity):
 
 @process_clause_typedef.register(fastobo.typedef.TransitiveOverClause)
 def _process_clause_typedef_transitive_over(clause, entity):
-    entity.transitive_over.add(str(clause.typedef))
+    entity.transitive_over.add(_intern(str(clause.typedef)))
 
 
 @process_clause_term.register(fastobo.term.UnionOfClause)
 def _process_clause_term_union_of(clause, entity):
-    entity.union_of.add(str(clause.term))
+    entity.union_of.add(_intern(str(clause.term)))
 
 
 @process_clause_typedef.register(fastobo.typedef.UnionOfClause)
 def _process_clause_typedef_union_of(clause, entity):
-    entity.union_of.add(str(clause.term))
+    entity.union_of.add(_intern(str(clause.term)))
 
 
 @process_clause_term.register(fastobo.term.XrefClause)
@@ -1,11 +1,23 @@
 import abc
+import contextvars
 import os
+import threading
 import typing
 import urllib.parse
-from typing import Dict, Set
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, FrozenSet, Optional, Set, Tuple
 
+from ..metadata import Metadata
 from ..ontology import Ontology
 
+# The maximum number of threads used to load the imports of an ontology
+_MAX_IMPORT_THREADS = 8
+
+# The imports being loaded in the current import tree, by URL and depth
+_IMPORT_REGISTRY: "contextvars.ContextVar[Optional[Dict[Tuple[str, int], Future]]]"
+_IMPORT_REGISTRY = contextvars.ContextVar("_IMPORT_REGISTRY", default=None)
+_IMPORT_LOCK = threading.Lock()
+
 
 class BaseParser(abc.ABC):
     def __init__(self, ont: Ontology):
@@ -22,6 +34,14 @@ class BaseParser(abc.ABC):
     def parse_from(self, handle: typing.BinaryIO) -> None:
         return NotImplemented
 
+    def parse_metadata(self, handle: typing.BinaryIO) -> Metadata:
+        """Parse only the metadata of the document in the given handle.
+
+        Reading stops as soon as the metadata has been parsed, and the
+        imports of the ontology are not resolved.
+        """
+        raise NotImplementedError(f"{type(self).__name__}.parse_metadata")
+
     @classmethod
     def process_imports(
         cls,
@@ -29,26 +49,82 @@ class BaseParser(abc.ABC):
         import_depth: int = -1,
         basepath: str = "",
         timeout: int = 5,
+        threads: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
     ) -> Dict[str, Ontology]:
+        """Resolve the imports of an ontology concurrently.
+
+        Imports are loaded in a pool of at most ``threads`` worker threads.
+        An `Ontology` loaded for a given URL and import depth is shared by
+        all the ontologies importing it within the same import tree, so
+        that it is only loaded once; an importer adding data to entities of
+        a shared import works on its own copy of the import, made when it
+        first does so. Imports are cached in ``cache_dir``,
+        if given, and only load the term fields in ``fields``, if given.
+        """
         # check we did not reach the maximum import depth
         resolved: Dict[str, Ontology] = {}
-        if import_depth == 0:
+        if import_depth == 0 or not imports:
             return resolved
 
-        # process each import
-        for ref in imports:
-            s = urllib.parse.urlparse(ref).scheme
-            if s in {"ftp", "http", "https"} or os.path.exists(ref):
-                url = ref
-            else:
-                for ext in ["", ".obo", ".json", ".owl"]:
-                    if os.path.exists(os.path.join(basepath, f"{ref}{ext}")):
-                        url = os.path.join(basepath, f"{ref}{ext}")
-                        break
-                else:
-                    id_ = f"{ref}.obo" if not os.path.splitext(ref)[1] else ref
-                    url = f"http://purl.obolibrary.org/obo/{id_}"
-            resolved[ref] = Ontology(url, max(import_depth - 1, 0), timeout)
+        # use the registry of the import tree, or create a new one
+        registry = _IMPORT_REGISTRY.get()
+        token = None
+        if registry is None:
+            token = _IMPORT_REGISTRY.set({})
+            registry = _IMPORT_REGISTRY.get()
+
+        # process each import, loading the ones not already being loaded
+        depth = max(import_depth - 1, 0)
+        workers = threads or min(len(imports), _MAX_IMPORT_THREADS)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures: Dict[str, "Future[Ontology]"] = {}
+                for ref in imports:
+                    key = (cls.resolve_import(ref, basepath), depth)
+                    with _IMPORT_LOCK:
+                        future = registry.get(key)
+                        if future is None:
+                            future = registry[key] = Future()
+                            ctx = contextvars.copy_context()
+                            args = (future, *key, timeout, cache_dir, fields)
+                            pool.submit(ctx.run, _load_import, *args)
+                    futures[ref] = future
+                for ref, future in futures.items():
+                    resolved[ref] = future.result()
+        finally:
+            if token is not None:
+                _IMPORT_REGISTRY.reset(token)
 
         # return the resolved imports
         return resolved
+
+    @staticmethod
+    def resolve_import(ref: str, basepath: str = "") -> str:
+        """Get the path or URL to load for the given import reference.
+        """
+        s = urllib.parse.urlparse(ref).scheme
+        if s in {"ftp", "http", "https"} or os.path.exists(ref):
+            return ref
+        for ext in ["", ".obo", ".json", ".owl"]:
+            if os.path.exists(os.path.join(basepath, f"{ref}{ext}")):
+                return os.path.join(basepath, f"{ref}{ext}")
+        id_ = f"{ref}.obo" if not os.path.splitext(ref)[1] else ref
+        return f"http://purl.obolibrary.org/obo/{id_}"
+
+
+def _load_import(
+    future: "Future[Ontology]",
+    url: str,
+    depth: int,
+    timeout: int,
+    cache_dir: Optional[str],
+    fields: Optional[FrozenSet[str]],
+):
+    if future.set_running_or_notify_cancel():
+        try:
+            ont = Ontology(url, depth, timeout, cache_dir=cache_dir, fields=fields)
+            future.set_result(ont)
+        except BaseException as err:
+            future.set_exception(err)
@@ -0,0 +1,178 @@
+import mmap
+import os
+import re
+import typing
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import fastobo
+
+from .obo import _CLAUSE_ID, _FRAME_HEADER, OboParser
+from ..logic.relations import Adjacency
+from ..term import TermData
+from ..utils.impl import set
+from ..utils.io import MAGIC_BZIP2, MAGIC_GZIP, MAGIC_LZMA, MemoryMappedFile
+from ..utils.pool import ValuePool, use_pool
+
+_MAGIC_COMPRESSED = (bytes(MAGIC_GZIP), bytes(MAGIC_LZMA), bytes(MAGIC_BZIP2))
+
+# A span of bytes in a memory-mapped document
+Span = Tuple[int, int]
+
+_CLAUSE_IS_A = re.compile(rb"^is_a:[ \t]*(\S+)", re.MULTILINE)
+_CLAUSE_RELATIONSHIP = re.compile(
+    rb"^relationship:[ \t]*(\S+)[ \t]+(\S+)", re.MULTILINE
+)
+
+
+class LazyTermMapping(MutableMapping[str, TermData]):
+    """A mapping of term identifiers to `TermData` parsed on first access.
+
+    The mapping only stores the location of each term frame in the source
+    document until the term data is actually requested, at which point the
+    frame is parsed with `fastobo` and the resulting `TermData` replaces the
+    location so that it is only parsed once. If ``fields`` is given, only
+    the clauses of these fields are parsed.
+    """
+
+    def __init__(
+        self,
+        buffer: typing.Union[bytes, mmap.mmap],
+        fields: Optional[FrozenSet[str]] = None,
+    ):
+        self._buffer = buffer
+        self._fields = fields
+        self._pool = ValuePool()
+        self._entries: Dict[str, Union[TermData, List[Span]]] = {}
+
+    def __reduce__(self):
+        return dict, (list(self.items()),)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._entries
+
+    def __getitem__(self, id: str) -> TermData:
+        entry = self._entries[id]
+        if isinstance(entry, TermData):
+            return entry
+        self._entries[id] = data = self._load(id, entry)
+        return data
+
+    def __setitem__(self, id: str, data: TermData) -> None:
+        self._entries[id] = data
+
+    def __delitem__(self, id: str) -> None:
+        del self._entries[id]
+
+    def _add_span(self, id: str, span: Span) -> None:
+        entry = self._entries.setdefault(id, [])
+        typing.cast(List[Span], entry).append(span)
+
+    def _load(self, id: str, spans: List[Span]) -> TermData:
+        data = TermData(id)
+        with use_pool(self._pool):
+            for start, end in spans:
+                text = self._buffer[start:end].decode("utf-8")
+                for frame in fastobo.loads(text):
+                    OboParser.process_term_frame(frame, data, self._fields)
+        return data
+
+    @property
+    def loaded(self) -> int:
+        """`int`: The number of terms that have been parsed so far.
+        """
+        return sum(isinstance(e, TermData) for e in self._entries.values())
+
+
+class LazyOboParser(OboParser):
+    """A parser for OBO documents that only parses term frames on demand.
+
+    The document is indexed in a single scan over its raw bytes, recording
+    the location of every ``[Term]`` frame as well as its ``is_a`` and
+    ``relationship`` clauses so that the subclassing and relationship caches
+    can be populated without parsing any term. ``[Typedef]`` frames are
+    parsed eagerly, since they are usually few.
+
+    This parser is never selected automatically, use
+    ``Ontology(path, lazy=True)`` to enable it.
+    """
+
+    def parse_from(self, handle):
+        if isinstance(handle, MemoryMappedFile):
+            buffer = handle.getbuffer()
+        else:
+            try:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError):
+                buffer = handle.read()
+        if buffer[:8].startswith(_MAGIC_COMPRESSED):
+            raise ValueError("cannot lazily load a compressed document")
+
+        # Locate every frame in the document
+        starts = [(m.start(), m.group(1)) for m in _FRAME_HEADER.finditer(buffer)]
+        ends = [start for start, _ in starts[1:]] + [len(buffer)]
+
+        # Extract metadata from the OBO header and resolve imports
+        header_end = starts[0][0] if starts else len(buffer)
+        header = fastobo.loads(buffer[:header_end].decode("utf-8")).header
+        self.ont.metadata = self.extract_metadata(header)
+        self.ont.imports.update(
+            self.process_imports(
+                self.ont.metadata.imports,
+                self.ont.import_depth,
+                os.path.dirname(self.ont.path or str()),
+                self.ont.timeout,
+                cache_dir=self.ont.cache_dir,
+                fields=self.ont.fields,
+            )
+        )
+
+        # Index term frames and parse typedef frames
+        fields = self.ont.fields
+        self.ont._terms = terms = LazyTermMapping(buffer, fields)
+        pool = terms._pool
+        index_is_a = fields is None or "is_a" in fields
+        index_relationships = fields is None or "relationships" in fields
+        relations = self.ont._relations
+        for (start, kind), end in zip(starts, ends):
+            match = _CLAUSE_ID.search(buffer, start, end)
+            if match is None:
+                raise SyntaxError(f"missing `id` clause in frame at offset {start}")
+            if kind == b"Typedef":
+                text = buffer[start:end].decode("utf-8")
+                for frame in fastobo.loads(text):
+                    self.enrich_relationship(frame)
+            elif kind == b"Term":
+                id_ = pool.intern(match.group(1).decode("utf-8"))
+                terms._add_span(id_, (start, end))
+                parents = (
+                    _CLAUSE_IS_A.finditer(buffer, start, end) if index_is_a else ()
+                )
+                self.ont._add_superclasses(
+                    id_, (pool.intern(m.group(1).decode("utf-8")) for m in parents)
+                )
+                if not index_relationships:
+                    continue
+                for m in _CLAUSE_RELATIONSHIP.finditer(buffer, start, end):
+                    rel, target = (pool.intern(g.decode("utf-8")) for g in m.groups())
+                    forward = relations.setdefault(id_, Adjacency()).forward
+                    forward.setdefault(rel, set()).add(target)
+                    backward = relations.setdefault(target, Adjacency()).backward
+                    backward.setdefault(rel, set()).add(id_)
+
+        # Index the identifiers of the terms on the next lookup
+        self.ont._invalidate_indexes()
@@ -1,9 +1,26 @@
+import hashlib
 import os
+import re
+import typing
+from typing import Dict, List, Optional, Tuple
 
 import fastobo
 
 from .base import BaseParser
 from ._fastobo import FastoboParser
+from ..entity import EntityData
+from ..term import TermData
+from ..utils.impl import set
+from ..utils.pool import use_pool
+
+if typing.TYPE_CHECKING:
+    from ..ontology import ChangeSummary
+
+_FRAME_HEADER = re.compile(rb"^\[(Term|Typedef|Instance)\][ \t]*\r?$", re.MULTILINE)
+_CLAUSE_ID = re.compile(rb"^id:[ \t]*(\S+)", re.MULTILINE)
+
+# A frame kind and identifier, used to key frame fingerprints
+FrameKey = Tuple[bytes, str]
 
 
 class OboParser(FastoboParser, BaseParser):
@@ -23,16 +40,212 @@ class OboParser(FastoboParser, BaseParser):
                 self.ont.import_depth,
                 os.path.dirname(self.ont.path or str()),
                 self.ont.timeout,
+                cache_dir=self.ont.cache_dir,
+                fields=self.ont.fields,
             )
         )
 
-        # Extract frames from the current document.
+        # Extract frames from the current document, sharing equal values
         try:
-            for frame in doc:
-                if isinstance(frame, fastobo.term.TermFrame):
-                    self.enrich_term(frame)
-                elif isinstance(frame, fastobo.typedef.TypedefFrame):
-                    self.enrich_relationship(frame)
+            with use_pool():
+                self.process_frames(doc)
         except SyntaxError as s:
             location = self.ont.path, s.lineno, s.offset, s.text
             raise SyntaxError(s.args[0], location) from None
+
+    def parse_metadata(self, handle):
+        # Read the lines of the header, up to the first frame
+        lines = []
+        for line in handle:
+            if line.lstrip().startswith(b"["):
+                break
+            lines.append(line)
+        header = fastobo.loads(b"".join(lines).decode("utf-8")).header
+        return self.extract_metadata(header)
+
+    def update_from(self, handle: typing.BinaryIO) -> "ChangeSummary":
+        """Update the ontology with a new revision of its OBO document.
+
+        The raw bytes of the frames of every entity are fingerprinted, and
+        only the entities which fingerprint differs from the one of the
+        previous revision are parsed again. Fingerprints are only recorded
+        by this method, so the first update parses every frame, and only
+        reports the entities which data actually changed.
+        """
+        from ..ontology import ChangeSummary
+
+        buffer = handle.read()
+        header_end, spans = _index_frames(buffer)
+        fingerprints: Dict[FrameKey, bytes] = {}
+        for key, locations in spans.items():
+            hasher = hashlib.blake2b(digest_size=16)
+            for start, end in locations:
+                hasher.update(buffer[start:end])
+            fingerprints[key] = hasher.digest()
+
+        # Update the metadata, and resolve the imports again if they changed
+        header = fastobo.loads(buffer[:header_end].decode("utf-8")).header
+        imports = self.ont.metadata.imports
+        self.ont.metadata = self.extract_metadata(header)
+        reimported = self.ont.metadata.imports != imports
+        if reimported:
+            self.ont.imports = self.process_imports(
+                self.ont.metadata.imports,
+                self.ont.import_depth,
+                os.path.dirname(self.ont.path or str()),
+                self.ont.timeout,
+                cache_dir=self.ont.cache_dir,
+                fields=self.ont.fields,
+            )
+
+        # Use empty fingerprints for the entities of an ontology that was
+        # never updated, so that all of them are parsed again
+        previous = self.ont._fingerprints
+        if previous is None:
+            previous = dict.fromkeys(((b"Term", id) for id in self.ont._terms), b"")
+            previous.update(
+                dict.fromkeys(((b"Typedef", id) for id in self.ont._relationships), b"")
+            )
+            for id_ in self.ont._import_states:
+                data = self.ont[id_]._data()
+                previous[b"Term" if isinstance(data, TermData) else b"Typedef", id_] = b""
+
+        # Remove the entities that are not in the document anymore, and
+        # then their edges, once the lookup index has been invalidated
+        added: List[str] = []
+        changed: List[str] = []
+        removed: List[str] = []
+        unlinked: List[str] = []
+        restored: List[str] = []
+        dropped: List[EntityData] = []
+        for kind, id_ in previous.keys() - fingerprints.keys():
+            removed.append(id_)
+            if kind == b"Term" and id_ in self.ont._terms:
+                dropped.append(self.ont._terms.pop(id_))
+                unlinked.append(id_)
+            elif kind == b"Typedef" and id_ in self.ont._relationships:
+                dropped.append(self.ont._relationships.pop(id_))
+            elif id_ in self.ont._import_states and not reimported:
+                restored.append(id_)
+        self.ont._invalidate_indexes()
+        self.ont._drop_views(dropped)
+        for id_ in unlinked:
+            self._unlink_term(id_)
+            lineage = self.ont._inheritance.get(id_)
+            if lineage is not None and not lineage.sub:
+                del self.ont._inheritance[id_]
+
+        # Reset the entities of the imports the document does not enrich
+        # anymore to their state before the enrichment
+        for id_ in restored:
+            data = self.ont[id_]._data()
+            if isinstance(data, TermData):
+                self._unlink_term(id_)
+            self._restore_import_state(data)
+            del self.ont._import_states[id_]
+            if isinstance(data, TermData):
+                self.ont._add_superclasses(id_, data.relationships.get("is_a", ()))
+                self._link_term(id_, data)
+
+        # Imports that were resolved again have not been enriched by the
+        # document yet, so the frames about their entities must be parsed
+        if reimported:
+            self.ont._import_states.clear()
+
+        # Parse the frames of new entities and of entities that changed
+        # again, resetting the data of existing entities in place so that
+        # the views to these entities stay valid
+        try:
+            for key, fingerprint in fingerprints.items():
+                kind, id_ = key
+                if kind == b"Term":
+                    data = self.ont._terms.get(id_)
+                else:
+                    data = self.ont._relationships.get(id_)
+                # entities also declared in an import are stored there, and
+                # are enriched in place like when the document is parsed,
+                # starting over from their state before the previous update
+                imported = data is None and id_ in self.ont
+                if previous.get(key) == fingerprint:
+                    if not (imported and reimported):
+                        continue
+                new = data is None and not imported
+                if new:
+                    added.append(id_)
+                else:
+                    if data is None:
+                        data = self.ont[id_]._data()
+                    old = [getattr(data, attr) for attr in data.__slots__]
+                    if kind == b"Term":
+                        self._unlink_term(id_)
+                    if not imported:
+                        data.__init__(id_)  # type: ignore
+                    elif id_ in self.ont._import_states:
+                        self._restore_import_state(data)
+                text = b"".join(buffer[s:e] for s, e in spans[key]).decode("utf-8")
+                for frame in fastobo.loads(text):
+                    if isinstance(frame, fastobo.term.TermFrame):
+                        data = self.enrich_term(frame)._data()
+                    elif isinstance(frame, fastobo.typedef.TypedefFrame):
+                        data = self.enrich_relationship(frame)._data()
+                if not new:
+                    if old != [getattr(data, attr) for attr in data.__slots__]:
+                        changed.append(id_)
+        except SyntaxError as s:
+            location = self.ont.path, s.lineno, s.offset, s.text
+            raise SyntaxError(s.args[0], location) from None
+
+        # Rebuild the caches from scratch if the imports changed, since the
+        # edges of the previous imports cannot be told apart
+        if reimported:
+            self.ont._rebuild_caches()
+
+        self.ont._fingerprints = fingerprints
+        return ChangeSummary(frozenset(added), frozenset(changed), frozenset(removed))
+
+    def _unlink_term(self, id: str) -> None:
+        # remove the edges from a term to its superclasses and to the
+        # targets of its relationships from the caches
+        inheritance = self.ont._inheritance
+        lineage = inheritance.get(id)
+        if lineage is not None:
+            for sup in lineage.sup:
+                superclass = inheritance.get(sup)
+                if superclass is None:
+                    continue
+                superclass.sub.discard(id)
+                if not superclass.sub and not superclass.sup and sup not in self.ont:
+                    del inheritance[sup]
+            lineage.sup.clear()
+        relations = self.ont._relations
+        adjacency = relations.get(id)
+        if adjacency is not None:
+            for rel, targets in adjacency.forward.items():
+                for target in targets:
+                    backward = relations[target].backward
+                    backward[rel].discard(id)
+                    if not backward[rel]:
+                        del backward[rel]
+            adjacency.forward.clear()
+
+    def _link_term(self, id: str, data: TermData) -> None:
+        # add the edges from a term to the targets of its relationships to
+        # the relationship cache (`enrich_term` adds them for parsed frames)
+        self.ont._add_relations(id, data.relationships)
+
+
+def _index_frames(buffer: bytes) -> Tuple[int, Dict[FrameKey, List[Tuple[int, int]]]]:
+    """Locate the header and the frames of each entity in an OBO document.
+    """
+    starts = [(m.start(), m.group(1)) for m in _FRAME_HEADER.finditer(buffer)]
+    ends = [start for start, _ in starts[1:]] + [len(buffer)]
+    spans: Dict[FrameKey, List[Tuple[int, int]]] = {}
+    for (start, kind), end in zip(starts, ends):
+        if kind == b"Instance":
+            continue
+        match = _CLAUSE_ID.search(buffer, start, end)
+        if match is None:
+            raise SyntaxError(f"missing `id` clause in frame at offset {start}")
+        key = (kind, match.group(1).decode("utf-8"))
+        spans.setdefault(key, []).append((start, end))
+    return starts[0][0] if starts else len(buffer), spans
@@ -1,38 +1,352 @@
+import codecs
+import io
+import json
 import os
+import re
+import typing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import fastobo
 
 from .base import BaseParser
 from ._fastobo import FastoboParser
+from ..utils.io import DEFAULT_CHUNK_SIZE
+from ..utils.pool import use_pool
+
+# The number of nodes or edges converted with a single call to `fastobo`
+_BATCH_SIZE = 1000
+
+# The graph keys storing lists of axioms about nodes
+_AXIOMS = (
+    "equivalentNodesSets",
+    "logicalDefinitionAxioms",
+    "domainRangeAxioms",
+    "propertyChainAxioms",
+)
+
+# A graph document with a single graph, to format with serialized items
+_GRAPH = '{{"graphs":[{{"id":{id},"nodes":[{nodes}],"edges":[{edges}]}}]}}'
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SKIP = re.compile(r'[^"\[\]{}]*')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+class _JSONReader(object):
+    """An incremental reader for a JSON document in a binary stream.
+
+    The structure of the document is walked with `members` and `elements`,
+    and only the values read with `value` are loaded in memory.
+    """
+
+    def __init__(self, handle: typing.BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self.handle.read(self.chunk_size)
+        self._eof = not chunk
+        text = self._decoder.decode(chunk, final=self._eof)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespaces, and get the next character, or ``""`` at EOF.
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consume the next character, which must be ``char``.
+        """
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self._pos}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Read the next JSON value.
+        """
+        return self.raw_value()[0]
+
+    def raw_value(self) -> Tuple[Any, str]:
+        """Read the next JSON value, along with its source text.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer may be truncated
+            if end < len(self._buffer) or not self._fill():
+                text = self._buffer[self._pos : end]
+                self._pos = end
+                return value, text
+
+    def skip(self) -> None:
+        """Skip the next JSON value without decoding it.
+        """
+        if self.peek() not in ("[", "{"):
+            self.raw_value()
+            return
+        depth = 0
+        while True:
+            self._pos = _SKIP.match(self._buffer, self._pos).end()
+            if self._pos == len(self._buffer):
+                if not self._fill():
+                    raise ValueError("unexpected end of document")
+                continue
+            char = self._buffer[self._pos]
+            if char == '"':
+                match = _STRING.match(self._buffer, self._pos)
+                if match is None:  # the string may be truncated
+                    if not self._fill():
+                        raise ValueError("unterminated string in document")
+                    continue
+                self._pos = match.end()
+            else:
+                self._pos += 1
+                depth += 1 if char in ("[", "{") else -1
+                if depth == 0:
+                    return
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the next JSON object.
+
+        The value of each key must be consumed before the next key is read.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self._pos += 1
+                return
+            self.expect(",")
+
+    def elements(self) -> Iterator[None]:
+        """Iterate over the elements of the next JSON array.
+
+        Each element must be consumed before the next element is read.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == "]":
+                self._pos += 1
+                return
+            self.expect(",")
 
 
 class OboJSONParser(FastoboParser, BaseParser):
+    """A parser for OBO graphs serialized in JSON format.
+
+    By default, the document is read incrementally: nodes and edges are
+    converted to OBO frames by `fastobo` in small batches, so that the whole
+    graph is never loaded in memory. The metadata is only converted before
+    the nodes if the graph serializes it first, so that the imports of the
+    graph can be resolved before any entity is created, like when parsing
+    the whole graph at once. Otherwise, it is converted after the nodes.
+    """
+
     @classmethod
     def can_parse(cls, path, buffer):
         return buffer.lstrip().startswith(b"{")
 
+    def __init__(self, ont, streaming: bool = True):
+        super().__init__(ont)
+        self.streaming = streaming
+
     def parse_from(self, handle):
-        # Load the OBO graph into a syntax tree using fastobo
+        # Parse the document either incrementally or as a whole graph,
+        # sharing equal values between entities
+        try:
+            with use_pool():
+                if self.streaming:
+                    self._parse_stream(handle)
+                else:
+                    self._parse_graph(handle)
+        except SyntaxError as err:
+            location = self.ont.path, err.lineno, err.offset, err.text
+            raise SyntaxError(err.args[0], location) from None
+
+    def parse_metadata(self, handle):
+        # Only read the `id` and `meta` of the first graph, skipping the rest
+        reader = _JSONReader(handle)
+        for key in reader.members():
+            if key != "graphs":
+                reader.skip()
+                continue
+            for _ in reader.elements():
+                graph: Dict[str, Any] = {"id": "", "nodes": [], "edges": []}
+                for key in reader.members():
+                    if key in ("id", "meta"):
+                        graph[key] = reader.value()
+                        if "meta" in graph and graph["id"]:
+                            break
+                    else:
+                        reader.skip()
+                doc = _load_graph(json.dumps({"graphs": [graph]}))
+                return self.extract_metadata(doc.header)
+        raise ValueError("could not find any graph in document")
+
+    # -- Parsing strategies --------------------------------------------------
+
+    def _parse_graph(self, handle: typing.BinaryIO):
+        """Parse the document after loading the whole graph with `fastobo`.
+        """
         doc = fastobo.load_graph(handle)
+        self._process_header(doc.header)
+        self._process_frames(doc)
+
+    def _parse_stream(self, handle: typing.BinaryIO):
+        """Parse the first graph of the document one batch at a time.
+
+        Nodes and edges are converted with `fastobo` in batches of at most
+        ``_BATCH_SIZE`` items, each batch being a graph of its own with
+        stub nodes for the subjects of its edges. The axioms of the graph
+        are converted last, once every node is known. The metadata is
+        converted before the first batch if the ``id`` and ``meta`` of the
+        graph come before its nodes and edges, and last otherwise.
+        """
+        reader = _JSONReader(handle)
+        for key in reader.members():
+            if key != "graphs":
+                reader.skip()
+                continue
+            for _ in reader.elements():
+                # like `fastobo.load_graph`, only load the first graph
+                self._parse_graph_stream(reader)
+                return
+        raise ValueError("could not find any graph in document")
+
+    def _parse_graph_stream(self, reader: _JSONReader):
+        types: Dict[str, Optional[str]] = {}  # node types, by node id
+        graph: Dict[str, Any] = {"id": "", "nodes": [], "edges": []}
+        deferred: List[Tuple[str, str]] = []  # edges before the nodes
+        nodes_seen = header_seen = False
+
+        for key in reader.members():
+            # convert the metadata before the entities if it is available
+            if key in ("nodes", "edges") and not header_seen:
+                header_seen = "id" in graph and "meta" in graph
+                if header_seen:
+                    self._process_header(self._load_header(graph))
+
+            if key == "nodes":
+                nodes: List[str] = []
+                for _ in reader.elements():
+                    node, text = reader.raw_value()
+                    types[node["id"]] = node.get("type")
+                    nodes.append(text)
+                    if len(nodes) == _BATCH_SIZE:
+                        self._process_batch(graph["id"], nodes, [])
+                        nodes.clear()
+                self._process_batch(graph["id"], nodes, [])
+                self._process_edges(graph["id"], deferred, types)
+                deferred.clear()
+                nodes_seen = True
+            elif key == "edges":
+                edges: List[Tuple[str, str]] = []
+                for _ in reader.elements():
+                    edge, text = reader.raw_value()
+                    edges.append((edge.get("sub"), text))
+                    if len(edges) == _BATCH_SIZE and nodes_seen:
+                        self._process_edges(graph["id"], edges, types)
+                        edges.clear()
+                if nodes_seen:
+                    self._process_edges(graph["id"], edges, types)
+                else:
+                    deferred.extend(edges)
+            else:
+                graph[key] = reader.value()
+
+        # process the metadata and the axioms with stubs for their nodes
+        self._process_edges(graph["id"], deferred, types)
+        ids: typing.Set[str] = set()
+        for key in _AXIOMS:
+            _collect_ids(graph.get(key, []), types, ids)
+        graph["nodes"] = [{"id": id_, "type": types[id_]} for id_ in ids]
+        doc = _load_graph(json.dumps({"graphs": [graph]}))
+        if not header_seen:
+            self._process_header(doc.header)
+        self._process_frames(doc)
+
+    # -- Helper methods ------------------------------------------------------
+
+    def _load_header(self, graph: Dict[str, Any]) -> fastobo.header.HeaderFrame:
+        # convert the metadata of a graph without any of its nodes
+        meta = {"id": graph["id"], "meta": graph["meta"], "nodes": [], "edges": []}
+        return _load_graph(json.dumps({"graphs": [meta]})).header
 
+    def _process_header(self, header: fastobo.header.HeaderFrame):
         # Extract metadata from the graph metadata and resolve imports
-        self.ont.metadata = self.extract_metadata(doc.header)
+        self.ont.metadata = self.extract_metadata(header)
         self.ont.imports.update(
             self.process_imports(
                 self.ont.metadata.imports,
                 self.ont.import_depth,
                 os.path.dirname(self.ont.path or str()),
                 self.ont.timeout,
+                cache_dir=self.ont.cache_dir,
+                fields=self.ont.fields,
             )
         )
 
-        # Extract frames from the current document.
-        try:
-            for frame in doc:
-                if isinstance(frame, fastobo.term.TermFrame):
-                    self.enrich_term(frame)
-                elif isinstance(frame, fastobo.typedef.TypedefFrame):
-                    self.enrich_relationship(frame)
-        except SyntaxError as err:
-            location = self.ont.path, err.lineno, err.offset, err.text
-            raise SyntaxError(err.args[0], location) from None
+    def _process_frames(self, doc: fastobo.doc.OboDoc):
+        # Extract frames from the current document
+        self.process_frames(doc)
+
+    def _process_batch(self, id: str, nodes: List[str], edges: List[str]):
+        # convert serialized nodes and edges without decoding them again
+        if nodes or edges:
+            text = _GRAPH.format(
+                id=json.dumps(id), nodes=",".join(nodes), edges=",".join(edges)
+            )
+            self._process_frames(_load_graph(text))
+
+    def _process_edges(
+        self, id: str, edges: List[Tuple[str, str]], types: Dict[str, Optional[str]]
+    ):
+        # `fastobo` ignores edges with an unknown subject, so the subject
+        # of each edge must be declared with the type of the original node
+        for i in range(0, len(edges), _BATCH_SIZE):
+            batch = edges[i : i + _BATCH_SIZE]
+            subjects = {sub for sub, _ in batch if sub in types}
+            nodes = [json.dumps({"id": sub, "type": types[sub]}) for sub in subjects]
+            self._process_batch(id, nodes, [text for _, text in batch])
+
+
+def _collect_ids(value: Any, types: Dict[str, Optional[str]], ids: typing.Set[str]):
+    if isinstance(value, str):
+        if value in types:
+            ids.add(value)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_ids(item, types, ids)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_ids(item, types, ids)
+
+
+def _load_graph(text: str) -> fastobo.doc.OboDoc:
+    return fastobo.load_graph(io.BytesIO(text.encode("utf-8")))
@@ -3,23 +3,25 @@ import os
 import re
 import typing
 import warnings
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 import dateutil.parser
 
 from .base import BaseParser
 from ..definition import Definition
 from ..metadata import Metadata, Subset
-from ..term import Term
+from ..term import Term, TermData
 from ..synonym import SynonymData, SynonymType
 from ..relationship import Relationship
 from ..pv import ResourcePropertyValue, LiteralPropertyValue
 from ..xref import Xref
 from ..utils.impl import etree
+from ..utils.iri import IriCompactor
+from ..utils.pool import intern, pooled, use_pool
 from ..utils.warnings import SyntaxWarning, NotImplementedWarning
 
 if typing.TYPE_CHECKING:
-    from ..entity import Entity
+    from ..entity import EntityData
     from ..ontology import Ontology
 
 
@@ -65,6 +67,37 @@ _SYNONYMS_ATTRIBUTES = {
     _NS["oboInOwl"]["hasRelatedSynonym"]: "RELATED",
 }
 
+# The `TermData` field populated by each child element of an `owl:Class`,
+# other elements being extracted as annotations
+_TERM_ELEMENT_FIELDS = {
+    _NS["rdfs"]["subClassOf"]: "is_a",
+    _NS["oboInOwl"]["inSubset"]: "subsets",
+    _NS["rdfs"]["comment"]: "comment",
+    _NS["oboInOwl"]["created_by"]: "created_by",
+    _NS["dc"]["creator"]: "created_by",
+    _NS["oboInOwl"]["creation_date"]: "creation_date",
+    _NS["dc"]["date"]: "creation_date",
+    _NS["oboInOwl"]["hasOBONamespace"]: "namespace",
+    _NS["rdfs"]["label"]: "name",
+    _NS["obo"]["IAO_0000115"]: "definition",
+    _NS["owl"]["equivalentClass"]: "equivalent_to",
+    _NS["owl"]["deprecated"]: "obsolete",
+    _NS["oboInOwl"]["hasDbXref"]: "xrefs",
+    _NS["oboInOwl"]["hasAlternativeId"]: "alternate_ids",
+    _NS["owl"]["disjointWith"]: "disjoint_from",
+    _NS["obo"]["IAO_0100001"]: "replaced_by",
+    _NS["oboInOwl"]["consider"]: "consider",
+    _NS["oboInOwl"]["id"]: "id",
+    **dict.fromkeys(_SYNONYMS_ATTRIBUTES, "synonyms"),
+}
+
+# The `TermData` field populated by each property of an `owl:Axiom`
+_AXIOM_FIELDS = {
+    _NS["obo"].raw("IAO_0000115"): "definition",
+    _NS["oboInOwl"].raw("hasDbXref"): "xrefs",
+    **dict.fromkeys(_SYNONYMS, "synonyms"),
+}
+
 
 class RdfXMLParser(BaseParser):
     """A parser for OWL2 ontologies serialized in RDF/XML format.
@@ -80,28 +113,50 @@ class RdfXMLParser(BaseParser):
     def can_parse(cls, path, buffer):
         return buffer.lstrip().startswith((b"<?xml", b"<rdf:RDF", b"<owl:"))
 
-    def parse_from(self, handle):
-        # Load the XML document into an XML Element tree
-        tree: etree.ElementTree = etree.parse(handle)
+    def __init__(self, ont: "Ontology", streaming: bool = True):
+        super().__init__(ont)
+        self.streaming = streaming
+        self._compactor = IriCompactor()
+        self._entities: Dict[str, "EntityData"] = {}
+        self._synonyms: Dict[str, Dict[Tuple[str, Optional[str]], SynonymData]]
+        self._synonyms = {}
 
+    def parse_from(self, handle):
         # Keep a map of aliases (IRI -> local OBO id)
         aliases: Dict[str, str] = dict()
 
+        # Parse the document either incrementally or as a whole tree,
+        # sharing equal values between entities
+        with use_pool():
+            if self.streaming:
+                self._parse_stream(handle, aliases)
+            else:
+                self._parse_tree(handle, aliases)
+
+    def parse_metadata(self, handle):
+        # Stop at the end of the `owl:Ontology` element
+        depth = 0
+        for event, elem in etree.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and elem.tag == _NS["owl"]["Ontology"]:
+                return self._extract_meta(elem)
+        raise ValueError("could not find `owl:Ontology` element")
+
+    # -- Parsing strategies --------------------------------------------------
+
+    def _parse_tree(self, handle: typing.BinaryIO, aliases: Dict[str, str]):
+        """Parse the document after loading it into an XML Element tree.
+        """
+        tree: etree.ElementTree = etree.parse(handle)
+
         # Load metadata from the `owl:Ontology` element
         owl_ontology = tree.find(_NS["owl"]["Ontology"])
         if owl_ontology is None:
             raise ValueError("could not find `owl:Ontology` element")
-        self.ont.metadata = self._extract_meta(owl_ontology)
-
-        # Process imports
-        self.ont.imports.update(
-            self.process_imports(
-                self.ont.metadata.imports,
-                self.ont.import_depth,
-                os.path.dirname(self.ont.path or str()),
-                self.ont.timeout,
-            )
-        )
+        self._process_ontology(owl_ontology)
 
         # Parse typedef first to handle OBO shorthand renaming
         for prop in tree.iterfind(_NS["owl"]["ObjectProperty"]):
@@ -113,31 +168,109 @@ class RdfXMLParser(BaseParser):
         for axiom in tree.iterfind(_NS["owl"]["Axiom"]):
             self._process_axiom(axiom, aliases)
 
+    def _parse_stream(self, handle: typing.BinaryIO, aliases: Dict[str, str]):
+        """Parse the document one top-level element at a time.
+
+        Elements are discarded as soon as they have been processed, so that
+        the whole document never needs to be loaded in memory. Axioms are
+        the only elements resolving OBO shorthand aliases, so axioms about
+        entities that have not been declared earlier in the document are
+        deferred until the end of the document, once every alias is known,
+        and the result is the same as with `_parse_tree`.
+        """
+        root: Optional[etree.Element] = None
+        owl_ontology: Optional[etree.Element] = None
+        pending: List[etree.Element] = []  # elements before `owl:Ontology`
+        deferred: List[etree.Element] = []  # axioms with unknown sources
+        deferred_iris: Set[str] = set()
+
+        depth = 0
+        for event, elem in etree.iterparse(handle, events=("start", "end")):
+            # only process the direct children of the root element
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+
+            # the `owl:Ontology` element is needed to compact identifiers,
+            # so every element before it is kept until it has been found
+            if owl_ontology is None:
+                if elem.tag == _NS["owl"]["Ontology"]:
+                    owl_ontology = elem
+                    self._process_ontology(owl_ontology)
+                    for elem_pending in pending:
+                        self._process_element(
+                            elem_pending, aliases, deferred, deferred_iris
+                        )
+                    pending.clear()
+                else:
+                    pending.append(elem)
+            else:
+                self._process_element(elem, aliases, deferred, deferred_iris)
+
+            # free the element once it has been processed
+            typing.cast(etree.Element, root).remove(elem)
+
+        if owl_ontology is None:
+            raise ValueError("could not find `owl:Ontology` element")
+
+        # process axioms about entities declared after them
+        for axiom in deferred:
+            self._process_axiom(axiom, aliases)
+
+    def _process_element(
+        self,
+        elem: etree.Element,
+        aliases: Dict[str, str],
+        deferred: List[etree.Element],
+        deferred_iris: Set[str],
+    ):
+        """Process a top-level element of a streamed document.
+        """
+        if elem.tag == _NS["owl"]["ObjectProperty"]:
+            self._extract_object_property(elem, aliases)
+        elif elem.tag == _NS["owl"]["AnnotationProperty"]:
+            self._extract_annotation_property(elem, aliases)
+        elif elem.tag == _NS["owl"]["Class"]:
+            self._extract_term(elem, aliases)
+        elif elem.tag == _NS["owl"]["Axiom"]:
+            # defer axioms about entities not declared so far, since their
+            # IRI may be aliased by a later `owl:ObjectProperty`, as well as
+            # all the later axioms about the same entities to preserve their
+            # order
+            elem_source = elem.find(_NS["owl"]["annotatedSource"])
+            if elem_source is not None:
+                iri = elem_source.get(_NS["rdf"]["resource"])
+            else:
+                iri = None
+            if iri is not None and (
+                iri in deferred_iris or iri not in self._entities
+            ):
+                deferred_iris.add(iri)
+                deferred.append(elem)
+                return
+            self._process_axiom(elem, aliases)
+
     # -- Helper methods ------------------------------------------------------
 
     def _compact_id(self, iri: str) -> str:
         """Compact an OBO identifier into a prefixed identifier.
         """
-        match = re.match("^http://purl.obolibrary.org/obo/([^#_]+)_(.*)$", iri)
-        if match is not None:
-            return ":".join(match.groups())
-        if self.ont.metadata.ontology is not None:
-            id_ = self.ont.metadata.ontology
-            match = re.match(f"^http://purl.obolibrary.org/obo/{id_}#(.*)$", iri)
-            if match is not None:
-                return match.group(1)
-        return iri
+        return self._compactor.compact(iri)
 
     def _compact_datatype(self, iri: str) -> str:
-        match = re.match("^http://www.w3.org/2001/XMLSchema#(.*)$", iri)
-        if match is not None:
-            return f"xsd:{match.group(1)}"
+        if iri.startswith(_NS["xsd"].base):
+            return f"xsd:{iri[len(_NS['xsd'].base):]}"
         raise ValueError(f"invalid datatype: {iri!r}")
 
     def _extract_resource_pv(self, elem: etree.Element) -> ResourcePropertyValue:
         property = re.sub("{|}", "", elem.tag)
         resource = elem.attrib[_NS["rdf"]["resource"]]
-        return ResourcePropertyValue(property, resource)
+        return pooled(ResourcePropertyValue, property, resource)
 
     def _extract_literal_pv(self, elem: etree.Element) -> LiteralPropertyValue:
         property = re.sub("{|}", "", elem.tag)
@@ -149,8 +282,30 @@ class RdfXMLParser(BaseParser):
                 stacklevel=2,
             )
             datatype = _NS["xsd"].raw("string")
-        return LiteralPropertyValue(
-            property, typing.cast(str, elem.text), self._compact_datatype(datatype)
+        return pooled(
+            LiteralPropertyValue,
+            property,
+            typing.cast(str, elem.text),
+            self._compact_datatype(datatype),
+        )
+
+    def _xref(self, id: str, description: Optional[str] = None) -> Xref:
+        return pooled(Xref, id, description)
+
+    def _process_ontology(self, elem: etree.Element):
+        """Extract the metadata and resolve the imports of the ontology.
+        """
+        self.ont.metadata = meta = self._extract_meta(elem)
+        self._compactor = IriCompactor(meta.ontology, meta.idspaces)
+        self.ont.imports.update(
+            self.process_imports(
+                self.ont.metadata.imports,
+                self.ont.import_depth,
+                os.path.dirname(self.ont.path or str()),
+                self.ont.timeout,
+                cache_dir=self.ont.cache_dir,
+                fields=self.ont.fields,
+            )
         )
 
     def _extract_meta(self, elem: etree.Element):
@@ -228,16 +383,21 @@ class RdfXMLParser(BaseParser):
         e = elem.find(_NS["oboInOwl"]["id"])
         id_: str = e.text if e is not None and e.text else self._compact_id(iri)
 
-        # get or create the term
+        # get or create the term, copying its import before enriching it
+        self.ont._detach_import(id_)
         term = (self.ont.get_term if id_ in self.ont else self.ont.create_term)(id_)
-        termdata = term._data()
+        self._entities[iri] = termdata = term._data()
         names: List[str] = []
         comments: List[str] = []
+        fields = self.ont.fields
 
         # extract attributes from annotation of the OWL class
         for child in elem:
 
             tag: str = child.tag
+            if fields is not None:
+                if _TERM_ELEMENT_FIELDS.get(tag, "annotations") not in fields:
+                    continue
             attrib: Dict[str, str] = child.attrib
             text: Optional[str] = child.text
             if text is not None and text.isspace():
@@ -247,6 +407,7 @@ class RdfXMLParser(BaseParser):
                 if _NS["rdf"]["resource"] in attrib:
                     iri = self._compact_id(attrib[_NS["rdf"]["resource"]])
                     termdata.relationships.setdefault("is_a", set()).add(iri)
+                    self.ont._add_superclasses(id_, (iri,))
                 else:
                     pass  # TODO: relationships
             elif tag == _NS["oboInOwl"]["inSubset"]:
@@ -267,7 +428,7 @@ class RdfXMLParser(BaseParser):
                 termdata.creation_date = dateutil.parser.parse(typing.cast(str, text))
             elif tag == _NS["oboInOwl"]["hasOBONamespace"]:
                 if text != self.ont.metadata.default_namespace:
-                    termdata.namespace = text
+                    termdata.namespace = text and intern(text)
             elif tag == _NS["rdfs"]["label"]:
                 if text is not None:
                     names.append(text)
@@ -297,9 +458,9 @@ class RdfXMLParser(BaseParser):
             elif tag == _NS["oboInOwl"]["hasDbXref"]:
                 try:
                     if text is not None:
-                        termdata.xrefs.add(Xref(text))
+                        termdata.xrefs.add(self._xref(text))
                     else:
-                        termdata.xrefs.add(Xref(attrib[_NS["rdf"]["resource"]]))
+                        termdata.xrefs.add(self._xref(attrib[_NS["rdf"]["resource"]]))
                 except ValueError:
                     pass
             elif tag == _NS["oboInOwl"]["hasAlternativeId"]:
@@ -397,13 +558,14 @@ class RdfXMLParser(BaseParser):
         else:
             id_ = self._compact_id(iri)
 
-        # create the relationship
+        # create the relationship, copying its import before enriching it
+        self.ont._detach_import(id_)
         rel = (
             self.ont.get_relationship
             if id_ in self.ont
             else self.ont.create_relationship
         )(id_)
-        reldata = rel._data()
+        self._entities[iri] = reldata = rel._data()
         names: List[str] = []
         comments: List[str] = []
 
@@ -457,7 +619,7 @@ class RdfXMLParser(BaseParser):
                 reldata.creation_date = dateutil.parser.parse(text)
             elif tag == _NS["oboInOwl"]["hasOBONamespace"]:
                 if text != self.ont.metadata.default_namespace:
-                    reldata.namespace = text
+                    reldata.namespace = text and intern(text)
             elif tag == _NS["rdfs"]["label"]:
                 if text is not None:
                     names.append(text)
@@ -487,9 +649,9 @@ class RdfXMLParser(BaseParser):
                 reldata.obsolete = text == "true"
             elif tag == _NS["oboInOwl"]["hasDbXref"]:
                 if text is not None:
-                    reldata.xrefs.add(Xref(text))
+                    reldata.xrefs.add(self._xref(text))
                 else:
-                    reldata.xrefs.add(Xref(attrib[_NS["rdf"]["resource"]]))
+                    reldata.xrefs.add(self._xref(attrib[_NS["rdf"]["resource"]]))
             elif tag == _NS["oboInOwl"]["hasAlternativeId"] and text is not None:
                 reldata.alternate_ids.add(text)
             elif tag == _NS["obo"]["IAO_0100001"]:
@@ -595,23 +757,33 @@ class RdfXMLParser(BaseParser):
         elem_property = elem.find(_NS["owl"]["annotatedProperty"])
         elem_target = elem.find(_NS["owl"]["annotatedTarget"])
 
-        # assert source, target and property have a `rdf:resource` attribute.
-        for elem in (elem_source, elem_property, elem_target):
-            if elem is None or _NS["rdf"]["resource"] not in elem.attrib:
+        # assert source and property have a `rdf:resource` attribute.
+        for e in (elem_source, elem_property):
+            if e is None or _NS["rdf"]["resource"] not in e.attrib:
                 return
+        if elem_target is None:
+            return
 
-        # check among known properties
+        # get the entity the axiom is about
+        iri = elem_source.attrib[_NS["rdf"]["resource"]]
+        entity = self._get_entity_data(iri, aliases)
+        if entity is None:
+            raise KeyError(self._compact_id(aliases.get(iri, iri)))
+
+        # skip axioms about term fields that are not loaded
         property = elem_property.attrib[_NS["rdf"]["resource"]]
-        if property == _NS["obo"].raw("IAO_0000115") and elem_target.text is not None:
-            iri = elem_source.attrib[_NS["rdf"]["resource"]]
-            resource = aliases.get(iri, iri)
-            entity: Entity = self.ont[self._compact_id(resource)]
+        fields = self.ont.fields
+        if fields is not None and isinstance(entity, TermData):
+            if _AXIOM_FIELDS.get(property, "annotations") not in fields:
+                return
 
+        # check among known properties
+        if property == _NS["obo"].raw("IAO_0000115") and elem_target.text is not None:
             entity.definition = d = Definition(elem_target.text)
             for child in elem.iterfind(_NS["oboInOwl"]["hasDbXref"]):
                 if child.text is not None:
                     try:
-                        d.xrefs.add(Xref(child.text))
+                        d.xrefs.add(self._xref(child.text))
                     except ValueError:
                         warnings.warn(
                             f"could not parse Xref: {child.text!r}",
@@ -619,7 +791,7 @@ class RdfXMLParser(BaseParser):
                             stacklevel=3,
                         )
                 elif _NS["rdf"]["resource"] in child.attrib:
-                    d.xrefs.add(Xref(child.get(_NS["rdf"]["resource"])))
+                    d.xrefs.add(self._xref(child.get(_NS["rdf"]["resource"])))
                 else:
                     warnings.warn(
                         "`oboInOwl:hasDbXref` element has no text",
@@ -631,48 +803,53 @@ class RdfXMLParser(BaseParser):
             property == _NS["oboInOwl"].raw("hasDbXref")
             and elem_target.text is not None
         ):
-            iri = elem_source.attrib[_NS["rdf"]["resource"]]
-            resource = aliases.get(iri, iri)
-            entity = self.ont[self._compact_id(resource)]
             label = elem.find(_NS["rdfs"]["label"])
-
-            if label is not None and label.text is not None:
-                entity._data().xrefs.add(Xref(elem_target.text, label.text))
-            else:
-                entity._data().xrefs.add(Xref(elem_target.text))
+            try:
+                if label is not None and label.text is not None:
+                    entity.xrefs.add(self._xref(elem_target.text, label.text))
+                else:
+                    entity.xrefs.add(self._xref(elem_target.text))
+            except ValueError:
+                warnings.warn(
+                    f"could not parse Xref: {elem_target.text!r}",
+                    SyntaxWarning,
+                    stacklevel=3,
+                )
 
         elif property in _SYNONYMS:
-            iri = elem_source.attrib[_NS["rdf"]["resource"]]
-            resource = aliases.get(iri, iri)
-            entity = self.ont[self._compact_id(resource)]
-            type_ = elem.find(_NS["oboInOwl"]["hasSynonymType"])
-
-            try:
-                synonym = next(
-                    s._data()
-                    for s in entity.synonyms
-                    if s.description == elem_target.text
-                    and s.scope == _SYNONYMS[property]
+            description = elem_target.get(_NS["rdf"]["resource"], elem_target.text)
+            if description is None:
+                warnings.warn(
+                    f"could not extract synonym value in {elem!r}",
+                    SyntaxWarning,
+                    stacklevel=3,
                 )
-            except StopIteration:
-                description = elem_target.get(_NS["rdf"]["resource"], elem_target.text)
-                if description is None:
-                    warnings.warn(
-                        f"could not extract synonym value in {elem!r}",
-                        SyntaxWarning,
-                        stacklevel=3,
-                    )
-                    return
+                return
+
+            # find the synonym in the entity synonyms, or create it
+            scope = _SYNONYMS[property]
+            synonyms = self._get_synonym_index(entity)
+            synonym = synonyms.get((description, scope))
+            if synonym is None:
+                type_ = elem.find(_NS["oboInOwl"]["hasSynonymType"])
                 synonym = SynonymData(
                     description,
-                    scope=_SYNONYMS[property],
+                    scope=scope,
                     type=type_.text if type_ is not None else None,
                 )
+                synonyms[description, scope] = synonym
+                entity.synonyms.add(synonym)
 
-            entity._data().synonyms.add(typing.cast(SynonymData, synonym))
             for child in elem.iterfind(_NS["oboInOwl"]["hasDbXref"]):
                 if child.text is not None:
-                    synonym.xrefs.add(Xref(child.text))
+                    try:
+                        synonym.xrefs.add(self._xref(child.text))
+                    except ValueError:
+                        warnings.warn(
+                            f"could not parse Xref: {child.text!r}",
+                            SyntaxWarning,
+                            stacklevel=3,
+                        )
                 else:
                     warnings.warn(
                         "`oboInOwl:hasDbXref` element has no text",
@@ -684,3 +861,29 @@ class RdfXMLParser(BaseParser):
             warnings.warn(
                 f"unknown axiom property: {property!r}", SyntaxWarning, stacklevel=3,
             )
+
+    def _get_entity_data(
+        self, iri: str, aliases: Dict[str, str]
+    ) -> Optional["EntityData"]:
+        """Get the data of the entity with the given IRI, if it is known.
+        """
+        try:
+            return self._entities[iri]
+        except KeyError:
+            pass
+        id_ = self._compact_id(aliases.get(iri, iri))
+        if id_ not in self.ont:
+            return None
+        self._entities[iri] = data = self.ont[id_]._data()
+        return data
+
+    def _get_synonym_index(
+        self, entity: "EntityData"
+    ) -> Dict[Tuple[str, Optional[str]], SynonymData]:
+        """Get an index of the synonyms of an entity by description and scope.
+        """
+        index = self._synonyms.get(entity.id)
+        if index is None or len(index) != len(entity.synonyms):
+            index = {(s.description, s.scope): s for s in entity.synonyms}
+            self._synonyms[entity.id] = index
+        return index
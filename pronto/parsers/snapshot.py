@@ -0,0 +1,66 @@
+import gc
+import pickle
+import typing
+from typing import Any, Dict
+
+from ..ontology import Ontology
+from ..utils.io import MAGIC_SNAPSHOT
+
+
+class SnapshotParser(object):
+    """A parser for binary snapshots created by `Ontology.dump`.
+
+    This parser is not a `BaseParser` subclass, so that it is never picked
+    when sniffing the format of a document: snapshots can only be loaded
+    explicitly with `Ontology.from_snapshot`, or from the ``cache_dir``
+    of an `Ontology`.
+
+    Caution:
+        Snapshots are serialized with `pickle`, so only load snapshots
+        coming from a trusted source.
+
+    """
+
+    def __init__(self, ont: Ontology):
+        self.ont = ont
+
+    def parse_from(self, handle: typing.BinaryIO) -> None:
+        from .. import __version__
+
+        # Check the snapshot was created by the same version of pronto
+        if handle.read(len(MAGIC_SNAPSHOT)) != MAGIC_SNAPSHOT:
+            raise ValueError("not a pronto snapshot")
+        version = handle.readline().decode("utf-8").strip()
+        if version != __version__:
+            raise ValueError(
+                f"snapshot was created with pronto v{version}, "
+                f"cannot load it with pronto v{__version__}"
+            )
+
+        # Unpickling creates a lot of objects at once, disabling the
+        # garbage collector makes loading noticeably faster.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            state = pickle.load(handle)
+        finally:
+            if enabled:
+                gc.enable()
+
+        self._restore(self.ont, state)
+
+    @classmethod
+    def _restore(cls, ont: Ontology, state: Dict[str, Any]) -> None:
+        ont.metadata = state["metadata"]
+        ont._terms = state["terms"]
+        ont._relationships = state["relationships"]
+        ont._inheritance = state["inheritance"]
+        ont._relations = state["relations"]
+        ont._invalidate_indexes()
+        ont._drop_views()
+        for ref, substate in state["imports"].items():
+            ont.imports[ref] = dep = Ontology()
+            dep.path = substate["path"]
+            dep.import_depth = substate["import_depth"]
+            dep.timeout = substate["timeout"]
+            cls._restore(dep, substate)
@@ -66,6 +66,14 @@ class LiteralPropertyValue(PropertyValue):
     def __hash__(self) -> int:
         return hash((LiteralPropertyValue, self.property, self.literal, self.datatype))
 
+    def __copy__(self) -> "LiteralPropertyValue":
+        # copy the attributes without validating the identifiers again
+        pv = type(self).__new__(type(self))
+        pv.property = self.property
+        pv.literal = self.literal
+        pv.datatype = self.datatype
+        return pv
+
 
 @roundrepr
 @functools.total_ordering
@@ -103,3 +111,10 @@ class ResourcePropertyValue(PropertyValue):
 
     def __hash__(self) -> int:
         return hash((LiteralPropertyValue, self.property, self.resource))
+
+    def __copy__(self) -> "ResourcePropertyValue":
+        # copy the attributes without validating the identifiers again
+        pv = type(self).__new__(type(self))
+        pv.property = self.property
+        pv.resource = self.resource
+        return pv
@@ -1,5 +1,11 @@
 from .base import BaseSerializer
 from .obo import OboSerializer
 from .obojson import OboJSONSerializer
+from .snapshot import SnapshotSerializer
 
-__all__ = ["BaseSerializer", "OboSerializer", "OboJSONSerializer"]
+__all__ = [
+    "BaseSerializer",
+    "OboSerializer",
+    "OboJSONSerializer",
+    "SnapshotSerializer",
+]
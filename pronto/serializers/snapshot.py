@@ -0,0 +1,47 @@
+import pickle
+import typing
+from typing import Any, BinaryIO, Dict
+
+from .base import BaseSerializer
+from ..utils.io import MAGIC_SNAPSHOT
+
+if typing.TYPE_CHECKING:
+    from ..ontology import Ontology
+
+
+class SnapshotSerializer(BaseSerializer):
+    """A serializer for binary snapshots of the internal ontology data.
+
+    Snapshots store the parsed metadata, entities and caches of an `Ontology`
+    and of all its imports, so that they can be loaded back without having
+    to parse the source document again. They are only meant to be loaded
+    by the same version of ``pronto`` that created them.
+
+    Caution:
+        Snapshots are serialized with `pickle`, so only load snapshots
+        coming from a trusted source.
+
+    """
+
+    format = "snapshot"
+
+    @classmethod
+    def _to_state(cls, ont: "Ontology") -> Dict[str, Any]:
+        return {
+            "path": ont.path,
+            "import_depth": ont.import_depth,
+            "timeout": ont.timeout,
+            "metadata": ont.metadata,
+            "imports": {ref: cls._to_state(i) for ref, i in ont.imports.items()},
+            "terms": ont._terms,
+            "relationships": ont._relationships,
+            "inheritance": ont._inheritance,
+            "relations": ont._relations,
+        }
+
+    def dump(self, file: BinaryIO) -> None:
+        from .. import __version__
+
+        file.write(MAGIC_SNAPSHOT)
+        file.write(f"{__version__}\n".encode("utf-8"))
+        pickle.dump(self._to_state(self.ont), file, protocol=pickle.HIGHEST_PROTOCOL)
@@ -1,3 +1,4 @@
+import collections
 import collections.abc
 import datetime
 import itertools
@@ -22,7 +23,6 @@ from typing import (
 )
 
 import frozendict
-import networkx
 
 from . import relationship
 from .entity import Entity, EntityData
@@ -31,7 +31,7 @@ from .xref import Xref
 from .synonym import Synonym, SynonymData
 from .relationship import Relationship
 from .pv import PropertyValue, ResourcePropertyValue, LiteralPropertyValue
-from .logic import SubclassesIterator, SuperclassesIterator
+from .logic import Adjacency, SubclassesIterator, SuperclassesIterator
 from .utils.impl import set
 from .utils.meta import typechecked
 
@@ -160,50 +160,49 @@ class Term(Entity):
         """
 
         if r._data() is relationship._BUILTINS["is_a"]:
-            return self.superclasses()
+            yield from self.superclasses()
+            return
 
-        g = networkx.MultiDiGraph()
         ont = self._ontology()
-
-        # Build the graph
-        for t in ont.terms():
-            g.add_node(t.id)
-            for (rel, terms) in t.relationships.items():
-                for t2 in terms:
-                    g.add_edge(t.id, t2.id, key=rel.id)
-                    if rel.symmetric:
-                        g.add_edge(t2.id, t.id, key=rel.id)
-                    elif rel.inverse_of is not None:
-                        g.add_edge(t2.id, t.id, key=rel.inverse_of.id)
-
-        # Search objects terms
-        red, done = set(), set()
-        is_red = red.__contains__
-        frontier = {self.id}
-
-        # Initial connected components
+        relations = ont._relations
+        inverses = {
+            rel.id for rel in ont.relationships() if rel._data().inverse_of == r.id
+        }
+        if r._data().inverse_of is not None:
+            inverses.add(r._data().inverse_of)
+
+        def neighbors(node: str) -> Set[str]:
+            adjacency = relations.get(node)
+            if adjacency is None:
+                return set()
+            others = set(adjacency.forward.get(r.id, ()))
+            if r.symmetric:
+                others.update(adjacency.backward.get(r.id, ()))
+            for inverse in inverses:
+                others.update(adjacency.backward.get(inverse, ()))
+            return others
+
+        # Search objects terms, breadth-first
+        done: Set[str] = set()
+        frontier: Deque[str] = collections.deque([self.id])
         if r.reflexive:
-            red.add(self.id)
+            done.add(self.id)
             yield self
-        for other in g.neighbors(self.id):
-            if r.id in g.get_edge_data(self.id, other):
-                red.add(other)
-                yield ont.get_term(other)
-
-        # Explore the graph
         while frontier:
-            node = frontier.pop()
-            frontier.update(n for n in g.neighbors(node) if n not in done)
-            if is_red(node) and r.transitive:
-                for other in itertools.filterfalse(is_red, g.neighbors(node)):
-                    if r.id in g.get_edge_data(node, other):
-                        red.add(other)
-                        yield ont.get_term(other)
-            done.add(node)
+            node = frontier.popleft()
+            for other in sorted(neighbors(node).difference(done)):
+                done.add(other)
+                yield ont.get_term(other)
+                if r.transitive:
+                    frontier.append(other)
 
     def superclasses(
-        self, distance: Optional[int] = None, with_self: bool = True,
-    ) -> Iterator["Term"]:
+        self,
+        distance: Optional[int] = None,
+        with_self: bool = True,
+        ids: bool = False,
+        ordered: bool = True,
+    ) -> SuperclassesIterator:
         """Get an iterator over the superclasses of this `Term`.
 
         In order to follow the semantics of ``rdf:subClassOf``, which in turn
@@ -221,6 +220,11 @@ class Term(Entity):
                 ``rdfs:subClassOf`` property is transitive, so this is enabled
                 by default, but in most practical cases only the distinct
                 subclasses are desired.
+            ids (bool): Whether to yield the identifiers of the superclasses
+                instead of `Term` instances.
+            ordered (bool): Whether to yield the superclasses at the same
+                distance in the order of their identifiers. Disable to get
+                the superclasses faster, in an arbitrary order.
 
         Yields:
             `Term`: Superclasses of the selected term, breadth-first. The
@@ -237,6 +241,11 @@ class Term(Entity):
             >>> next(sup)
             Term('MS:1000031', name='instrument model')
 
+            Use ``ids=True`` to only get the identifiers of the superclasses:
+
+            >>> list(ms['MS:1000143'].superclasses(ids=True))
+            ['MS:1000143', 'MS:1000121', 'MS:1000031']
+
         Note:
             The time complexity for this algorithm is in :math:`O(n)`, where
             :math:`n` is the number of terms in the source ontology.
@@ -247,10 +256,16 @@ class Term(Entity):
             the ``is_a`` relationship is translated to in OWL2 language.
 
         """
-        return SuperclassesIterator(self, distance=distance, with_self=with_self)
+        return SuperclassesIterator(
+            self, distance=distance, with_self=with_self, ids=ids, ordered=ordered
+        )
 
     def subclasses(
-        self, distance: Optional[int] = None, with_self: bool = True,
+        self,
+        distance: Optional[int] = None,
+        with_self: bool = True,
+        ids: bool = False,
+        ordered: bool = True,
     ) -> SubclassesIterator:
         """Get an iterator over the subclasses of this `Term`.
 
@@ -264,6 +279,11 @@ class Term(Entity):
                 ``rdfs:subClassOf`` property is transitive, so this is enabled
                 by default, but in most practical cases only the distinct
                 subclasses are desired.
+            ids (bool): Whether to yield the identifiers of the subclasses
+                instead of `Term` instances.
+            ordered (bool): Whether to yield the subclasses at the same
+                distance in the order of their identifiers. Disable to get
+                the subclasses faster, in an arbitrary order.
 
         Yields:
             `Term`: Subclasses of the selected term, breadth-first. The first
@@ -293,7 +313,9 @@ class Term(Entity):
             reduced to an :math:`O(n)` operation.
 
         """
-        return SubclassesIterator(self, distance=distance, with_self=with_self)
+        return SubclassesIterator(
+            self, distance=distance, with_self=with_self, ids=ids, ordered=ordered
+        )
 
     def is_leaf(self) -> bool:
         """Check whether the term is a leaf in the ontology.
@@ -381,21 +403,21 @@ class Term(Entity):
         ont, termdata = self._ontology(), self._data()
         return frozendict.frozendict(
             {
-                Relationship(ont, ont.get_relationship(rel)._data()): frozenset(
-                    Term(ont, ont.get_term(term)._data()) for term in terms
-                )
+                ont.get_relationship(rel): frozenset(map(ont.get_term, terms))
                 for rel, terms in termdata.relationships.items()
             }
         )
 
     @relationships.setter
     def relationships(self, r: Mapping[Relationship, Iterable["Term"]]):
-        self._data().relationships = relationships = {
+        ont, termdata = self._ontology(), self._data()
+        previous = termdata.relationships
+        termdata.relationships = relationships = {
             relation.id: set(t.id for t in terms) for relation, terms in r.items()
         }
 
         ## FIXME: Maybe wrap in a single function
-        cache = self._ontology()._inheritance
+        cache = ont._inheritance
         previous_super = cache[self.id].sup
         new_super = relationships.get("is_a", set())
         for removed in previous_super - new_super:
@@ -405,6 +427,24 @@ class Term(Entity):
         cache[self.id].sup.clear()
         cache[self.id].sup.update(new_super)
 
+        # Update the relationship cache for every other relationship
+        relations = ont._relations
+        for rel in previous.keys() | relationships.keys():
+            if rel == "is_a":
+                continue
+            old_objects = previous.get(rel, set())
+            new_objects = relationships.get(rel, set())
+            for removed in old_objects - new_objects:
+                relations[removed].backward[rel].discard(self.id)
+            for added in new_objects - old_objects:
+                backward = relations.setdefault(added, Adjacency()).backward
+                backward.setdefault(rel, set()).add(self.id)
+            forward = relations.setdefault(self.id, Adjacency()).forward
+            if new_objects:
+                forward[rel] = set(new_objects)
+            else:
+                forward.pop(rel, None)
+
     @property
     def replaced_by(self) -> "TermSet":
         s = TermSet()
@@ -586,7 +626,7 @@ class TermSet(MutableSet[Term]):
 
     @property
     def ids(self) -> FrozenSet[str]:
-        return frozenset(map(operator.attrgetter("id"), iter(self)))
+        return frozenset(self._ids)
 
     @property
     def alternate_ids(self) -> FrozenSet[str]:
@@ -597,17 +637,31 @@ class TermSet(MutableSet[Term]):
         return frozenset(map(operator.attrgetter("name"), iter(self)))
 
     def subclasses(
-        self, distance: Optional[int] = None, with_self: bool = True
+        self,
+        distance: Optional[int] = None,
+        with_self: bool = True,
+        ids: bool = False,
+        ordered: bool = True,
     ) -> SubclassesIterator:
         """Get an iterator over the subclasses of all terms in the set.
+
+        See `Term.subclasses` for a description of the arguments.
         """
-        return SubclassesIterator(*self, distance=distance, with_self=with_self)
+        return SubclassesIterator(
+            *self, distance=distance, with_self=with_self, ids=ids, ordered=ordered
+        )
 
     def superclasses(
-        self, distance: Optional[int] = None, with_self: bool = True
-    ) -> SubclassesIterator:
+        self,
+        distance: Optional[int] = None,
+        with_self: bool = True,
+        ids: bool = False,
+        ordered: bool = True,
+    ) -> SuperclassesIterator:
         """Get an iterator over the superclasses of all terms in the set.
 
+        See `Term.superclasses` for a description of the arguments.
+
         Example:
             >>> ms = pronto.Ontology("ms.obo")
             >>> s = pronto.TermSet({ms['MS:1000122'], ms['MS:1000124']})
@@ -616,4 +670,6 @@ class TermSet(MutableSet[Term]):
             >>> ms["MS:1000031"]
             Term('MS:1000031', name='instrument model')
         """
-        return SuperclassesIterator(*self, distance=distance, with_self=with_self)
+        return SuperclassesIterator(
+            *self, distance=distance, with_self=with_self, ids=ids, ordered=ordered
+        )
@@ -0,0 +1,116 @@
+import collections
+import threading
+import typing
+from typing import Hashable, NamedTuple, Optional
+
+if typing.TYPE_CHECKING:
+    from ..ontology import Ontology
+
+
+class CacheInfo(NamedTuple):
+    """The statistics of an `OntologyCache`.
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    maxentities: Optional[int]
+    currsize: int
+    entities: int
+
+
+class OntologyCache(object):
+    """A thread-safe LRU cache of parsed `Ontology` instances.
+
+    The cache can be bounded by the number of ontologies it contains, by
+    the total number of entities of these ontologies (which is a good proxy
+    for their memory footprint), or both. The least recently used
+    ontologies are evicted first when a bound is exceeded. A bound of
+    `None` disables it, while a bound of ``0`` disables the whole cache.
+
+    Example:
+        >>> from pronto.utils.cache import OntologyCache
+        >>> cache = OntologyCache(maxsize=1)
+        >>> cache.put("ms", pronto.Ontology())
+        >>> cache.get("ms")
+        Ontology(None)
+        >>> cache.get("go") is None
+        True
+        >>> cache.info()
+        CacheInfo(hits=1, misses=1, maxsize=1, maxentities=None, currsize=1, entities=0)
+
+    """
+
+    def __init__(
+        self, maxsize: Optional[int] = 128, maxentities: Optional[int] = None
+    ):
+        self.maxsize = maxsize
+        self.maxentities = maxentities
+        self._entries: "collections.OrderedDict[Hashable, Ontology]"
+        self._entries = collections.OrderedDict()
+        self._weights: typing.Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._entities = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        """`bool`: Whether the cache can store any ontology.
+        """
+        return self.maxsize != 0 and self.maxentities != 0
+
+    def get(self, key: Hashable) -> Optional["Ontology"]:
+        """Get the ontology stored under ``key``, or `None` on a cache miss.
+        """
+        with self._lock:
+            ont = self._entries.get(key)
+            if ont is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return ont
+
+    def put(self, key: Hashable, ont: "Ontology") -> None:
+        """Store an ontology under ``key``, evicting older ontologies if needed.
+        """
+        weight = len(ont)
+        if not self.enabled or (
+            self.maxentities is not None and weight > self.maxentities
+        ):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entities -= self._weights.pop(key)
+                del self._entries[key]
+            self._entries[key] = ont
+            self._weights[key] = weight
+            self._entities += weight
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+                self.maxentities is not None and self._entities > self.maxentities
+            ):
+                old, _ = self._entries.popitem(last=False)
+                self._entities -= self._weights.pop(old)
+
+    def clear(self) -> None:
+        """Remove all ontologies from the cache and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._weights.clear()
+            self._hits = self._misses = self._entities = 0
+
+    def info(self) -> CacheInfo:
+        """Get the statistics of the cache.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self.maxsize,
+                self.maxentities,
+                len(self._entries),
+                self._entities,
+            )
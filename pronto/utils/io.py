@@ -1,9 +1,18 @@
 import bz2
 import codecs
+import hashlib
 import io
 import gzip
+import json
 import lzma
+import mmap
+import os
+import queue
+import shutil
+import tempfile
+import threading
 import typing
+import urllib.error
 import urllib.request
 import warnings
 from http.client import HTTPResponse
@@ -11,10 +20,15 @@ from typing import ByteString, BinaryIO, Dict, Union, Optional
 
 import chardet
 
+from .warnings import ProntoWarning
+
 
 MAGIC_GZIP = bytearray([0x1F, 0x8B])
 MAGIC_LZMA = bytearray([0xFD, 0x37, 0x7A, 0x58, 0x5A, 0x00, 0x00])
 MAGIC_BZIP2 = bytearray([0x42, 0x5A, 0x68])
+MAGIC_SNAPSHOT = b"PRONTO-SNAPSHOT\n"
+
+DEFAULT_CHUNK_SIZE = 1 << 16
 
 
 class BufferedReader(io.BufferedReader):
@@ -64,12 +78,254 @@ class EncodedFile(codecs.StreamRecoder):
         return len(chunk)
 
 
-def get_handle(path: str, timeout: int = 2) -> BinaryIO:
+class ReadAheadReader(io.RawIOBase):
+    """A reader filling a bounded queue of chunks from a background thread.
+
+    This is used to decompress a stream while it is being parsed: the
+    background thread reads from the wrapped file (which releases the GIL
+    for the `gzip`, `lzma` and `bz2` decompressors) while the consumer
+    reads the chunks that were already decompressed. At most ``buffers``
+    chunks of ``chunk_size`` bytes are kept in memory at any time.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        buffers: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if buffers < 1:
+            raise ValueError(f"buffers must be strictly positive, got {buffers!r}")
+        self._file = file
+        self._queue: "queue.Queue[Union[bytes, BaseException]]"
+        self._queue = queue.Queue(maxsize=buffers)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        # the thread must not hold a reference to the reader, otherwise the
+        # reader could never be garbage collected and closed
+        self._thread = threading.Thread(
+            target=self._fill,
+            args=(file, self._queue, self._stop, chunk_size),
+            name="pronto-readahead",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _fill(
+        file: BinaryIO,
+        chunks: "queue.Queue[Union[bytes, BaseException]]",
+        stop: threading.Event,
+        chunk_size: int,
+    ) -> None:
+        def put(item: Union[bytes, BaseException]) -> bool:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            while True:
+                chunk = file.read(chunk_size)
+                if not put(chunk) or not chunk:
+                    break
+        except BaseException as err:
+            put(err)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: ByteString) -> int:
+        if not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+        n = min(len(buffer), len(self._chunk))
+        typing.cast(bytearray, buffer)[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._file.close()
+        super().close()
+
+
+class TranscodedReader(io.RawIOBase):
+    """A reader transcoding a binary stream to UTF-8 one chunk at a time.
+
+    Chunks of ``chunk_size`` bytes are decoded with an incremental decoder,
+    so that characters split between two chunks are decoded correctly, and
+    their CRLF line endings are normalised to LF. Only the current chunk of
+    the transcoded stream is kept in memory, whatever the document size.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        encoding: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self._file = file
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._chunk_size = chunk_size
+        self._chunk = memoryview(b"")
+        self._carriage = False  # whether the last chunk ended with CR
+        self._start = True
+        self._eof = False
+
+    def _transcode(self) -> bytes:
+        while not self._eof:
+            data = self._file.read(self._chunk_size)
+            self._eof = not data
+            text = self._decoder.decode(data, final=self._eof)
+            if self._carriage:
+                text = f"\r{text}"
+            # keep a trailing CR until the next chunk, since it may be
+            # the first half of a CRLF line ending
+            self._carriage = not self._eof and text.endswith("\r")
+            if self._carriage:
+                text = text[:-1]
+            if self._start and text:
+                self._start = False
+                if text.startswith("\ufeff"):
+                    text = text[1:]
+            if text:
+                return text.replace("\r\n", "\n").encode("utf-8")
+        return b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: ByteString) -> int:
+        if not self._chunk:
+            chunk = self._transcode()
+            if not chunk:
+                return 0
+            self._chunk = memoryview(chunk)
+        n = min(len(buffer), len(self._chunk))
+        typing.cast(bytearray, buffer)[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+class MemoryMappedFile(io.RawIOBase):
+    """A read-only binary file reading from a memory map of a local file.
+
+    Reading from the map only copies the requested bytes out of the page
+    cache, and parsers that can work on a contiguous buffer can access the
+    whole mapped document with `getbuffer` without any copy. Since the map
+    is shared, several processes loading the same file also share the
+    pages of the file in memory.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb", buffering=0) as f:
+            self._mmap: Optional[mmap.mmap]
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+        self.name = path
+
+    def _buffer(self) -> mmap.mmap:
+        if self._mmap is None:
+            raise ValueError("I/O operation on closed file")
+        return self._mmap
+
+    def getbuffer(self) -> mmap.mmap:
+        """Get the memory map of the whole file.
+
+        The map stays valid after the file is closed, and is unmapped once
+        it is not referenced anymore.
+        """
+        return self._buffer()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer())
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence ({whence!r})")
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset!r}")
+        self._pos = offset
+        return self._pos
+
+    def peek(self, size: int = 0) -> bytes:
+        buffer = self._buffer()
+        return buffer[self._pos : self._pos + max(size, io.DEFAULT_BUFFER_SIZE)]
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        buffer = self._buffer()
+        start = min(self._pos, len(buffer))
+        end = len(buffer) if size is None or size < 0 else start + size
+        self._pos = min(end, len(buffer))
+        return buffer[start : self._pos]
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: ByteString) -> int:
+        chunk = self.read(len(buffer))
+        typing.cast(bytearray, buffer)[: len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self) -> None:
+        # parsers may still reference the map, so let it be unmapped
+        # by the garbage collector rather than closing it here
+        self._mmap = None
+        super().close()
+
+
+def get_handle(
+    path: str,
+    timeout: int = 2,
+    cache_dir: Optional[str] = None,
+    memory_map: bool = False,
+) -> BinaryIO:
     """Given a path or URL, get a binary handle for that path.
+
+    If ``cache_dir`` is given, remote files are downloaded to that directory
+    with `download` and then opened from there. If ``memory_map`` is `True`,
+    local files are opened as a `MemoryMappedFile` when they can be mapped.
     """
     try:
+        if memory_map:
+            try:
+                return typing.cast(BinaryIO, MemoryMappedFile(path))
+            except (OSError, ValueError):
+                pass
         return open(path, "rb", buffering=0)
     except Exception as err:
+        if cache_dir is not None:
+            return open(download(path, cache_dir, timeout), "rb", buffering=0)
         headers = {"Keep-Alive": f"timeout={timeout}"}
         request = urllib.request.Request(path, headers=headers)
         res: HTTPResponse = urllib.request.urlopen(request, timeout=timeout)
@@ -81,6 +337,83 @@ def get_handle(path: str, timeout: int = 2) -> BinaryIO:
         return res
 
 
+def download(url: str, cache_dir: str, timeout: int = 2) -> str:
+    """Download a remote file to a cache directory, and get its local path.
+
+    The ``ETag`` and ``Last-Modified`` headers of the response are stored
+    next to the downloaded file, and used to revalidate it with a conditional
+    request on later calls, so that the file is only downloaded again if it
+    changed on the server. If the server cannot be reached, a previously
+    downloaded copy is used.
+    """
+    cache_dir = os.path.join(cache_dir, "downloads")
+    os.makedirs(cache_dir, exist_ok=True)
+    name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    path = os.path.join(cache_dir, name)
+    meta_path = f"{path}.json"
+
+    # load the headers of the cached copy, if any
+    headers = {"Keep-Alive": f"timeout={timeout}"}
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    else:
+        meta = None
+
+    # perform a (conditional) request
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        res: HTTPResponse = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as err:
+        if err.code == 304 and meta is not None:
+            return path
+        raise
+    except OSError as err:
+        if meta is None:
+            raise
+        warnings.warn(
+            f"could not revalidate {url} ({err}), using cached copy",
+            ProntoWarning,
+            stacklevel=2,
+        )
+        return path
+
+    # store the response body and headers atomically
+    with res:
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                shutil.copyfileobj(res, dst)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        meta = {
+            "url": url,
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+        }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return path
+
+
+def get_validator(url: str, timeout: int = 2) -> Optional[str]:
+    """Given an URL, get a string identifying the version of the resource.
+
+    The ``ETag`` or ``Last-Modified`` headers of the response to a ``HEAD``
+    request are used, and `None` is returned if the server sent neither.
+    """
+    request = urllib.request.Request(url, method="HEAD")
+    res: HTTPResponse = urllib.request.urlopen(request, timeout=timeout)
+    with res:
+        return res.headers.get("ETag") or res.headers.get("Last-Modified")
+
+
 def get_location(reader: BinaryIO) -> Optional[str]:
     """Given a binary file-handle, try to extract the path/URL to the file.
     """
@@ -91,64 +424,116 @@ def get_location(reader: BinaryIO) -> Optional[str]:
     )
 
 
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def _sniff_bom(data: bytes) -> Optional[str]:
+    # UTF-32 BOMs must be checked first since the UTF-32-LE BOM starts
+    # with the UTF-16-LE BOM
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+def _is_utf8(data: bytes) -> bool:
+    # the peeked buffer may end in the middle of a multibyte sequence,
+    # so decode it incrementally without finalizing the decoder
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
 def decompress(
-    reader: io.RawIOBase, path: Optional[str] = None, encoding: Optional[str] = None
+    reader: io.RawIOBase,
+    path: Optional[str] = None,
+    encoding: Optional[str] = None,
+    readahead: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> BinaryIO:
     """Given a binary file-handle, decompress it if it is compressed.
+
+    The returned stream is always UTF-8 encoded. If no ``encoding`` is
+    given, it is inferred from a byte-order mark if any, or assumed to be
+    UTF-8 if the beginning of the stream is valid UTF-8, and only detected
+    with `chardet` otherwise. Documents in other encodings are transcoded
+    to UTF-8 by a `TranscodedReader`, one chunk of ``chunk_size`` bytes at
+    a time.
+
+    If ``readahead`` is not zero, compressed streams are decompressed in a
+    background thread by a `ReadAheadReader`, which keeps at most
+    ``readahead`` chunks of ``chunk_size`` decompressed bytes in memory.
+
+    A `MemoryMappedFile` is not buffered again, and is returned as-is if
+    it contains an uncompressed UTF-8 document.
     """
 
-    buffered = BufferedReader(reader)
+    buffered: Union[BufferedReader, MemoryMappedFile]
+    if isinstance(reader, MemoryMappedFile):
+        buffered = reader
+    else:
+        buffered = BufferedReader(reader)
 
     # Decompress the stream if it is compressed
+    file: Optional[BinaryIO] = None
     if buffered.peek().startswith(MAGIC_GZIP):
-        decompressed = BufferedReader(
-            typing.cast(
-                io.RawIOBase,
-                gzip.GzipFile(mode="rb", fileobj=typing.cast(BinaryIO, buffered)),
-            )
-        )
+        gzipped = gzip.GzipFile(mode="rb", fileobj=typing.cast(BinaryIO, buffered))
+        file = typing.cast(BinaryIO, gzipped)
     elif buffered.peek().startswith(MAGIC_LZMA):
-        decompressed = BufferedReader(
-            typing.cast(
-                io.RawIOBase, lzma.LZMAFile(typing.cast(BinaryIO, buffered), mode="rb")
-            )
-        )
+        file = typing.cast(BinaryIO, lzma.LZMAFile(buffered, mode="rb"))
     elif buffered.peek().startswith(MAGIC_BZIP2):
-        decompressed = BufferedReader(
-            typing.cast(
-                io.RawIOBase, bz2.BZ2File(typing.cast(BinaryIO, buffered), mode="rb")
-            )
-        )
-    else:
-        decompressed = buffered
+        file = typing.cast(BinaryIO, bz2.BZ2File(buffered, mode="rb"))
 
-    # Attempt to detect the encoding and decode the stream
-    det: Dict[str, Union[str, float]] = chardet.detect(decompressed.peek())
-    confidence: float = 1.0 if encoding is not None else det["confidence"]
-    encoding = encoding if encoding is not None else det["encoding"]
+    if file is None:
+        decompressed = buffered
+    elif readahead:
+        raw = ReadAheadReader(file, readahead, chunk_size)
+        decompressed = BufferedReader(raw, chunk_size)
+    else:
+        decompressed = BufferedReader(typing.cast(io.RawIOBase, file))
 
-    if encoding == "ascii":
-        encoding = "UTF-8"
-    if confidence < 1.0:
-        warnings.warn(
-            f"unsound encoding, assuming {encoding} ({confidence:.0%} confidence)",
-            UnicodeWarning,
-            stacklevel=3,
+    # Snapshots are pickled, and must never be loaded from an arbitrary
+    # document, so refuse them before they reach any parser
+    if decompressed.peek().startswith(MAGIC_SNAPSHOT):
+        raise ValueError(
+            "refusing to load a snapshot from an untrusted source, "
+            "use `Ontology.from_snapshot` to load a trusted snapshot"
         )
 
-    if encoding == "UTF-8":
+    # Use the explicit encoding, a BOM, or fall back to detection
+    peek = decompressed.peek()
+    if encoding is None:
+        encoding = _sniff_bom(peek)
+        if encoding is None and _is_utf8(peek):
+            encoding = "utf-8"
+    if encoding is None:
+        det: Dict[str, Union[str, float]] = chardet.detect(peek)
+        confidence = typing.cast(float, det["confidence"])
+        encoding = typing.cast(str, det["encoding"] or "utf-8")
+        if encoding == "ascii":
+            encoding = "UTF-8"
+        if confidence < 1.0:
+            warnings.warn(
+                f"unsound encoding, assuming {encoding} ({confidence:.0%} confidence)",
+                UnicodeWarning,
+                stacklevel=3,
+            )
+
+    codec = codecs.lookup(encoding).name
+    if codec in ("utf-8", "utf-8-sig"):
+        if decompressed.peek().startswith(codecs.BOM_UTF8):
+            decompressed.read(len(codecs.BOM_UTF8))
         return typing.cast(BinaryIO, decompressed)
     else:
-        return typing.cast(
-            BinaryIO,
-            BufferedReader(
-                typing.cast(
-                    io.RawIOBase,
-                    EncodedFile(
-                        typing.cast(typing.BinaryIO, decompressed),
-                        "UTF-8",
-                        typing.cast(str, det["encoding"]),
-                    ),
-                )
-            ),
+        transcoded = TranscodedReader(
+            typing.cast(BinaryIO, decompressed), codec, chunk_size
         )
+        return typing.cast(BinaryIO, BufferedReader(transcoded, chunk_size))
@@ -0,0 +1,123 @@
+"""Conversion between IRIs and compact OBO identifiers.
+"""
+
+import typing
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+OBO_PURL = "http://purl.obolibrary.org/obo/"
+
+_Handler = Callable[[str], Optional[str]]
+
+
+def _compact_obo_purl(local: str) -> Optional[str]:
+    # equivalent to matching `^([^#_]+)_(.*)$` on the local part of the IRI
+    i = local.find("_")
+    if i <= 0 or "#" in local[:i]:
+        return None
+    return f"{local[:i]}:{local[i+1:]}"
+
+
+class IriCompactor(object):
+    """A bidirectional converter between IRIs and compact identifiers.
+
+    Known IRI prefixes are stored in a character trie, so that compacting an
+    IRI only needs to walk the IRI once to find all the prefixes it starts
+    with, starting from the longest. Results are memoized, since the same
+    IRIs are usually referenced many times in a single document.
+
+    The following prefixes are known by default:
+
+    - the OBO PURL, where ``http://purl.obolibrary.org/obo/GO_0000001``
+      is compacted into ``GO:0000001``,
+    - the ontology namespace, where ``http://purl.obolibrary.org/obo/go#x``
+      is compacted into ``x`` if the ontology is ``go``,
+    - the global ID spaces declared for each local ID space in the
+      ``idspaces`` of the ontology `Metadata`.
+
+    Example:
+        >>> from pronto.utils.iri import IriCompactor
+        >>> compactor = IriCompactor("go")
+        >>> compactor.compact("http://purl.obolibrary.org/obo/GO_0000001")
+        'GO:0000001'
+        >>> compactor.compact("http://purl.obolibrary.org/obo/go#part_of")
+        'part_of'
+        >>> compactor.expand("GO:0000001")
+        'http://purl.obolibrary.org/obo/GO_0000001'
+
+    """
+
+    def __init__(
+        self,
+        ontology: Optional[str] = None,
+        idspaces: Optional[Mapping[str, Tuple[str, Optional[str]]]] = None,
+    ):
+        self.ontology = ontology
+        self.idspaces = dict(idspaces or {})
+        self._compacted: Dict[str, str] = {}
+        self._expanded: Dict[str, str] = {}
+        self._trie: Dict[Optional[str], typing.Any] = {}
+
+        self._insert(OBO_PURL, _compact_obo_purl)
+        if ontology is not None:
+            self._insert(f"{OBO_PURL}{ontology}#", lambda local: local)
+        for prefix, (url, _) in self.idspaces.items():
+            self._insert(url, lambda local, prefix=prefix: f"{prefix}:{local}")
+
+    def _insert(self, prefix: str, handler: _Handler) -> None:
+        node = self._trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = handler
+
+    def _match(self, iri: str) -> List[Tuple[int, _Handler]]:
+        node = self._trie
+        matches = []
+        for i, char in enumerate(iri):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                matches.append((i + 1, node[None]))
+        return matches
+
+    def compact(self, iri: str) -> str:
+        """Compact an IRI into a prefixed identifier, if possible.
+
+        IRIs that do not start with any known prefix are returned unchanged.
+        """
+        try:
+            return self._compacted[iri]
+        except KeyError:
+            pass
+        compacted = iri
+        for length, handler in reversed(self._match(iri)):
+            local = handler(iri[length:])
+            if local is not None:
+                compacted = local
+                break
+        self._compacted[iri] = compacted
+        return compacted
+
+    def expand(self, id: str) -> str:
+        """Expand a prefixed identifier into an IRI.
+
+        This is the reverse operation of `IriCompactor.compact`. Identifiers
+        that are already IRIs are returned unchanged.
+        """
+        try:
+            return self._expanded[id]
+        except KeyError:
+            pass
+        prefix, sep, local = id.partition(":")
+        if sep and local.startswith("//"):
+            expanded = id
+        elif sep and prefix in self.idspaces:
+            expanded = f"{self.idspaces[prefix][0]}{local}"
+        elif sep:
+            expanded = f"{OBO_PURL}{prefix}_{local}"
+        elif self.ontology is not None:
+            expanded = f"{OBO_PURL}{self.ontology}#{id}"
+        else:
+            expanded = id
+        self._expanded[id] = expanded
+        return expanded
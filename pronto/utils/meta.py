@@ -12,6 +12,17 @@ F = typing.TypeVar("F", bound=Callable[..., object])
 
 
 class typechecked(object):
+    """A decorator checking the types of the arguments of a function.
+
+    Type hints are resolved on the first call of the decorated function,
+    and compiled into a checker specialized for its signature, so that
+    later calls only pay for the checks themselves. Checking is disabled
+    in optimized mode, or at runtime by setting `typechecked.enabled` to
+    `False`.
+    """
+
+    #: `bool`: Whether to check argument types when not in optimized mode.
+    enabled: ClassVar[bool] = True
 
     if sys.version_info >= (3, 7):
         Set = set
@@ -58,29 +69,99 @@ class typechecked(object):
             return (isinstance(value, hint), hint.__name__)
         return (False, "something")
 
+    @classmethod
+    def compile_check(cls, hint: object) -> Callable[[object], bool]:
+        """Compile a predicate accepting the same values as `check_type`.
+        """
+        origin = getattr(hint, "__origin__", None)
+        if hint is None.__class__:
+            return lambda value: value is None
+        if typing.cast(str, getattr(hint, "_name", None)) == "typing.Any":
+            return lambda value: True
+        if origin is cls.Set or origin is cls.FrozenSet:
+            args = typing.cast(Tuple[object, ...], getattr(hint, "__args__"))
+            check = cls.compile_check(args[0])
+            if origin is cls.Set:
+                base: type = collections.abc.MutableSet
+            else:
+                base = collections.abc.Set
+            return lambda value: isinstance(value, base) and all(map(check, value))
+        if origin == typing.Union:
+            args = typing.cast(Tuple[object, ...], getattr(hint, "__args__"))
+            checks = [cls.compile_check(arg) for arg in args]
+            types = tuple(arg for arg in args if isinstance(arg, type))
+            if len(types) == len(args):
+                return lambda value: isinstance(value, types)
+            return lambda value: any(check(value) for check in checks)
+        if isinstance(hint, type):
+            return lambda value: isinstance(value, hint)
+        return lambda value: False
+
     def __init__(self, property: bool = False) -> None:
         self.property = property
 
+    def _compile(self, func: Callable[..., object]) -> Callable[..., None]:
+        hints = typing.get_type_hints(func)
+        checks = []
+        for index, param in enumerate(inspect.signature(func).parameters.values()):
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                return self._generic_checker(func, hints)
+            if param.name in hints:
+                if param.kind is param.KEYWORD_ONLY:
+                    index = -1
+                check = self.compile_check(hints[param.name])
+                checks.append((index, param.name, param.default, check))
+
+        def checker(args: Tuple[object, ...], kwargs: typing.Dict[str, object]):
+            for index, name, default, check in checks:
+                if 0 <= index < len(args):
+                    value = args[index]
+                else:
+                    value = kwargs.get(name, default)
+                    if value is inspect.Parameter.empty:
+                        continue  # a missing argument, `func` will raise
+                if not check(value):
+                    self._raise(func, name, hints[name], value)
+
+        return checker
+
+    def _generic_checker(
+        self, func: Callable[..., object], hints: typing.Dict[str, object]
+    ) -> Callable[..., None]:
+        def checker(args: Tuple[object, ...], kwargs: typing.Dict[str, object]):
+            callargs = inspect.getcallargs(func, *args, **kwargs)
+            for name, value in callargs.items():
+                if name in hints and not self.check_type(hints[name], value)[0]:
+                    self._raise(func, name, hints[name], value)
+
+        return checker
+
+    def _raise(
+        self, func: Callable[..., object], name: str, hint: object, value: object
+    ) -> typing.NoReturn:
+        _, type_name = self.check_type(hint, value)
+        msg = f"'{{}}' must be {type_name}, not {type(value).__name__}"
+        if self.property:
+            raise TypeError(msg.format(func.__name__))
+        else:
+            raise TypeError(msg.format(name))
+
     def __call__(self, func: F) -> F:
         if not __debug__:
             return func
 
+        checker: Optional[Callable[..., None]] = None
+
         @functools.wraps(func)
         def newfunc(*args, **kwargs):
-            hints = typing.get_type_hints(func)
-            callargs = inspect.getcallargs(func, *args, **kwargs)
-            for name, value in callargs.items():
-                if name in hints:
-                    well_typed, type_name = self.check_type(hints[name], value)
-                    if not well_typed:
-                        msg = f"'{{}}' must be {type_name}, not {type(value).__name__}"
-                        if self.property:
-                            raise TypeError(msg.format(func.__name__))
-                        else:
-                            raise TypeError(msg.format(name))
+            nonlocal checker
+            if typechecked.enabled:
+                if checker is None:
+                    checker = self._compile(func)
+                checker(args, kwargs)
             return func(*args, **kwargs)
 
-        return newfunc
+        return typing.cast(F, newfunc)
 
 
 class roundrepr(object):
@@ -0,0 +1,102 @@
+"""Pools of values shared between the entities of an ontology.
+"""
+
+import contextlib
+import contextvars
+import copy
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+
+class ValuePool(object):
+    """A pool of values, created once and then copied.
+
+    Strings are immutable, so they are shared as they are. Other values,
+    such as `Xref`, can be modified by the user, so the pool only stores
+    the first value created with some arguments, and returns a shallow
+    copy of it: copies are distinct objects, but share the strings of the
+    pooled value, and are created without validating them again.
+
+    Values are keyed by the factory and the arguments used to create them
+    rather than by the values themselves, since some types (such as `Xref`,
+    which only compare their identifiers) compare equal without being
+    interchangeable.
+
+    Example:
+        >>> from pronto.utils.pool import ValuePool
+        >>> pool = ValuePool()
+        >>> x1 = pool.get(pronto.Xref, "PMID:1234", None)
+        >>> x2 = pool.get(pronto.Xref, "PMID:1234", None)
+        >>> x1 is x2
+        False
+        >>> x1.id is x2.id
+        True
+        >>> pool.get(pronto.Xref, "PMID:1234", "a paper").description
+        'a paper'
+        >>> pool.intern("GO:0008150") is pool.intern("GO:0008150")
+        True
+
+    """
+
+    def __init__(self):
+        self._values: Dict[Hashable, Any] = {}
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._strings)
+
+    def get(self, factory: Callable[..., _T], *args: Hashable) -> _T:
+        """Get a copy of the value created by calling ``factory`` with ``args``.
+        """
+        key = (factory, *args)
+        try:
+            value = self._values[key]
+        except KeyError:
+            self._values[key] = value = factory(*args)
+        return copy.copy(value)
+
+    def intern(self, string: str) -> str:
+        """Get the pooled string equal to ``string``.
+
+        Unlike `sys.intern`, strings are only shared within the pool, and
+        are not kept in memory once the pool has been released.
+        """
+        return self._strings.setdefault(string, string)
+
+
+# The pool of the ontology being parsed in the current context, if any
+_CURRENT_POOL: "contextvars.ContextVar[Optional[ValuePool]]"
+_CURRENT_POOL = contextvars.ContextVar("_CURRENT_POOL", default=None)
+
+
+def current_pool() -> Optional[ValuePool]:
+    """Get the value pool used in the current context, if any.
+    """
+    return _CURRENT_POOL.get()
+
+
+def pooled(factory: Callable[..., _T], *args: Hashable) -> _T:
+    """Get a value from the pool of the current context, if any.
+    """
+    pool = _CURRENT_POOL.get()
+    return factory(*args) if pool is None else pool.get(factory, *args)
+
+
+def intern(string: str) -> str:
+    """Get a string from the pool of the current context, if any.
+    """
+    pool = _CURRENT_POOL.get()
+    return string if pool is None else pool.intern(string)
+
+
+@contextlib.contextmanager
+def use_pool(pool: Optional[ValuePool] = None) -> Iterator[ValuePool]:
+    """Share the values created in the current context through a pool.
+    """
+    pool = ValuePool() if pool is None else pool
+    token = _CURRENT_POOL.set(pool)
+    try:
+        yield pool
+    finally:
+        _CURRENT_POOL.reset(token)
@@ -96,3 +96,10 @@ class Xref(object):
 
     def __hash__(self):
         return hash(self.id)
+
+    def __copy__(self) -> "Xref":
+        # copy the attributes without validating the identifier again
+        xref = type(self).__new__(type(self))
+        xref.id = self.id
+        xref.description = self.description
+        return xref
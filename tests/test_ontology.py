@@ -1,13 +1,24 @@
+import asyncio
+import gc
+import io
 import itertools
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import warnings
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 
 import pronto
 from pronto.term import Term, TermData, TermSet
+from pronto.relationship import RelationshipData
 from pronto.logic.lineage import Lineage
+from pronto.logic.relations import Adjacency
+from pronto.utils.cache import OntologyCache
 
-from .utils import DATADIR
+from .utils import DATADIR, TemporaryDirectoryMixin
 
 
 class TestTerm(unittest.TestCase):
@@ -41,3 +52,680 @@ class TestTerm(unittest.TestCase):
 
         t2.relationships = {}
         self.assertEqual(ont._inheritance, {t1.id: Lineage(), t2.id: Lineage()})
+
+    def test_inheritance_caching_parsed(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmp, "dep.obo"), "w") as f:
+                f.write("format-version: 1.4\n\n[Term]\nid: TST:000\n")
+            path = os.path.join(tmp, "tst.obo")
+            with open(path, "w") as f:
+                f.write(
+                    "format-version: 1.4\nimport: dep\n\n"
+                    "[Term]\nid: TST:002\nis_a: TST:001\n\n"
+                    "[Term]\nid: TST:001\nis_a: TST:000\n\n"
+                    "[Term]\nid: TST:003\n"
+                )
+            ont = pronto.Ontology(path)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(ont._inheritance, {
+            "TST:000": Lineage(sub={"TST:001"}),
+            "TST:001": Lineage(sub={"TST:002"}, sup={"TST:000"}),
+            "TST:002": Lineage(sup={"TST:001"}),
+            "TST:003": Lineage(),
+        })
+        self.assertTrue(ont["TST:003"].is_leaf())
+
+    def test_relationship_caching(self):
+        ont = pronto.Ontology()
+        self.assertEqual(ont._relations, {})
+
+        t1 = ont.create_term("TST:001")
+        t2 = ont.create_term("TST:002")
+        part_of = ont.create_relationship("part_of")
+
+        t2.relationships = { part_of: [t1] }
+        self.assertEqual(ont._relations, {
+            t1.id: Adjacency(backward={"part_of": {t2.id}}),
+            t2.id: Adjacency(forward={"part_of": {t1.id}}),
+        })
+
+        t2.relationships = {}
+        self.assertEqual(ont._relations, {
+            t1.id: Adjacency(backward={"part_of": set()}),
+            t2.id: Adjacency(),
+        })
+
+    def test_relationship_caching_after_parsing(self):
+        for t in self.ms.terms():
+            for r, objects in t.relationships.items():
+                if r.id == "is_a":
+                    continue
+                forward = self.ms._relations[t.id].forward[r.id]
+                self.assertEqual(forward, {o.id for o in objects})
+
+
+class TestAddEntities(unittest.TestCase):
+
+    def test_caches(self):
+        ont = pronto.Ontology()
+        t1, t2 = TermData("TST:001"), TermData("TST:002")
+        t2.relationships = {"is_a": {"TST:001"}, "part_of": {"TST:001"}}
+        ont.add_entities([t1, t2], [RelationshipData("part_of")])
+        self.assertIs(ont.get_term("TST:002")._data(), t2)
+        self.assertEqual(ont.get_relationship("part_of").id, "part_of")
+        self.assertEqual(ont._inheritance, {
+            t1.id: Lineage(sub={t2.id}),
+            t2.id: Lineage(sup={t1.id}),
+        })
+        self.assertEqual(ont._relations, {
+            t1.id: Adjacency(backward={"part_of": {t2.id}}),
+            t2.id: Adjacency(forward={"part_of": {t1.id}}),
+        })
+
+    def test_collisions(self):
+        ont = pronto.Ontology()
+        ont.create_term("TST:001")
+        self.assertRaises(ValueError, ont.add_entities, [TermData("TST:001")])
+        self.assertRaises(ValueError, ont.add_entities, [], [RelationshipData("is_a")])
+        self.assertRaises(
+            ValueError,
+            ont.add_entities,
+            [TermData("TST:002"), TermData("TST:002")],
+        )
+        self.assertRaises(
+            ValueError,
+            ont.add_entities,
+            [TermData("TST:003")],
+            [RelationshipData("TST:003")],
+        )
+        self.assertEqual(list(ont.terms()), [ont["TST:001"]])
+
+    def test_collisions_imports(self):
+        dep = pronto.Ontology()
+        dep.create_term("TST:001")
+        ont = pronto.Ontology()
+        ont.imports["dep"] = dep
+        self.assertRaises(ValueError, ont.add_entities, [TermData("TST:001")])
+
+    def test_type_error(self):
+        ont = pronto.Ontology()
+        self.assertRaises(TypeError, ont.add_entities, [RelationshipData("TST:001")])
+        self.assertRaises(TypeError, ont.add_entities, [], [TermData("TST:001")])
+
+    def test_parsed_frames_merged(self):
+        ont = pronto.Ontology(io.BytesIO(
+            b"format-version: 1.4\n\n"
+            b"[Term]\nid: TST:001\nname: first\n\n"
+            b"[Term]\nid: TST:002\nis_a: TST:001\n\n"
+            b"[Term]\nid: TST:001\nsynonym: \"one\" EXACT []\n\n"
+            b"[Typedef]\nid: is_a\n"
+        ))
+        self.assertEqual(len(ont.terms()), 2)
+        self.assertEqual(ont["TST:001"].name, "first")
+        self.assertEqual({s.description for s in ont["TST:001"].synonyms}, {"one"})
+        subclasses = ont["TST:001"].subclasses().to_set()
+        self.assertEqual(set(subclasses.ids), {"TST:001", "TST:002"})
+
+
+class TestImports(TemporaryDirectoryMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # a diamond-shaped import graph: A imports B and C, which import D
+        self._write("A", ["B", "C"])
+        self._write("B", ["D"])
+        self._write("C", ["D"])
+        self._write("D", [])
+
+    def _write(self, name, imports):
+        header = [f"ontology: {name}", *(f"import: {i}" for i in imports)]
+        self.write_obo(f"{name}.obo", f"[Term]\nid: {name}:001\n", header=header)
+
+    def test_diamond_imports_shared(self):
+        a = pronto.Ontology(os.path.join(self.tmpdir, "A.obo"), import_depth=3)
+        self.assertEqual(set(a.imports), {"B", "C"})
+        d1 = a.imports["B"].imports["D"]
+        d2 = a.imports["C"].imports["D"]
+        self.assertIs(d1, d2)
+        self.assertIn("D:001", a)
+        self.assertEqual(len(a.terms()), 5)
+
+    def test_diamond_imports_enriched(self):
+        # B enriches a term of D, which must not change the D seen from C
+        self.write_obo(
+            "B.obo",
+            "[Term]\nid: B:001\n",
+            "[Term]\nid: D:001\nname: from B\nis_a: B:001\n",
+            header=["ontology: B", "import: D"],
+        )
+        a = pronto.Ontology(os.path.join(self.tmpdir, "A.obo"), import_depth=3)
+        b, c = a.imports["B"], a.imports["C"]
+        self.assertIsNot(b.imports["D"], c.imports["D"])
+        self.assertEqual(b["D:001"].name, "from B")
+        sup = b["D:001"].superclasses(with_self=False).to_set()
+        self.assertEqual(sup.ids, {"B:001"})
+        self.assertIs(c["D:001"].name, None)
+        sup = c["D:001"].superclasses(with_self=False).to_set()
+        self.assertEqual(sup.ids, set())
+        self.assertEqual(c["D:001"]._data().relationships, {})
+        c_alone = pronto.Ontology(os.path.join(self.tmpdir, "C.obo"), import_depth=2)
+        self.assertIs(c_alone["D:001"].name, None)
+
+    def test_imports_enriched_relationships(self):
+        # relationships added to a term of an import are in the cache
+        self.write_obo(
+            "B.obo",
+            "[Term]\nid: B:001\n",
+            "[Term]\nid: D:001\nrelationship: part_of B:001\n",
+            "[Typedef]\nid: part_of\n",
+            header=["ontology: B", "import: D"],
+        )
+        a = pronto.Ontology(os.path.join(self.tmpdir, "A.obo"), import_depth=3)
+        b = a.imports["B"]
+        part_of = b.get_relationship("part_of")
+        self.assertEqual([t.id for t in b["D:001"].objects(part_of)], ["B:001"])
+        self.assertEqual([t.id for t in a["D:001"].objects(part_of)], ["B:001"])
+
+    def test_imports_not_shared_across_loads(self):
+        path = os.path.join(self.tmpdir, "A.obo")
+        a1 = pronto.Ontology(path, import_depth=3)
+        a2 = pronto.Ontology(path, import_depth=3)
+        self.assertIsNot(a1.imports["B"], a2.imports["B"])
+
+    def test_import_error(self):
+        with open(os.path.join(self.tmpdir, "D.obo"), "w") as f:
+            f.write("format-version: 1.4\n\n[Term]\nnot a clause\n")
+        path = os.path.join(self.tmpdir, "A.obo")
+        with self.assertRaises(SyntaxError):
+            pronto.Ontology(path, import_depth=3)
+
+
+class TestLookups(unittest.TestCase):
+
+    def test_import_changes(self):
+        dep = pronto.Ontology()
+        ont = pronto.Ontology()
+        self.assertNotIn("TST:001", ont)
+        ont.imports["dep"] = dep
+        dep.create_term("TST:001")
+        self.assertIn("TST:001", ont)
+        self.assertIs(ont.get_term("TST:001")._data(), dep.get_term("TST:001")._data())
+        del ont.imports["dep"]
+        self.assertNotIn("TST:001", ont)
+        ont.imports = {"dep": dep}
+        self.assertIn("TST:001", ont)
+
+    def test_import_changes_edges(self):
+        dep = pronto.Ontology()
+        part_of = dep.create_relationship("part_of")
+        t1 = dep.create_term("TST:001")
+        t2 = dep.create_term("TST:002")
+        t2.relationships = {part_of: [t1], dep["is_a"]: [t1]}
+        ont = pronto.Ontology()
+        ont.imports["dep"] = dep
+        part_of = ont.get_relationship("part_of")
+        self.assertEqual(list(ont["TST:002"].objects(part_of)), [ont["TST:001"]])
+        self.assertIn("TST:002", ont["TST:001"].subclasses().to_set().ids)
+        del ont.imports["dep"]
+        ont.imports["other"] = pronto.Ontology()
+        self.assertEqual(ont._relations, {})
+        self.assertEqual(ont._inheritance, {})
+
+    def test_nested_import_changes(self):
+        dep = pronto.Ontology()
+        mid = pronto.Ontology()
+        ont = pronto.Ontology()
+        mid.imports["dep"] = dep
+        ont.imports["mid"] = mid
+        self.assertNotIn("TST:001", ont)
+        dep.create_term("TST:001")
+        self.assertIn("TST:001", ont)
+        del mid.imports["dep"]
+        self.assertNotIn("TST:001", ont)
+        dep.create_term("TST:002")
+        self.assertNotIn("TST:002", ont)
+
+    def test_unrelated_changes(self):
+        ont = pronto.Ontology()
+        ont.create_term("TST:001")
+        self.assertIn("TST:001", ont)
+        index = ont._entity_index()
+        other = pronto.Ontology()
+        other.create_term("TST:002")
+        other.imports["ont"] = ont
+        other.create_term("TST:003")
+        self.assertIn("TST:001", other)
+        self.assertIs(ont._entity_index(), index)
+
+    def test_precedence(self):
+        dep1, dep2 = pronto.Ontology(), pronto.Ontology()
+        dep1.create_term("TST:001").name = "first"
+        dep2.create_term("TST:001").name = "second"
+        dep2.create_relationship("TST:002")
+        dep1.create_term("TST:002")
+        ont = pronto.Ontology()
+        ont.imports.update(dep1=dep1, dep2=dep2)
+        self.assertEqual(ont.get_term("TST:001").name, "first")
+        self.assertIsInstance(ont["TST:002"], pronto.Relationship)
+        self.assertIsInstance(ont.get_term("TST:002"), Term)
+        self.assertRaises(KeyError, ont.get_relationship, "TST:001")
+        self.assertIsInstance(ont.get_relationship("is_a"), pronto.Relationship)
+
+    def test_created_entities(self):
+        ont = pronto.Ontology()
+        self.assertNotIn("TST:001", ont)
+        ont.create_term("TST:001")
+        ont.add_entities([TermData("TST:002")], [RelationshipData("part_of")])
+        for id_ in ("TST:001", "TST:002", "part_of"):
+            self.assertIn(id_, ont)
+        self.assertRaises(KeyError, ont.get_term, "part_of")
+        self.assertRaises(KeyError, ont.__getitem__, "TST:003")
+
+
+class TestViews(unittest.TestCase):
+
+    def test_views_reused(self):
+        ont = pronto.Ontology()
+        t1 = ont.create_term("TST:001")
+        t2 = ont.create_term("TST:002")
+        t2.relationships = {ont["is_a"]: [t1]}
+        part_of = ont.create_relationship("part_of")
+        self.assertIs(ont.get_term("TST:001"), t1)
+        self.assertIs(ont["TST:001"], t1)
+        self.assertIs(ont["part_of"], part_of)
+        self.assertIs(ont.get_relationship("part_of"), part_of)
+        self.assertIs(next(t for t in ont.terms() if t.id == "TST:001"), t1)
+        self.assertIs(list(t2.superclasses())[1], t1)
+
+    def test_views_not_kept_alive(self):
+        ont = pronto.Ontology()
+        ref = weakref.ref(ont.create_term("TST:001"))
+        gc.collect()
+        self.assertIs(ref(), None)
+        self.assertEqual(ont.get_term("TST:001").id, "TST:001")
+
+    def test_views_pruned(self):
+        ont = pronto.Ontology()
+        kept = [ont.create_term(f"TST:{i:05}") for i in range(10)]
+        for i in range(10, 5000):
+            ont.create_term(f"TST:{i:05}")
+        gc.collect()
+        for term in ont.terms():
+            pass
+        self.assertLessEqual(len(ont._views), 2 * pronto.ontology._VIEWS_LIMIT)
+        for term in kept:
+            self.assertIs(ont.get_term(term.id), term)
+
+    def test_views_dropped_with_imports(self):
+        dep1, dep2 = pronto.Ontology(), pronto.Ontology()
+        dep1.create_term("TST:001")
+        dep2.create_term("TST:001")
+        ont = pronto.Ontology()
+        ont.imports["dep"] = dep1
+        term = ont.get_term("TST:001")
+        self.assertIs(ont.get_term("TST:001"), term)
+        data = weakref.ref(term._data())
+        ont.imports["dep"] = dep2
+        self.assertIsNot(ont.get_term("TST:001"), term)
+        self.assertIs(ont.get_term("TST:001")._data(), dep2.get_term("TST:001")._data())
+        del dep1
+        gc.collect()
+        self.assertIs(data(), None)
+
+    def test_no_views_on_load(self):
+        ont = pronto.Ontology(os.path.join(DATADIR, "ms.obo"))
+        for o in (ont, *ont.imports.values()):
+            self.assertFalse(any(isinstance(data, TermData) for data in o._views))
+
+    def test_views_per_ontology(self):
+        dep = pronto.Ontology()
+        term = dep.create_term("TST:001")
+        ont = pronto.Ontology()
+        ont.imports["dep"] = dep
+        self.assertIsNot(ont.get_term("TST:001"), term)
+        self.assertIs(ont.get_term("TST:001")._ontology(), ont)
+
+
+class TestFields(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        warnings.simplefilter("ignore")
+        cls.path = os.path.join(DATADIR, "ms.obo")
+        cls.ms = pronto.Ontology(cls.path, import_depth=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        warnings.simplefilter(warnings.defaultaction)
+
+    def assertFieldsLoaded(self, ont):
+        for id_, data in self.ms._terms.items():
+            term = ont[id_]
+            if "name" in ont.fields:
+                self.assertEqual(term.name, data.name)
+            else:
+                self.assertIs(term.name, None)
+            self.assertEqual(len(term.synonyms), 0)
+            self.assertIs(term.definition, None)
+        if "is_a" in ont.fields:
+            self.assertEqual(ont._inheritance, self.ms._inheritance)
+            self.assertEqual(ont._relations, self.ms._relations)
+        else:
+            self.assertTrue(all(not l.sup for l in ont._inheritance.values()))
+
+    def test_graph(self):
+        ont = pronto.Ontology(self.path, import_depth=0, fields="graph")
+        self.assertEqual(ont.fields, {"is_a", "relationships"})
+        self.assertFieldsLoaded(ont)
+
+    def test_labels(self):
+        ont = pronto.Ontology(self.path, import_depth=0, fields="labels")
+        self.assertEqual(ont.fields, {"name", "namespace"})
+        self.assertFieldsLoaded(ont)
+
+    def test_field_names(self):
+        ont = pronto.Ontology(
+            self.path, import_depth=0, fields=["id", "name", "graph"]
+        )
+        self.assertEqual(ont.fields, {"name", "is_a", "relationships"})
+        self.assertFieldsLoaded(ont)
+
+    def test_lazy(self):
+        ont = pronto.Ontology(self.path, import_depth=0, lazy=True, fields="labels")
+        self.assertFieldsLoaded(ont)
+
+    def test_rdfxml(self):
+        path = os.path.join(DATADIR, "iao.owl")
+        iao = pronto.Ontology(path, import_depth=0)
+        ont = pronto.Ontology(path, import_depth=0, fields="graph")
+        self.assertEqual(ont._inheritance, iao._inheritance)
+        self.assertTrue(all(t.name is None for t in ont.terms()))
+        self.assertTrue(all(not t.annotations for t in ont.terms()))
+
+    def test_unknown_field(self):
+        self.assertRaises(ValueError, pronto.Ontology, self.path, fields=["nme"])
+
+
+class TestCache(TemporaryDirectoryMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self._write("tst.obo", "TST:001")
+        self._cache = pronto.Ontology.cache
+        pronto.Ontology.cache = OntologyCache(maxsize=2)
+
+    def tearDown(self):
+        pronto.Ontology.cache = self._cache
+
+    def _write(self, name, *ids):
+        return self.write_obo(name, *(f"[Term]\nid: {id_}\n" for id_ in ids))
+
+    def test_disabled_by_default(self):
+        self.assertFalse(self._cache.enabled)
+
+    def test_hit(self):
+        ont1 = pronto.Ontology(self.path)
+        ont2 = pronto.Ontology(self.path)
+        self.assertIsNot(ont1, ont2)
+        self.assertEqual(set(ont1.keys()), set(ont2.keys()))
+        self.assertEqual(ont2.path, self.path)
+        info = pronto.Ontology.cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_hit_isolated(self):
+        ont1 = pronto.Ontology(self.path)
+        ont1["TST:001"].name = "modified"
+        ont1.create_term("TST:002")
+        ont1.metadata.ontology = "modified"
+        ont2 = pronto.Ontology(self.path)
+        ont2["TST:001"].definition = pronto.Definition("modified")
+        ont3 = pronto.Ontology(self.path)
+        for ont in (ont2, ont3):
+            self.assertIsNone(ont["TST:001"].name)
+            self.assertNotIn("TST:002", ont)
+            self.assertIsNone(ont.metadata.ontology)
+        self.assertIsNone(ont3["TST:001"].definition)
+        self.assertEqual(pronto.Ontology.cache.info().hits, 2)
+
+    def test_miss_on_change(self):
+        ont1 = pronto.Ontology(self.path)
+        self._write("tst.obo", "TST:001", "TST:002")
+        ont2 = pronto.Ontology(self.path)
+        self.assertNotIn("TST:002", ont1)
+        self.assertIn("TST:002", ont2)
+        self.assertEqual(pronto.Ontology.cache.info().misses, 2)
+
+    def test_miss_on_import_depth(self):
+        pronto.Ontology(self.path, import_depth=0)
+        pronto.Ontology(self.path, import_depth=1)
+        self.assertEqual(pronto.Ontology.cache.info().misses, 2)
+
+    def test_miss_on_fields(self):
+        pronto.Ontology(self.path)
+        pronto.Ontology(self.path, fields="graph")
+        self.assertEqual(pronto.Ontology.cache.info().misses, 2)
+
+    def test_miss_on_encoding(self):
+        pronto.Ontology(self.path)
+        pronto.Ontology(self.path, encoding="latin-1")
+        pronto.Ontology(self.path, encoding="iso-8859-1")
+        info = pronto.Ontology.cache.info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+    def test_lazy_not_cached(self):
+        with mock.patch.object(pronto.Ontology, "_digest") as digest:
+            pronto.Ontology(self.path, lazy=True)
+            pronto.Ontology(self.path, lazy=True)
+        digest.assert_not_called()
+        info = pronto.Ontology.cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+    def test_digest_once(self):
+        digest = mock.Mock(wraps=pronto.Ontology._digest)
+        with mock.patch.object(pronto.Ontology, "_digest", digest):
+            pronto.Ontology(self.path, cache_dir=self.tmpdir)
+            pronto.Ontology.cache.clear()
+            pronto.Ontology(self.path, cache_dir=self.tmpdir)
+        self.assertEqual(digest.call_count, 2)
+        self.assertEqual(len(os.listdir(self.tmpdir)), 2)
+
+    def test_eviction_maxsize(self):
+        paths = [self._write(f"{i}.obo", f"TST:{i}") for i in range(3)]
+        for path in paths:
+            pronto.Ontology(path)
+        pronto.Ontology(paths[2])
+        pronto.Ontology(paths[0])
+        info = pronto.Ontology.cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 4, 2))
+
+    def test_eviction_maxentities(self):
+        pronto.Ontology.cache = OntologyCache(maxsize=None, maxentities=3)
+        big = self._write("big.obo", "TST:001", "TST:002", "TST:003", "TST:004")
+        pronto.Ontology(big)
+        self.assertEqual(pronto.Ontology.cache.info().currsize, 0)
+        pronto.Ontology(self.path)
+        self.assertEqual(pronto.Ontology.cache.info().entities, 1)
+
+
+class TestUpdate(TemporaryDirectoryMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self._write(
+            "[Term]\nid: TST:001\nname: root\n",
+            "[Term]\nid: TST:002\nname: child\nis_a: TST:001\n",
+            "[Term]\nid: TST:003\nrelationship: part_of TST:002\n",
+            "[Typedef]\nid: part_of\n",
+        )
+        self.ont = pronto.Ontology(self.path)
+
+    def _write(self, *frames):
+        return self.write_obo("tst.obo", *frames)
+
+    def assertCachesEqual(self, ont, other):
+        def edges(o):
+            return {
+                id_: (adj.forward, adj.backward)
+                for id_, adj in o._relations.items()
+                if adj.forward or adj.backward
+            }
+        self.assertEqual(ont._inheritance, other._inheritance)
+        self.assertEqual(edges(ont), edges(other))
+
+    def test_unchanged(self):
+        summary = self.ont.reload()
+        self.assertEqual(summary, (frozenset(), frozenset(), frozenset()))
+        summary = self.ont.reload()
+        self.assertEqual(summary, (frozenset(), frozenset(), frozenset()))
+
+    def test_changes(self):
+        self.ont.reload()
+        term = self.ont["TST:002"]
+        self._write(
+            "[Term]\nid: TST:002\nname: orphan\n",
+            "[Term]\nid: TST:003\nrelationship: part_of TST:002\n",
+            "[Term]\nid: TST:004\nis_a: TST:002\nrelationship: part_of TST:003\n",
+            "[Typedef]\nid: part_of\n",
+        )
+        summary = self.ont.reload()
+        self.assertEqual(summary.added, {"TST:004"})
+        self.assertEqual(summary.changed, {"TST:002"})
+        self.assertEqual(summary.removed, {"TST:001"})
+        self.assertEqual(term.name, "orphan")
+        self.assertNotIn("TST:001", self.ont)
+        self.assertEqual(set(term.subclasses().to_set().ids), {"TST:002", "TST:004"})
+        self.assertCachesEqual(self.ont, pronto.Ontology(self.path))
+
+    def test_update_from(self):
+        other = self.write_obo("other.obo", "[Typedef]\nid: part_of\nname: part of\n")
+        summary = self.ont.update_from(other)
+        self.assertEqual(summary.changed, {"part_of"})
+        self.assertEqual(summary.removed, {"TST:001", "TST:002", "TST:003"})
+        self.assertEqual(self.ont.path, other)
+        self.assertEqual(len(self.ont.terms()), 0)
+        self.assertEqual(self.ont._inheritance, {})
+
+    def test_imported_entity(self):
+        self.write_obo(
+            "imp.obo",
+            '[Term]\nid: IMP:001\nsynonym: "base" EXACT []\nis_a: IMP:000\n',
+            header=["ontology: imp"],
+        )
+        frame = '[Term]\nid: IMP:001\nsynonym: "{}" EXACT []\nxref: TST:{}\n'
+        header = ["import: imp.obo"]
+        self.write_obo("tst.obo", frame.format("extra", "1"), header=header)
+        ont = pronto.Ontology(self.path)
+        term = ont["IMP:001"]
+        for _ in range(2):
+            ont.reload()
+            self.assertEqual(
+                sorted(s.description for s in term.synonyms), ["base", "extra"]
+            )
+            self.assertEqual(term.xrefs, {pronto.Xref("TST:1")})
+            self.assertEqual(len(term._data().synonyms), 2)
+            self.assertEqual(term._data().relationships, {"is_a": {"IMP:000"}})
+
+        self.write_obo("tst.obo", frame.format("other", "2"), header=header)
+        summary = ont.reload()
+        self.assertEqual(summary.changed, {"IMP:001"})
+        self.assertEqual(sorted(s.description for s in term.synonyms), ["base", "other"])
+        self.assertEqual(term.xrefs, {pronto.Xref("TST:2")})
+
+        self.write_obo("tst.obo", header=header)
+        ont.reload()
+        self.assertEqual([s.description for s in term.synonyms], ["base"])
+        self.assertEqual(term.xrefs, set())
+        superclasses = term.superclasses(distance=1, with_self=False).to_set()
+        self.assertEqual(set(superclasses.ids), {"IMP:000"})
+
+    def test_lazy(self):
+        ont = pronto.Ontology(self.path, lazy=True)
+        self.assertRaises(ValueError, ont.reload)
+
+
+class TestLoadMany(unittest.TestCase):
+
+    def test_load_many(self):
+        paths = [os.path.join(DATADIR, f) for f in ("uo.obo", "cio.obo", "ms.obo")]
+        onts = pronto.Ontology.load_many(paths, processes=2)
+        self.assertEqual([ont.path for ont in onts], paths)
+        for path, ont in zip(paths, onts):
+            expected = pronto.Ontology(path)
+            self.assertEqual(len(ont), len(expected))
+            self.assertEqual(set(ont.imports), set(expected.imports))
+            self.assertEqual(ont._inheritance, expected._inheritance)
+
+    def test_load_many_cache_dir(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(DATADIR, "uo.obo")
+            ont, = pronto.Ontology.load_many([path], cache_dir=tmpdir, processes=1)
+            self.assertEqual(ont.cache_dir, tmpdir)
+            self.assertTrue(any(f.endswith(".snapshot") for f in os.listdir(tmpdir)))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_load_many_error(self):
+        path = os.path.join(DATADIR, "missing.obo")
+        with self.assertRaises(ValueError):
+            pronto.Ontology.load_many([path], import_depth=0, processes=1)
+
+
+class TestAload(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_aload(self):
+        paths = [os.path.join(DATADIR, f) for f in ("uo.obo", "cio.obo")]
+        async def load_all():
+            return await asyncio.gather(*map(pronto.Ontology.aload, paths))
+        onts = self.loop.run_until_complete(load_all())
+        for path, ont in zip(paths, onts):
+            self.assertEqual(ont.path, path)
+            self.assertEqual(len(ont), len(pronto.Ontology(path)))
+
+    def test_aload_process_pool(self):
+        path = os.path.join(DATADIR, "uo.obo")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            coro = pronto.Ontology.aload(path, fields="graph", executor=executor)
+            ont = self.loop.run_until_complete(coro)
+        self.assertEqual(ont.path, path)
+        self.assertEqual(ont.fields, {"is_a", "relationships"})
+        self.assertEqual(len(ont), len(pronto.Ontology(path)))
+
+
+class TestReadMetadata(unittest.TestCase):
+
+    def assertMetadataEqual(self, meta, expected):
+        self.assertEqual(vars(meta), vars(expected))
+
+    def test_obo(self):
+        path = os.path.join(DATADIR, "ms.obo")
+        meta = pronto.Ontology.read_metadata(path)
+        self.assertEqual(meta.imports, {"uo.obo", "pato.obo"})
+        self.assertMetadataEqual(meta, pronto.Ontology(path).metadata)
+
+    def test_json(self):
+        with open(os.path.join(DATADIR, "uo.obo"), "rb") as f:
+            expected = pronto.Ontology(f)
+        data = expected.dumps(format="json").encode("utf-8")
+        meta = pronto.Ontology.read_metadata(io.BytesIO(data))
+        self.assertMetadataEqual(meta, pronto.Ontology(io.BytesIO(data)).metadata)
+
+    def test_rdfxml(self):
+        path = os.path.join(DATADIR, "iao.owl")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            meta = pronto.Ontology.read_metadata(path)
+            expected = pronto.Ontology(path, import_depth=0).metadata
+        self.assertMetadataEqual(meta, expected)
+
+    def test_unknown_format(self):
+        buffer = io.BytesIO(b"not an ontology")
+        self.assertRaises(ValueError, pronto.Ontology.read_metadata, buffer)
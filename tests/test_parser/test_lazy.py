@@ -0,0 +1,92 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import pronto
+from pronto.logic import Lineage
+
+from ..utils import DATADIR
+
+
+class TestLazyOboParser(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        warnings.simplefilter("ignore")
+        cls.path = os.path.join(DATADIR, "ms.obo")
+        cls.ms = pronto.Ontology(cls.path, import_depth=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        warnings.simplefilter(warnings.defaultaction)
+
+    @staticmethod
+    def entity(data):
+        return {
+            attr: getattr(data, attr)
+            for cls in type(data).__mro__
+            for attr in getattr(cls, "__slots__", ())
+            if attr != "__weakref__"
+        }
+
+    def test_terms_loaded_on_demand(self):
+        ms = pronto.Ontology(self.path, import_depth=0, lazy=True)
+        self.assertEqual(ms._terms.loaded, 0)
+        self.assertEqual(len(ms.terms()), len(self.ms.terms()))
+        self.assertIn("MS:1000031", ms)
+        self.assertEqual(ms._terms.loaded, 0)
+        self.assertEqual(ms["MS:1000031"].name, self.ms["MS:1000031"].name)
+        self.assertEqual(ms._terms.loaded, 1)
+        self.assertIs(ms["MS:1000031"]._data(), ms["MS:1000031"]._data())
+
+    def test_terms_equal(self):
+        ms = pronto.Ontology(self.path, import_depth=0, lazy=True)
+        self.assertEqual(list(ms._terms), list(self.ms._terms))
+        for id_, data in self.ms._terms.items():
+            self.assertEqual(self.entity(ms._terms[id_]), self.entity(data))
+        for id_, data in self.ms._relationships.items():
+            self.assertEqual(self.entity(ms._relationships[id_]), self.entity(data))
+
+    def test_caches_without_parsing(self):
+        ms = pronto.Ontology(self.path, import_depth=0, lazy=True)
+        nonempty = lambda cache: {k: v for k, v in cache.items() if v != Lineage()}
+        self.assertEqual(nonempty(ms._inheritance), nonempty(self.ms._inheritance))
+        self.assertEqual(ms._relations, self.ms._relations)
+        superclasses = {t.id for t in ms["MS:1000200"].superclasses()}
+        self.assertEqual(ms._terms.loaded, len(superclasses))
+        self.assertEqual(
+            superclasses, {t.id for t in self.ms["MS:1000200"].superclasses()}
+        )
+
+    def test_snapshot(self):
+        ms = pronto.Ontology(self.path, import_depth=0, lazy=True)
+        buffer = io.BytesIO()
+        ms.dump(buffer, format="snapshot")
+        buffer.seek(0)
+        ms2 = pronto.Ontology.from_snapshot(buffer)
+        self.assertIsInstance(ms2._terms, dict)
+        self.assertEqual(len(ms2.terms()), len(self.ms.terms()))
+
+    def test_invalid_handle(self):
+        with open(self.path, "rb") as f:
+            self.assertRaises(ValueError, pronto.Ontology, f, lazy=True)
+        self.assertRaises(
+            ValueError, pronto.Ontology, self.path, lazy=True, cache_dir=DATADIR
+        )
+        self.assertRaises(
+            ValueError, pronto.Ontology, os.path.join(DATADIR, "iao.owl"), lazy=True
+        )
+
+    def test_compressed(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "ms.obo.gz")
+            with open(self.path, "rb") as src, gzip.open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            self.assertRaises(ValueError, pronto.Ontology, path, lazy=True)
+        finally:
+            shutil.rmtree(tmp)
@@ -1,10 +1,13 @@
 import io
+import json
 import os
 import unittest
+import unittest.mock
 import warnings
 import xml.etree.ElementTree as etree
 
 import pronto
+from pronto.parsers.obojson import OboJSONParser, _JSONReader
 
 
 class TestOboJsonExamples(unittest.TestCase):
@@ -49,3 +52,101 @@ class TestOboJsonExamples(unittest.TestCase):
         self.assertIn(ont["X:1"], ont["X:2"].replaced_by)
         self.assertTrue(ont["Y:2"].obsolete)
         self.assertTrue(ont["Y:1"], ont["Y:2"].replaced_by)
+
+
+class TestStreaming(unittest.TestCase):
+
+    OBO = "http://purl.obolibrary.org/obo/"
+
+    def setUp(self):
+        warnings.simplefilter("ignore")
+
+    def tearDown(self):
+        warnings.simplefilter(warnings.defaultaction)
+
+    def graph(self, edges_first=False):
+        nodes = [
+            {"id": f"{self.OBO}X_{i}", "type": "CLASS", "lbl": f"x{i}"}
+            for i in range(1, 4)
+        ]
+        nodes.append({"id": f"{self.OBO}Y_1", "type": "CLASS"})
+        nodes.append({"id": f"{self.OBO}BFO_0000050", "type": "PROPERTY"})
+        edges = [
+            {"sub": f"{self.OBO}X_1", "pred": "is_a", "obj": f"{self.OBO}X_2"},
+            {"sub": f"{self.OBO}X_3", "pred": f"{self.OBO}BFO_0000050", "obj": f"{self.OBO}X_1"},
+            {"sub": f"{self.OBO}Z_1", "pred": "is_a", "obj": f"{self.OBO}X_1"},
+        ]
+        graph = {
+            "id": f"{self.OBO}x.owl",
+            "meta": {"version": f"{self.OBO}x/releases/1.0/x.owl"},
+            "equivalentNodesSets": [{"nodeIds": [f"{self.OBO}X_2", f"{self.OBO}Y_1"]}],
+        }
+        if edges_first:
+            graph.update(edges=edges, nodes=nodes)
+        else:
+            graph.update(nodes=nodes, edges=edges)
+        return json.dumps({"graphs": [graph]}, indent=1).encode("utf-8")
+
+    @staticmethod
+    def load(data, streaming):
+        ont = pronto.Ontology()
+        OboJSONParser(ont, streaming=streaming).parse_from(io.BytesIO(data))
+        return ont
+
+    @staticmethod
+    def entities(ont):
+        return {
+            data.id: {
+                attr: getattr(data, attr)
+                for cls in type(data).__mro__
+                for attr in getattr(cls, "__slots__", ())
+                if attr != "__weakref__"
+            }
+            for data in (*ont._terms.values(), *ont._relationships.values())
+        }
+
+    def test_same_result(self):
+        for edges_first in (False, True):
+            data = self.graph(edges_first)
+            graph = self.load(data, streaming=False)
+            stream = self.load(data, streaming=True)
+            self.assertEqual(self.entities(stream), self.entities(graph))
+            self.assertEqual(list(stream._terms), list(graph._terms))
+            self.assertEqual(stream._inheritance, graph._inheritance)
+            self.assertEqual(stream._relations, graph._relations)
+            self.assertEqual(stream.metadata.data_version, graph.metadata.data_version)
+            self.assertIn(stream["Y:1"], stream["X:2"].equivalent_to)
+            self.assertNotIn("Z:1", stream)
+
+    def test_same_result_imports(self):
+        # `fastobo` does not extract imports from graphs, so use a mock
+        # to resolve an import declaring one of the nodes of the graph
+        def process_imports(*args, **kwargs):
+            imp = pronto.Ontology()
+            imp.create_term("X:1").name = "imported"
+            return {"imp": imp}
+
+        data = self.graph()
+        with unittest.mock.patch.object(
+            OboJSONParser, "process_imports", side_effect=process_imports
+        ):
+            graph = self.load(data, streaming=False)
+            stream = self.load(data, streaming=True)
+
+        self.assertEqual(self.entities(stream), self.entities(graph))
+        self.assertEqual(list(stream._terms), list(graph._terms))
+        self.assertEqual(stream._inheritance, graph._inheritance)
+        for ont in (graph, stream):
+            self.assertNotIn("X:1", ont._terms)
+            self.assertEqual(ont.imports["imp"]["X:1"].name, "x1")
+
+    def test_reader_small_chunks(self):
+        data = b'{"a": [1, 23456, {"b": "caf\xc3\xa9"}], "c": true}'
+        reader = _JSONReader(io.BytesIO(data), chunk_size=3)
+        values = {}
+        for key in reader.members():
+            if key == "a":
+                values[key] = [reader.value() for _ in reader.elements()]
+            else:
+                values[key] = reader.value()
+        self.assertEqual(values, json.loads(data))
@@ -5,6 +5,8 @@ import warnings
 import xml.etree.ElementTree as etree
 
 import pronto
+from pronto.parsers import RdfXMLParser
+from pronto.utils.io import decompress
 
 
 
@@ -20,6 +22,7 @@ class TestRoundtrip(unittest.TestCase):
              xmlns:xml="http://www.w3.org/XML/1998/namespace"
              xmlns:xsd="http://www.w3.org/2001/XMLSchema#"
              xmlns:doap="http://usefulinc.com/ns/doap#"
+             xmlns:obo="http://purl.obolibrary.org/obo/"
              xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
              xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
             {content}
@@ -134,6 +137,88 @@ class TestRoundtrip(unittest.TestCase):
             self.assertIn(ont['TST:001'].name, ["A", "B"])
 
 
+    def test_term_axiom_before_class(self):
+        ont = self.get_ontology(
+            """
+            <owl:Ontology/>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/TST_001"/>
+                <owl:annotatedProperty rdf:resource="http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"/>
+                <owl:annotatedTarget rdf:resource="http://purl.obolibrary.org/obo/TST_002"/>
+            </owl:Axiom>
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/TST_001"/>
+            """
+        )
+        self.assertIn("TST:001", ont)
+        synonyms = {s.description for s in ont["TST:001"].synonyms}
+        self.assertEqual(synonyms, {"http://purl.obolibrary.org/obo/TST_002"})
+
+    def test_term_definition_axiom(self):
+        ont = self.get_ontology(
+            """
+            <owl:Ontology/>
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/TST_001">
+                <obo:IAO_0000115 rdf:datatype="http://www.w3.org/2001/XMLSchema#string">a term</obo:IAO_0000115>
+            </owl:Class>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/TST_001"/>
+                <owl:annotatedProperty rdf:resource="http://purl.obolibrary.org/obo/IAO_0000115"/>
+                <owl:annotatedTarget rdf:datatype="http://www.w3.org/2001/XMLSchema#string">a term</owl:annotatedTarget>
+                <oboInOwl:hasDbXref rdf:datatype="http://www.w3.org/2001/XMLSchema#string">ISBN:1234</oboInOwl:hasDbXref>
+            </owl:Axiom>
+            """
+        )
+        self.assertEqual(ont["TST:001"].definition, "a term")
+        self.assertEqual(ont["TST:001"].definition.xrefs, {pronto.Xref("ISBN:1234")})
+
+    def test_term_synonym_axioms(self):
+        ont = self.get_ontology(
+            """
+            <owl:Ontology/>
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/TST_001">
+                <oboInOwl:hasExactSynonym rdf:datatype="http://www.w3.org/2001/XMLSchema#string">stuff</oboInOwl:hasExactSynonym>
+            </owl:Class>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/TST_001"/>
+                <owl:annotatedProperty rdf:resource="http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"/>
+                <owl:annotatedTarget rdf:datatype="http://www.w3.org/2001/XMLSchema#string">stuff</owl:annotatedTarget>
+                <oboInOwl:hasDbXref rdf:datatype="http://www.w3.org/2001/XMLSchema#string">ISBN:1234</oboInOwl:hasDbXref>
+            </owl:Axiom>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/TST_001"/>
+                <owl:annotatedProperty rdf:resource="http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"/>
+                <owl:annotatedTarget rdf:datatype="http://www.w3.org/2001/XMLSchema#string">stuff</owl:annotatedTarget>
+                <oboInOwl:hasDbXref rdf:datatype="http://www.w3.org/2001/XMLSchema#string">ISBN:5678</oboInOwl:hasDbXref>
+            </owl:Axiom>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/TST_001"/>
+                <owl:annotatedProperty rdf:resource="http://www.geneontology.org/formats/oboInOwl#hasBroadSynonym"/>
+                <owl:annotatedTarget rdf:datatype="http://www.w3.org/2001/XMLSchema#string">stuff</owl:annotatedTarget>
+            </owl:Axiom>
+            """
+        )
+        synonyms = sorted(ont["TST:001"].synonyms, key=lambda s: s.scope)
+        self.assertEqual([s.scope for s in synonyms], ["BROAD", "EXACT"])
+        self.assertEqual(synonyms[0].xrefs, frozenset())
+        self.assertEqual(
+            synonyms[1].xrefs, {pronto.Xref("ISBN:1234"), pronto.Xref("ISBN:5678")}
+        )
+
+    def test_term_before_ontology(self):
+        ont = self.get_ontology(
+            """
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/TST_001">
+                <oboInOwl:hasOBONamespace>test</oboInOwl:hasOBONamespace>
+            </owl:Class>
+            <owl:Ontology rdf:about="http://purl.obolibrary.org/obo/tst.owl">
+                <oboInOwl:hasDefaultNamespace>test</oboInOwl:hasDefaultNamespace>
+            </owl:Ontology>
+            """
+        )
+        self.assertEqual(ont.metadata.ontology, "tst")
+        self.assertIn("TST:001", ont)
+        self.assertIs(ont["TST:001"].namespace, None)
+
     # ------------------------------------------------------------------------
 
     def test_relationship_cyclic(self):
@@ -182,3 +267,72 @@ class TestRoundtrip(unittest.TestCase):
             warnings.simplefilter("ignore", pronto.warnings.SyntaxWarning)
             ont = self.get_ontology(txt)
             self.assertIn(ont['TST:001'].name, ["A", "B"])
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        warnings.simplefilter("ignore")
+
+    def tearDown(self):
+        warnings.simplefilter(warnings.defaultaction)
+
+    @staticmethod
+    def load(path, streaming):
+        ont = pronto.Ontology()
+        ont.path = path
+        with open(path, "rb") as handle:
+            RdfXMLParser(ont, streaming=streaming).parse_from(decompress(handle))
+        return ont
+
+    @staticmethod
+    def entities(ont):
+        return {
+            data.id: {
+                attr: getattr(data, attr)
+                for cls in type(data).__mro__
+                for attr in getattr(cls, "__slots__", ())
+                if attr != "__weakref__"
+            }
+            for data in (*ont._terms.values(), *ont._relationships.values())
+        }
+
+    def test_iao(self):
+        path = os.path.realpath(os.path.join(__file__, "..", "..", "data", "iao.owl"))
+        tree = self.load(path, streaming=False)
+        stream = self.load(path, streaming=True)
+        self.assertEqual(self.entities(stream), self.entities(tree))
+        self.assertEqual(stream._inheritance, tree._inheritance)
+        self.assertEqual(stream._relations, tree._relations)
+        self.assertEqual(stream.dumps(), tree.dumps())
+
+    def test_property_after_use(self):
+        xml = b"""<?xml version="1.0"?>
+        <rdf:RDF xmlns:owl="http://www.w3.org/2002/07/owl#"
+             xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+             xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+             xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+            <owl:Ontology/>
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/TST_001">
+                <oboInOwl:id>BFO:0000050</oboInOwl:id>
+            </owl:Class>
+            <owl:Axiom>
+                <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/BFO_0000050"/>
+                <owl:annotatedProperty rdf:resource="http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"/>
+                <owl:annotatedTarget>is part of</owl:annotatedTarget>
+            </owl:Axiom>
+            <owl:ObjectProperty rdf:about="http://purl.obolibrary.org/obo/BFO_0000050">
+                <oboInOwl:shorthand>part_of</oboInOwl:shorthand>
+            </owl:ObjectProperty>
+        </rdf:RDF>
+        """
+        onts = {}
+        for streaming in (False, True):
+            onts[streaming] = ont = pronto.Ontology()
+            parser = RdfXMLParser(ont, streaming=streaming)
+            parser.parse_from(decompress(io.BytesIO(xml)))
+        tree, stream = onts[False], onts[True]
+        self.assertEqual(self.entities(stream), self.entities(tree))
+        synonyms = {s.description for s in stream.get_relationship("part_of").synonyms}
+        self.assertEqual(synonyms, {"is part of"})
+        self.assertEqual(set(stream.get_term("BFO:0000050").synonyms), set())
@@ -30,6 +30,14 @@ class TestOboSerializer(TestSerializer, unittest.TestCase):
             """
         )
 
+    def test_metadata_idspace(self):
+        self.assertRoundtrip(
+            """
+            format-version: 1.4
+            idspace: EX http://example.com/ex/ "an example ID space"
+            """
+        )
+
     def test_metadata_namespace_id_rule(self):
         self.assertRoundtrip(
             """
@@ -0,0 +1,112 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+import warnings
+
+import pronto
+from pronto.utils.io import MAGIC_SNAPSHOT
+
+from ..utils import DATADIR
+
+
+class TestSnapshotSerializer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        warnings.simplefilter('error')
+        warnings.simplefilter('ignore', category=UnicodeWarning)
+        cls.path = os.path.join(DATADIR, "ms.obo")
+        cls.ms = pronto.Ontology(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        warnings.simplefilter(warnings.defaultaction)
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def assertOntologyEqual(self, ont1, ont2):
+        self.assertEqual(sorted(ont1.keys()), sorted(ont2.keys()))
+        self.assertEqual(ont1._inheritance, ont2._inheritance)
+        self.assertEqual(ont1._relations, ont2._relations)
+        self.assertEqual(
+            sorted(ont1.dumps().splitlines()), sorted(ont2.dumps().splitlines())
+        )
+
+    def test_roundtrip(self):
+        buffer = io.BytesIO()
+        self.ms.dump(buffer, format="snapshot")
+        self.assertTrue(buffer.getvalue().startswith(MAGIC_SNAPSHOT))
+        buffer.seek(0)
+        ms = pronto.Ontology.from_snapshot(buffer)
+        self.assertOntologyEqual(ms, self.ms)
+
+    def test_version_mismatch(self):
+        buffer = io.BytesIO()
+        self.ms.dump(buffer, format="snapshot")
+        data = buffer.getvalue().replace(
+            pronto.__version__.encode(), b"0.0.0", 1
+        )
+        with self.assertRaises(ValueError):
+            pronto.Ontology.from_snapshot(io.BytesIO(data))
+
+    def test_cache_dir(self):
+        ms = pronto.Ontology(self.path, cache_dir=self.cache_dir)
+        self.assertOntologyEqual(ms, self.ms)
+        snapshots = sorted(os.listdir(self.cache_dir))
+        self.assertEqual(len(snapshots), 1 + len(ms.imports))
+        self.assertTrue(all(s.endswith(".snapshot") for s in snapshots))
+
+        cached = pronto.Ontology(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(cached.path, self.path)
+        self.assertOntologyEqual(cached, self.ms)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), snapshots)
+
+    def test_cache_dir_invalidation(self):
+        path = os.path.join(self.cache_dir, "ms.obo")
+        shutil.copy(self.path, path)
+        pronto.Ontology(path, import_depth=0, cache_dir=self.cache_dir)
+        with open(path, "a") as f:
+            f.write("\n[Term]\nid: MS:9999999\nname: new term\n")
+        ms = pronto.Ontology(path, import_depth=0, cache_dir=self.cache_dir)
+        self.assertIn("MS:9999999", ms)
+        snapshots = [f for f in os.listdir(self.cache_dir) if f.endswith(".snapshot")]
+        self.assertEqual(len(snapshots), 2)
+
+    def _snapshot(self):
+        buffer = io.BytesIO()
+        self.ms.dump(buffer, format="snapshot")
+        return buffer.getvalue()
+
+    def test_reject_untrusted(self):
+        data = self._snapshot()
+        with unittest.mock.patch("pickle.load") as load:
+            with self.assertRaises(ValueError):
+                pronto.Ontology(io.BytesIO(data))
+            with self.assertRaises(ValueError):
+                pronto.Ontology.read_metadata(io.BytesIO(data))
+            load.assert_not_called()
+
+    def test_reject_import(self):
+        path = os.path.join(self.cache_dir, "evil.snapshot")
+        with open(path, "wb") as f:
+            f.write(self._snapshot())
+        obo = "format-version: 1.4\nimport: {}\n".format(path)
+        with unittest.mock.patch("pickle.load") as load:
+            with self.assertRaises(ValueError):
+                pronto.Ontology(io.BytesIO(obo.encode()))
+            load.assert_not_called()
+
+    def test_from_snapshot_path(self):
+        path = os.path.join(self.cache_dir, "ms.snapshot")
+        with open(path, "wb") as f:
+            self.ms.dump(f, format="snapshot")
+        ms = pronto.Ontology.from_snapshot(path)
+        self.assertEqual(ms.path, path)
+        self.assertOntologyEqual(ms, self.ms)
@@ -120,6 +120,37 @@ class TestTerm(_TestTermMixin, unittest.TestCase):
             {"MS:1000123", "MS:1000489", "MS:1000031"},
         )
 
+    def test_superclasses_ids(self):
+        for term in itertools.islice(self.ms.terms(), 100):
+            self.assertEqual(
+                list(term.superclasses(ids=True)),
+                [sup.id for sup in term.superclasses()],
+            )
+            self.assertCountEqual(
+                term.superclasses(with_self=False, ids=True, ordered=False),
+                [sup.id for sup in term.superclasses(with_self=False)],
+            )
+
+    def test_subclasses_ids(self):
+        term = self.ms["MS:1000031"]
+        self.assertEqual(
+            list(term.subclasses(1, ids=True)),
+            [sub.id for sub in term.subclasses(1)],
+        )
+        self.assertCountEqual(
+            term.subclasses(ids=True, ordered=False),
+            [sub.id for sub in term.subclasses()],
+        )
+
+    def test_subclasses_unordered(self):
+        term = self.ms["MS:1000031"]
+        self.assertCountEqual(term.subclasses(ordered=False), term.subclasses())
+        # subclasses are still yielded breadth-first
+        children = set(term.subclasses(1, with_self=False, ids=True))
+        unordered = list(term.subclasses(ids=True, ordered=False))
+        self.assertEqual(unordered[0], term.id)
+        self.assertEqual(set(unordered[1 : len(children) + 1]), children)
+
     def test_consider(self):
         self.assertEqual(self.t1.consider, TermSet())
         self.t1.consider = {self.t2}
@@ -170,6 +201,36 @@ class TestTerm(_TestTermMixin, unittest.TestCase):
         self.assertEqual(sorted(self.t1.replaced_by.ids), [self.t2.id, self.t3.id])
         self.assertEqual(sorted(self.ont[self.t1.id].replaced_by.ids), [self.t2.id, self.t3.id])
 
+    def test_objects(self):
+        self.t1.relationships = {self.has_part: [self.t2]}
+        self.t2.relationships = {self.has_part: [self.t3]}
+        self.assertEqual(list(self.t1.objects(self.has_part)), [self.t2])
+        self.has_part.transitive = True
+        self.assertEqual(list(self.t1.objects(self.has_part)), [self.t2, self.t3])
+        self.has_part.reflexive = True
+        self.assertEqual(
+            list(self.t1.objects(self.has_part)), [self.t1, self.t2, self.t3]
+        )
+        self.t2.relationships = {}
+        self.assertEqual(list(self.t1.objects(self.has_part)), [self.t1, self.t2])
+
+    def test_objects_inverse_of(self):
+        part_of = self.ont.create_relationship("part_of")
+        part_of.inverse_of = self.has_part
+        self.t1.relationships = {self.has_part: [self.t2]}
+        self.assertEqual(list(self.t2.objects(part_of)), [self.t1])
+        self.assertEqual(list(self.t1.objects(part_of)), [])
+
+    def test_objects_symmetric(self):
+        self.has_part.symmetric = True
+        self.t1.relationships = {self.has_part: [self.t2]}
+        self.assertEqual(list(self.t2.objects(self.has_part)), [self.t1])
+
+    def test_objects_is_a(self):
+        is_a = self.ont.get_relationship("is_a")
+        self.t1.relationships = {is_a: [self.t2]}
+        self.assertEqual(list(self.t1.objects(is_a)), [self.t1, self.t2])
+
     def test_repr(self):
         self.assertEqual(repr(self.t1), f"Term({self.t1.id!r})")
         self.t1.name = "test"
@@ -187,6 +248,15 @@ class TestTermSet(_TestTermMixin, unittest.TestCase):
         self.assertIn(self.ont[self.t2.id], s)
         self.assertNotIn(self.ont[self.t3.id], s)
 
+    def test_superclasses_ids(self):
+        s = TermSet({self.ms['MS:1000122'], self.ms['MS:1000124']})
+        self.assertEqual(
+            list(s.superclasses(ids=True)), [t.id for t in s.superclasses()]
+        )
+        self.assertEqual(
+            set(s.subclasses(ids=True, ordered=False)), s.subclasses().to_set().ids
+        )
+
     @unittest.skipUnless(__debug__, "no type checking in optimized mode")
     def test_init_typechecked(self):
         self.assertRaises(TypeError, TermSet, {1, 2})
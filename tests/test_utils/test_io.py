@@ -0,0 +1,281 @@
+import codecs
+import gzip
+import http.server
+import io
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import unittest
+import warnings
+
+import pronto
+from pronto.utils.io import (
+    MemoryMappedFile,
+    ReadAheadReader,
+    TranscodedReader,
+    decompress,
+    download,
+    get_handle,
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        etag = f'"{server.version}"'
+        if server.use_etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if not server.use_etag and self.headers.get("If-Modified-Since") == server.date:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if server.use_etag:
+            self.send_header("ETag", etag)
+        else:
+            self.send_header("Last-Modified", server.date)
+        self.send_header("Content-Length", str(len(server.content)))
+        self.end_headers()
+        self.wfile.write(server.content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class TestDownload(unittest.TestCase):
+
+    use_etag = True
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.server.use_etag = self.use_etag
+        self.server.date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        self.set_content(b"format-version: 1.4\n\n[Term]\nid: TST:001\n", 1)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/tst.obo"
+
+    def tearDown(self):
+        self.stop_server()
+        shutil.rmtree(self.cache_dir)
+
+    def stop_server(self):
+        if self.thread.is_alive():
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+
+    def set_content(self, content, version):
+        self.server.content = content
+        self.server.version = version
+        if not self.use_etag:
+            self.server.date = f"Wed, 21 Oct 2015 07:28:{version:02} GMT"
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_revalidation(self):
+        path = download(self.url, self.cache_dir)
+        self.assertEqual(self.read(path), self.server.content)
+        mtime = os.stat(path).st_mtime_ns
+        # second download should be a conditional request answered by 304
+        self.assertEqual(download(self.url, self.cache_dir), path)
+        self.assertEqual(len(self.server.requests), 2)
+        header = "If-None-Match" if self.use_etag else "If-Modified-Since"
+        self.assertIn(header, self.server.requests[1])
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def test_changed(self):
+        path = download(self.url, self.cache_dir)
+        self.set_content(b"format-version: 1.4\n\n[Term]\nid: TST:002\n", 2)
+        self.assertEqual(download(self.url, self.cache_dir), path)
+        self.assertEqual(self.read(path), self.server.content)
+
+    def test_offline(self):
+        path = download(self.url, self.cache_dir)
+        content = self.read(path)
+        self.stop_server()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            self.assertEqual(download(self.url, self.cache_dir, timeout=1), path)
+        self.assertTrue(any(issubclass(x.category, pronto.warnings.ProntoWarning) for x in w))
+        self.assertEqual(self.read(path), content)
+
+    def test_offline_without_cache(self):
+        self.stop_server()
+        with self.assertRaises(OSError):
+            download(self.url, self.cache_dir, timeout=1)
+
+    def test_ontology(self):
+        ont = pronto.Ontology(self.url, cache_dir=self.cache_dir)
+        self.assertEqual(ont.path, self.url)
+        self.assertIn("TST:001", ont)
+        self.stop_server()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            ont = pronto.Ontology(self.url, cache_dir=self.cache_dir, timeout=1)
+        self.assertIn("TST:001", ont)
+
+
+class TestDownloadLastModified(TestDownload):
+
+    use_etag = False
+
+
+class TestDecompress(unittest.TestCase):
+
+    TEXT = "format-version: 1.4\r\nremark: caf\u00e9 \u2013 na\u00efve\r\n"
+
+    def setUp(self):
+        warnings.simplefilter("error")
+
+    def tearDown(self):
+        warnings.simplefilter(warnings.defaultaction)
+
+    def test_utf8(self):
+        data = self.TEXT.encode("utf-8")
+        handle = decompress(io.BytesIO(data))
+        self.assertEqual(handle.read(), data)
+
+    def test_utf8_truncated_peek(self):
+        # a multibyte character split at the end of the peeked buffer
+        data = b"a" * (io.DEFAULT_BUFFER_SIZE - 1) + "\u00e9".encode("utf-8")
+        handle = decompress(io.BytesIO(data))
+        self.assertEqual(handle.read(), data)
+
+    def test_utf8_bom(self):
+        data = codecs.BOM_UTF8 + self.TEXT.encode("utf-8")
+        handle = decompress(io.BytesIO(data))
+        self.assertEqual(handle.read(), self.TEXT.encode("utf-8"))
+
+    def test_utf16_bom(self):
+        data = self.TEXT.encode("utf-16")
+        handle = decompress(io.BytesIO(data))
+        expected = self.TEXT.replace("\r\n", "\n").encode("utf-8")
+        self.assertEqual(handle.read(), expected)
+
+    def test_explicit_encoding(self):
+        data = self.TEXT.encode("cp1252")
+        handle = decompress(io.BytesIO(data), encoding="cp1252")
+        expected = self.TEXT.replace("\r\n", "\n").encode("utf-8")
+        self.assertEqual(handle.read(), expected)
+
+    def test_transcoded_chunks(self):
+        # characters and CRLF line endings split between chunks
+        data = (self.TEXT * 100).encode("utf-16")
+        expected = (self.TEXT * 100).replace("\r\n", "\n").encode("utf-8")
+        for chunk_size in (1, 3, 7, 64):
+            handle = decompress(io.BytesIO(data), chunk_size=chunk_size)
+            self.assertIsInstance(handle.raw, TranscodedReader)
+            self.assertEqual(handle.read(), expected)
+
+    def test_detected_encoding(self):
+        data = ("remark: caf\u00e9\n" * 100).encode("latin-1")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UnicodeWarning)
+            handle = decompress(io.BytesIO(data))
+        self.assertEqual(handle.read().decode("utf-8"), data.decode("latin-1"))
+
+    def test_ontology_encoding(self):
+        text = "format-version: 1.4\nontology: test\n\n[Term]\nid: TST:001\nname: caf\u00e9\n"
+        ont = pronto.Ontology(io.BytesIO(text.encode("cp1252")), encoding="cp1252")
+        self.assertEqual(ont["TST:001"].name, "caf\u00e9")
+
+
+class TestReadAheadReader(unittest.TestCase):
+
+    DATA = b"".join(b"line %i\n" % i for i in range(10000))
+
+    class _Failing(io.RawIOBase):
+        def readable(self):
+            return True
+        def readinto(self, b):
+            raise OSError("broken stream")
+
+    def test_read(self):
+        reader = ReadAheadReader(io.BytesIO(self.DATA), buffers=2, chunk_size=100)
+        with io.BufferedReader(reader) as handle:
+            self.assertEqual(handle.read(), self.DATA)
+
+    def test_error(self):
+        reader = ReadAheadReader(self._Failing(), buffers=2)
+        with self.assertRaises(OSError):
+            reader.read(10)
+        reader.close()
+
+    def test_close(self):
+        reader = ReadAheadReader(io.BytesIO(self.DATA), buffers=1, chunk_size=10)
+        reader.read(5)
+        reader.close()
+        self.assertTrue(reader.closed)
+        self.assertFalse(reader._thread.is_alive())
+
+    def test_decompress(self):
+        data = gzip.compress(self.DATA)
+        handle = decompress(io.BytesIO(data), readahead=2, chunk_size=1024)
+        self.assertIsInstance(handle.raw, ReadAheadReader)
+        self.assertEqual(handle.read(), self.DATA)
+
+
+class TestMemoryMappedFile(unittest.TestCase):
+
+    DATA = b"format-version: 1.4\nontology: test\n\n[Term]\nid: TST:001\n"
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "test.obo")
+        with open(self.path, "wb") as f:
+            f.write(self.DATA)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_read(self):
+        with MemoryMappedFile(self.path) as handle:
+            self.assertEqual(handle.peek(1), self.DATA)
+            self.assertEqual(handle.read(6), self.DATA[:6])
+            self.assertEqual(handle.tell(), 6)
+            self.assertEqual(handle.read(), self.DATA[6:])
+            self.assertEqual(handle.read(), b"")
+            handle.seek(-4, io.SEEK_END)
+            self.assertEqual(handle.read(), self.DATA[-4:])
+
+    def test_close(self):
+        handle = MemoryMappedFile(self.path)
+        buffer = handle.getbuffer()
+        handle.close()
+        self.assertRaises(ValueError, handle.read)
+        self.assertEqual(buffer[:], self.DATA)
+
+    def test_decompress(self):
+        handle = MemoryMappedFile(self.path)
+        self.assertIs(decompress(handle), handle)
+        with open(self.path, "wb") as f:
+            f.write(gzip.compress(self.DATA))
+        handle = decompress(MemoryMappedFile(self.path))
+        self.assertEqual(handle.read(), self.DATA)
+
+    def test_get_handle(self):
+        with get_handle(self.path, memory_map=True) as handle:
+            self.assertIsInstance(handle, MemoryMappedFile)
+        # empty files cannot be mapped
+        open(self.path, "wb").close()
+        with get_handle(self.path, memory_map=True) as handle:
+            self.assertNotIsInstance(handle, MemoryMappedFile)
+
+    def test_ontology(self):
+        ont = pronto.Ontology(self.path, memory_map=True)
+        self.assertIn("TST:001", ont)
@@ -0,0 +1,51 @@
+import unittest
+
+from pronto.utils.iri import IriCompactor
+
+
+class TestIriCompactor(unittest.TestCase):
+
+    def setUp(self):
+        self.compactor = IriCompactor(
+            "tst",
+            {
+                "TST": ("http://purl.obolibrary.org/obo/TST_", None),
+                "EX": ("http://example.com/ex/", "an example ID space"),
+            },
+        )
+
+    def test_compact_obo_purl(self):
+        c = IriCompactor()
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/GO_0000001"), "GO:0000001")
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/RO_has_part"), "RO:has_part")
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/go/x_y"), "go/x:y")
+
+    def test_compact_ontology_namespace(self):
+        c = self.compactor
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/tst#part_of"), "part_of")
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/tst#"), "")
+        iri = "http://purl.obolibrary.org/obo/other#part_of"
+        self.assertEqual(c.compact(iri), iri)
+
+    def test_compact_idspaces(self):
+        c = self.compactor
+        self.assertEqual(c.compact("http://example.com/ex/001"), "EX:001")
+        self.assertEqual(c.compact("http://purl.obolibrary.org/obo/TST_001"), "TST:001")
+
+    def test_compact_unknown(self):
+        c = self.compactor
+        for iri in ("http://example.com/001", "http://purl.obolibrary.org/obo/", "x"):
+            self.assertEqual(c.compact(iri), iri)
+
+    def test_expand(self):
+        c = self.compactor
+        self.assertEqual(c.expand("GO:0000001"), "http://purl.obolibrary.org/obo/GO_0000001")
+        self.assertEqual(c.expand("EX:001"), "http://example.com/ex/001")
+        self.assertEqual(c.expand("part_of"), "http://purl.obolibrary.org/obo/tst#part_of")
+        self.assertEqual(c.expand("http://example.com/001"), "http://example.com/001")
+        self.assertEqual(IriCompactor().expand("part_of"), "part_of")
+
+    def test_roundtrip(self):
+        c = self.compactor
+        for id in ("GO:0000001", "EX:001", "TST:001", "part_of"):
+            self.assertEqual(c.compact(c.expand(id)), id)
@@ -0,0 +1,53 @@
+import unittest
+from typing import FrozenSet, Optional, Set, Union
+
+from pronto.utils.meta import typechecked
+
+
+@unittest.skipUnless(__debug__, "no type checking in optimized mode")
+class TestTypechecked(unittest.TestCase):
+
+    def tearDown(self):
+        typechecked.enabled = True
+
+    def test_compile_check(self):
+        hints = [int, type(None), Optional[str], Union[int, str], Set[int], FrozenSet[str]]
+        values = [1, "a", None, {1, 2}, {1, "a"}, frozenset({"a"}), 1.0]
+        for hint in hints:
+            check = typechecked.compile_check(hint)
+            for value in values:
+                expected, _ = typechecked.check_type(hint, value)
+                self.assertEqual(check(value), expected, (hint, value))
+
+    def test_arguments(self):
+        @typechecked()
+        def f(x: int, y: Optional[str] = None, *, z: Optional[Set[int]] = None):
+            return x
+
+        self.assertEqual(f(1), 1)
+        self.assertEqual(f(1, "a", z={1}), 1)
+        self.assertEqual(f(y="a", x=1), 1)
+        with self.assertRaisesRegex(TypeError, "'x' must be int, not str"):
+            f("a")
+        with self.assertRaisesRegex(TypeError, "'y'"):
+            f(1, y=2)
+        with self.assertRaisesRegex(TypeError, "'z'"):
+            f(1, z={"a"})
+
+    def test_property(self):
+        @typechecked(property=True)
+        def name(self, value: str):
+            pass
+
+        with self.assertRaisesRegex(TypeError, "'name' must be str, not int"):
+            name(None, 1)
+
+    def test_disabled(self):
+        @typechecked()
+        def f(x: int):
+            return x
+
+        typechecked.enabled = False
+        self.assertEqual(f("a"), "a")
+        typechecked.enabled = True
+        self.assertRaises(TypeError, f, "a")
@@ -0,0 +1,81 @@
+import os
+import unittest
+
+import pronto
+from pronto.utils.pool import ValuePool, current_pool, use_pool
+
+from ..utils import DATADIR
+
+
+class TestValuePool(unittest.TestCase):
+
+    def test_get(self):
+        pool = ValuePool()
+        x1 = pool.get(pronto.Xref, "PMID:1234", None)
+        x2 = pool.get(pronto.Xref, "PMID:1234", None)
+        self.assertIsNot(x1, x2)
+        self.assertIs(x1.id, x2.id)
+        x3 = pool.get(pronto.Xref, "PMID:1234", "a paper")
+        self.assertEqual(x3.description, "a paper")
+        self.assertEqual(len(pool), 2)
+
+    def test_get_copy(self):
+        pool = ValuePool()
+        x1 = pool.get(pronto.Xref, "PMID:1234", None)
+        x1.description = "modified"
+        x2 = pool.get(pronto.Xref, "PMID:1234", None)
+        self.assertIsNone(x2.description)
+
+    def test_get_error(self):
+        pool = ValuePool()
+        self.assertRaises(ValueError, pool.get, pronto.Xref, "not an id", None)
+        self.assertEqual(len(pool), 0)
+
+    def test_intern(self):
+        pool = ValuePool()
+        s1 = pool.intern("".join(["GO:", "0008150"]))
+        s2 = pool.intern("".join(["GO:", "0008150"]))
+        self.assertIs(s1, s2)
+
+    def test_use_pool(self):
+        self.assertIs(current_pool(), None)
+        with use_pool() as pool:
+            self.assertIs(current_pool(), pool)
+            with use_pool(ValuePool()) as inner:
+                self.assertIs(current_pool(), inner)
+            self.assertIs(current_pool(), pool)
+        self.assertIs(current_pool(), None)
+
+
+class TestParsing(unittest.TestCase):
+
+    def assertShared(self, ont):
+        xrefs = {}
+        for term in ont.terms():
+            for xref in term.definition.xrefs if term.definition else ():
+                self.assertIs(xrefs.setdefault(xref.id, xref.id), xref.id)
+        self.assertTrue(xrefs)
+        targets = {}
+        for term in ont.terms():
+            for parent in term._data().relationships.get("is_a", ()):
+                self.assertIs(targets.setdefault(parent, parent), parent)
+
+    def test_obo(self):
+        ont = pronto.Ontology(os.path.join(DATADIR, "ms.obo"), import_depth=0)
+        self.assertShared(ont)
+        self.assertIs(current_pool(), None)
+
+    def test_lazy(self):
+        path = os.path.join(DATADIR, "ms.obo")
+        ont = pronto.Ontology(path, import_depth=0, lazy=True)
+        self.assertShared(ont)
+
+    def test_obo_copies(self):
+        ont = pronto.Ontology(os.path.join(DATADIR, "ms.obo"), import_depth=0)
+        xrefs = {}
+        for term in ont.terms():
+            for xref in term.definition.xrefs if term.definition else ():
+                xrefs.setdefault(xref.id, []).append(xref)
+        x1, x2, *_ = next(x for x in xrefs.values() if len(x) > 1)
+        x1.description = "modified"
+        self.assertNotEqual(x2.description, "modified")
@@ -1,7 +1,9 @@
 import contextlib
 import importlib
 import os
+import shutil
 import sys
+import tempfile
 
 # Resources
 TESTDIR = os.path.dirname(os.path.abspath(__file__))
@@ -23,5 +25,24 @@ def try_import(*paths):
     raise ImportError(f"could not find any of the following: {', '.join(paths)}")
 
 
+# Shortcut to write OBO documents to a temporary directory in test cases
+class TemporaryDirectoryMixin(object):
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write_obo(self, name, *frames, header=()):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write("format-version: 1.4\n")
+            for clause in header:
+                f.write(f"{clause}\n")
+            for frame in frames:
+                f.write(f"\n{frame}")
+        return path
+
+
 # Force importing the local version of the module
 sys.path.insert(0, MAINDIR)